@@ -4,65 +4,61 @@
 # See this guide on how to implement these action:
 # https://rasa.com/docs/rasa/custom-actions
 
-from typing import Any, Text, Dict, List
-from rasa_sdk import Action, Tracker, FormValidationAction
+import asyncio
+import logging
+import warnings
+from datetime import date
+from typing import Any, Text, Dict, List, Optional, Tuple
+from rasa_sdk import Action, Tracker, FormValidationAction, utils
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.types import DomainDict
-from rasa_sdk.events import SlotSet
-from datetime import datetime, timedelta
-import pytz
-import re
-
-
+from rasa_sdk.events import EventType, SlotSet
+
+from .capacity import get_capacity_calendar
+from .fuzzy_match import get_menu_matcher, get_style_matcher
+from .menu_index import get_menu_index
+from .message_analysis import SLOT_TEXT_PARSES, get_message_analysis, run_text_parses
+from .metrics import REGISTRY, instrument_action, start_metrics_server, track_parser
+from .numerals import parse_korean_number
+from .offload import run_blocking
+from .order_cache import get_order_cache, split_cached
+from .order_store import ORDER_FIELDS, get_order_sink
+from .patterns import get_catalogue_patterns
+from .pricing import OrderQuote, get_price_table
+from .responses import get_responses, message_locale, render
+from .shadow import shadowed
+from .side_items import get_side_item_assembler
+from .temporal import cache_stats, parse_temporal
+
+logger = logging.getLogger(__name__)
+
+
+def _temporal_cache_metrics() -> List[str]:
+    info = cache_stats()
+    return [
+        "# HELP actions_temporal_cache_hits_total Date/time parse cache hits.",
+        "# TYPE actions_temporal_cache_hits_total counter",
+        f"actions_temporal_cache_hits_total {info.hits}",
+        "# HELP actions_temporal_cache_misses_total Date/time parse cache misses.",
+        "# TYPE actions_temporal_cache_misses_total counter",
+        f"actions_temporal_cache_misses_total {info.misses}",
+    ]
+
+
+REGISTRY.add_collector(_temporal_cache_metrics)
+start_metrics_server()
+
+
+@shadowed("korean_number_to_int")
+@track_parser("korean_number_to_int", failed=lambda result, text: result is None)
 def korean_number_to_int(text: str) -> int:
     """Convert Korean number words to integers."""
-    # 한국어 숫자 매핑
-    korean_numbers = {
-        '영': 0, '공': 0,
-        '하나': 1, '한': 1, '일': 1,
-        '둘': 2, '두': 2, '이': 2,
-        '셋': 3, '세': 3, '삼': 3,
-        '넷': 4, '네': 4, '사': 4,
-        '다섯': 5, '오': 5,
-        '여섯': 6, '육': 6, '륙': 6,
-        '일곱': 7, '칠': 7,
-        '여덟': 8, '팔': 8,
-        '아홉': 9, '구': 9,
-        '열': 10, '십': 10,
-        '스물': 20, '이십': 20,
-        '서른': 30, '삼십': 30,
-        '마흔': 40, '사십': 40,
-        '쉰': 50, '오십': 50,
-        '예순': 60, '육십': 60,
-        '일흔': 70, '칠십': 70,
-        '여든': 80, '팔십': 80,
-        '아흔': 90, '구십': 90,
-        '백': 100, '천': 1000,
-    }
-
-    text = text.strip()
-
-    # 먼저 숫자인지 확인
-    if text.isdigit():
-        return int(text)
-
-    # 한국어 숫자 매핑에서 찾기
-    if text in korean_numbers:
-        return korean_numbers[text]
-
-    # "스물하나", "스물두개" 같은 복합 표현 처리
-    for key, value in sorted(korean_numbers.items(), key=lambda x: -len(x[0])):
-        if text.startswith(key):
-            remainder = text[len(key):]
-            if remainder in korean_numbers:
-                return value + korean_numbers[remainder]
-            elif remainder.isdigit():
-                return value + int(remainder)
-
     # 변환 실패시 None 반환
-    return None
+    return parse_korean_number(text)
 
 
+@shadowed("parse_korean_time")
+@track_parser("parse_korean_time", failed=lambda result, text: result == text)
 def parse_korean_time(time_text: str) -> str:
     """Convert time expressions to HH:MM:SS format (always PM for orders).
     Examples:
@@ -70,119 +66,104 @@ def parse_korean_time(time_text: str) -> str:
     - '6시 30분' -> '18:30:00'
     - '여덟시 삼십분' -> '20:30:00'
     """
-    time_text = time_text.strip()
-
-    # "6시", "6시 30분" 형식 처리 (숫자)
-    time_match = re.search(r'(\d+)\s*시(?:\s*(\d+)\s*분)?', time_text)
-    if time_match:
-        hour = int(time_match.group(1))
-        minute = int(time_match.group(2)) if time_match.group(2) else 0
-
-        # 주문 시간은 항상 오후로 처리 (12시 미만이면 +12)
-        if hour < 12:
-            hour += 12
-
-        return f"{hour:02d}:{minute:02d}:00"
-
-    # "여덟시 삼십분", "여덟시", "일곱시 삼십분" 형식 처리 (한글)
-    korean_time_pattern = r'(하나|한|둘|두|셋|세|넷|네|다섯|여섯|일곱|여덟|아홉|열|열하나|열한|열둘|열두|스물|이십|스물하나|스물한|이십일)\s*시(?:\s*(삼십|사십|오십|삼|사|오|십|십오|이십|이십오|[0-9]+)\s*분)?'
-    korean_match = re.search(korean_time_pattern, time_text)
-
-    if korean_match:
-        korean_hour = korean_match.group(1)
-        korean_minute = korean_match.group(2) if korean_match.group(2) else None
-
-        # 시간 변환
-        hour = korean_number_to_int(korean_hour)
-        if hour is None:
-            return time_text
-
-        # 분 변환
-        minute = 0
-        if korean_minute:
-            # 숫자인 경우
-            if korean_minute.isdigit():
-                minute = int(korean_minute)
-            # 한글 숫자인 경우
-            else:
-                minute_map = {
-                    '삼십': 30, '사십': 40, '오십': 50,
-                    '삼': 3, '사': 4, '오': 5,
-                    '십': 10, '십오': 15, '이십': 20, '이십오': 25
-                }
-                minute = minute_map.get(korean_minute, 0)
+    parsed = parse_temporal(time_text)
 
-        # 주문 시간은 항상 오후로 처리 (12시 미만이면 +12)
-        if hour < 12:
-            hour += 12
+    # 변환 실패시 원본 반환
+    return parsed.time if parsed.time else time_text
 
-        return f"{hour:02d}:{minute:02d}:00"
 
-    # 변환 실패시 원본 반환
-    return time_text
-
-
-def parse_korean_date(date_text: str) -> str:
-    """Convert Korean date expressions to yyyy-mm-dd format (KST timezone)."""
-    kst = pytz.timezone('Asia/Seoul')
-    today = datetime.now(kst)
-    date_text = date_text.strip()
-
-    # "오늘"
-    if "오늘" in date_text:
-        return today.strftime("%Y-%m-%d")
-
-    # "내일"
-    if "내일" in date_text:
-        return (today + timedelta(days=1)).strftime("%Y-%m-%d")
-
-    # "모레"
-    if "모레" in date_text:
-        return (today + timedelta(days=2)).strftime("%Y-%m-%d")
-
-    # "이번 주 X요일" or "이번주 X요일"
-    this_week_match = re.search(r'이번\s*주\s*([월화수목금토일])요일', date_text)
-    if this_week_match:
-        weekday_kr = this_week_match.group(1)
-        weekday_map = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
-        target_weekday = weekday_map[weekday_kr]
-        current_weekday = today.weekday()
-        days_ahead = target_weekday - current_weekday
-        if days_ahead <= 0:  # 이미 지났으면 다음 주
-            days_ahead += 7
-        target_date = today + timedelta(days=days_ahead)
-        return target_date.strftime("%Y-%m-%d")
-
-    # "다음 주 X요일" or "다음주 X요일"
-    next_week_match = re.search(r'다음\s*주\s*([월화수목금토일])요일', date_text)
-    if next_week_match:
-        weekday_kr = next_week_match.group(1)
-        weekday_map = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
-        target_weekday = weekday_map[weekday_kr]
-        current_weekday = today.weekday()
-        days_ahead = target_weekday - current_weekday + 7
-        target_date = today + timedelta(days=days_ahead)
-        return target_date.strftime("%Y-%m-%d")
-
-    # "X월 Y일" 형식
-    date_match = re.search(r'(\d+)월\s*(\d+)일', date_text)
-    if date_match:
-        month = int(date_match.group(1))
-        day = int(date_match.group(2))
-        year = today.year
-        # 만약 입력된 월/일이 이미 지났으면 내년으로 설정
-        try:
-            target_date = datetime(year, month, day)
-            if target_date < today:
-                target_date = datetime(year + 1, month, day)
-            return target_date.strftime("%Y-%m-%d")
-        except ValueError:
-            return None
+@shadowed("parse_korean_date")
+@track_parser("parse_korean_date", failed=lambda result, text: result is None or result == text)
+def parse_korean_date(date_text: str, today: Optional[date] = None) -> str:
+    """Convert Korean date expressions to yyyy-mm-dd format (KST timezone).
+
+    Relative expressions resolve against today's KST date unless another
+    reference day is given.
+    """
+    parsed = parse_temporal(date_text, today)
+
+    if parsed.date:
+        return parsed.date
+    if parsed.invalid_date:
+        return None
 
     # 변환 불가능한 경우 원본 반환
     return date_text
 
 
+def standardize_delivery(
+    date_value: Text, time_value: Optional[Text], today: Optional[date] = None
+) -> Tuple[Optional[Text], Optional[Text]]:
+    """Convert date and time entity values in one call."""
+    standardized_date = parse_korean_date(date_value, today)
+    standardized_time = parse_korean_time(time_value) if time_value else None
+    return standardized_date, standardized_time
+
+
+def format_delivery_slot(
+    delivery_date: Text, delivery_time: Optional[Text] = None, locale: Optional[Text] = None
+) -> Text:
+    """Render '2025-01-15', '19:30:00' as '1월 15일 7시 30분'."""
+    _, month, day = delivery_date.split('-')
+    text = render("slot_date", locale, month=int(month), day=int(day))
+    if delivery_time:
+        hour, minute = (int(part) for part in delivery_time.split(':')[:2])
+        hour = hour - 12 if hour > 12 else hour
+        if minute:
+            text = render("slot_hour_minute", locale, date=text, hour=hour, minute=minute)
+        else:
+            text = render("slot_hour", locale, date=text, hour=hour)
+    return text
+
+
+def assemble_side_items(entities: List[Dict[Text, Any]]) -> Tuple[List[Text], List[Text], List[Text]]:
+    """Group side_name/side_quantity/side_unit entities into parallel lists."""
+    assembler = get_side_item_assembler()
+    return assembler.to_slot_lists(assembler.assemble(entities))
+
+
+def _side_slot_lists(side_name: Any, side_quantity: Any, side_unit: Any) -> Tuple[List[Any], List[Any], List[Any]]:
+    if not side_name or not side_quantity:
+        return [], [], []
+    if isinstance(side_name, list) and isinstance(side_quantity, list):
+        units = side_unit if side_unit and isinstance(side_unit, list) else ["개"] * len(side_name)
+        return side_name, side_quantity, units
+    return [side_name], [side_quantity], [side_unit if side_unit else "개"]
+
+
+def render_order_summary(
+    order_data: Dict[Text, Any],
+    side_lists: Tuple[List[Any], List[Any], List[Any]],
+    quote: OrderQuote,
+    locale: Optional[Text] = None,
+) -> Text:
+    """Render the order confirmation message from the order_summary templates."""
+    # 주문마다 내용이 달라 렌더링 캐시를 거치지 않고 템플릿을 바로 씀
+    responses = get_responses()
+    sides = ""
+    if side_lists[0]:
+        side_line = responses.template("order_summary_side_line", locale)
+        lines = "\n".join(
+            side_line.render({"name": name, "quantity": qty, "unit": unit})
+            for name, qty, unit in zip(*side_lists)
+        )
+        sides = responses.template("order_summary_sides", locale).render({"lines": lines})
+    unpriced = ""
+    if quote.unpriced:
+        unpriced = responses.template("order_summary_unpriced", locale).render({"items": ", ".join(quote.unpriced)})
+    return responses.template("order_summary", locale).render({
+        "menu_name": order_data["menu_name"],
+        "menu_quantity": order_data["menu_quantity"],
+        "serving_style": order_data["serving_style"],
+        "delivery_date": order_data["delivery_date"],
+        "delivery_time": order_data["delivery_time"],
+        "sides": sides,
+        "total": quote.total,
+        "unpriced": unpriced,
+    })
+
+
+@instrument_action
 class ActionRecommendMenu(Action):
     def name(self) -> Text:
         return "action_menu_recommendation"
@@ -193,67 +174,28 @@ class ActionRecommendMenu(Action):
 
         occasion = tracker.get_slot("occasion")
 
-        menus = {
-            "valentine": {
-                "name": "발렌타인 디너",
-                "desc": "연인을 위한 낭만적인 코스입니다."
-            },
-            "french": {
-                "name": "프렌치 디너",
-                "desc": "격식 있는 가족 모임, 우아한 축하 자리에 어울리는 코스입니다."
-            },
-            "english": {
-                "name": "잉글리시 디너",
-                "desc": "브런치 스타일의 든든한 한 끼입니다."
-            },
-            "champagne": {
-                "name": "샴페인 축제 디너",
-                "desc": "생일이나 파티에 최적인 샴페인 포함 코스입니다."
-            }
-        }
-
         # 추천 메뉴 결정
-        recommendations = []
-
-        if occasion:
-            occasion_lower = occasion.lower()
-
-            # 생일/생신 관련
-            if any(keyword in occasion_lower for keyword in ["생일", "생신", "가족"]):
-                recommendations.append(menus["french"])
-                recommendations.append(menus["champagne"])
+        recommendations = get_menu_index().recommend(occasion)
 
-            # 커플/발렌타인 관련
-            elif any(keyword in occasion_lower for keyword in ["커플", "연인", "여자친구", "남자친구", "애인", "발렌타인", "데이트", "기념일"]):
-                recommendations.append(menus["valentine"])
-
-            # 브런치/혼자
-            elif any(keyword in occasion_lower for keyword in ["브런치", "혼자"]):
-                recommendations.append(menus["english"])
-
-            # 파티/축하
-            elif any(keyword in occasion_lower for keyword in ["파티", "축하"]):
-                recommendations.append(menus["champagne"])
-
-            # 기본 추천
-            else:
-                recommendations.append(menus["french"])
-
-        # 메시지 생성
+        # 메시지 생성 (같은 추천 조합은 렌더링 캐시에서 나옴)
+        locale = message_locale(tracker)
         if recommendations:
             if len(recommendations) == 1:
-                message = f"{recommendations[0]['name']}를 추천드려요! {recommendations[0]['desc']}"
+                message = render("recommend_one", locale,
+                                 name=recommendations[0]['name'], desc=recommendations[0]['desc'])
             else:
-                menu_names = " 또는 ".join([r['name'] for r in recommendations])
-                message = f"정말 축하드려요!🎉 {menu_names}는 어떠세요?"
+                separator = render("recommend_separator", locale)
+                menu_names = separator.join([r['name'] for r in recommendations])
+                message = render("recommend_many", locale, menu_names=menu_names)
 
             dispatcher.utter_message(text=message)
         else:
-            dispatcher.utter_message(text="어떤 상황인지 다시 알려주시면 메뉴를 추천해 드릴게요!")
+            dispatcher.utter_message(text=render("recommend_none", locale))
 
         return []
 
 
+@instrument_action
 class ValidateOrderForm(FormValidationAction):
     def name(self) -> Text:
         return "validate_order_form"
@@ -277,7 +219,137 @@ class ValidateOrderForm(FormValidationAction):
             "order_confirmation"
         ]
 
-    def validate_menu_name(
+    async def get_validation_events(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: DomainDict,
+    ) -> List[EventType]:
+        """Run the validate_* methods for this turn's slots concurrently.
+
+        The validators only read the latest message, never slots set by
+        another validator in the same turn, so they can run side by side.
+        Each one gets its own dispatcher and the outputs and messages are
+        merged back in slot order, which keeps the result identical to
+        validating one slot after another. The merged delivery date and
+        time are then checked against the capacity calendar.
+
+        Slots whose value matches the sender's order cache were validated
+        on an earlier turn and are kept as they are. When the form starts,
+        empty slots are filled from the cache as well.
+        """
+        slots_to_validate = await self.required_slots(
+            self.domain_slots(domain), dispatcher, tracker, domain
+        )
+        slots: Dict[Text, Any] = {
+            slot_name: slot_value
+            for slot_name, slot_value in tracker.slots_to_validate().items()
+            if slot_name in slots_to_validate
+        }
+
+        order_cache = get_order_cache()
+        cached = order_cache.partial(tracker.sender_id)
+        slots, validated = split_cached(slots, cached)
+        restored: Dict[Text, Any] = {slot_name: cached[slot_name] for slot_name in validated}
+        if cached and tracker.get_slot("requested_slot") is None:
+            # 폼에 다시 들어옴: 전에 검증한 슬롯으로 빈 슬롯을 채움
+            resumed = [
+                slot_name for slot_name in slots_to_validate
+                if slot_name in cached and slot_name not in slots and slot_name not in restored
+                and tracker.get_slot(slot_name) is None
+            ]
+            restored.update((slot_name, cached[slot_name]) for slot_name in resumed)
+            if resumed:
+                dispatcher.utter_message(text=render("order_resumed", message_locale(tracker)))
+        tracker.slots.update(restored)
+
+        # 검증기들이 읽을 본문 파싱을 run_blocking으로 한 번에 미리 돌려 둠
+        want_temporal = want_numbers = False
+        for slot_name in slots:
+            temporal, numbers = SLOT_TEXT_PARSES.get(slot_name, (False, False))
+            want_temporal, want_numbers = want_temporal or temporal, want_numbers or numbers
+        if want_temporal or want_numbers:
+            await run_text_parses(await get_message_analysis(tracker), want_temporal, want_numbers)
+
+        pending = []
+        for slot_name, slot_value in slots.items():
+            validate_method = getattr(self, f"validate_{slot_name.replace('-', '_')}", None)
+            if validate_method is None:
+                logger.warning(
+                    f"Skipping validation for `{slot_name}`: there is no validation method specified."
+                )
+                continue
+            slot_dispatcher = CollectingDispatcher()
+            pending.append((
+                slot_name,
+                slot_dispatcher,
+                validate_method(slot_value, slot_dispatcher, tracker, domain),
+            ))
+
+        outputs = await asyncio.gather(*(utils.call_potential_coroutine(validation) for _, _, validation in pending))
+
+        for (slot_name, slot_dispatcher, _), validation_output in zip(pending, outputs):
+            dispatcher.messages.extend(slot_dispatcher.messages)
+            if isinstance(validation_output, dict):
+                slots.update(validation_output)
+                tracker.slots.update(validation_output)
+            else:
+                warnings.warn(
+                    f"Cannot validate `{slot_name}`: make sure the validation method returns the correct output."
+                )
+
+        slots = {**restored, **slots}
+        if "delivery_date" in slots or "delivery_time" in slots:
+            slots.update(self.check_delivery_capacity(dispatcher, tracker))
+
+        order_cache.remember(tracker.sender_id, slots)
+        return [SlotSet(slot, value) for slot, value in slots.items()]
+
+    def check_delivery_capacity(self, dispatcher: CollectingDispatcher, tracker: Tracker) -> Dict[Text, Any]:
+        """Reject a full or closed delivery slot and suggest the next free one."""
+        delivery_date = tracker.get_slot("delivery_date")
+        delivery_time = tracker.get_slot("delivery_time")
+        if not delivery_date:
+            return {}
+
+        calendar = get_capacity_calendar()
+        locale = message_locale(tracker)
+        if delivery_time:
+            if not calendar.is_full(delivery_date, delivery_time):
+                return {}
+            requested = format_delivery_slot(delivery_date, delivery_time, locale)
+        elif calendar.is_day_full(delivery_date):
+            requested = format_delivery_slot(delivery_date, locale=locale)
+        else:
+            return {}
+
+        alternative = calendar.next_free(delivery_date, delivery_time)
+        if alternative is None:
+            dispatcher.utter_message(text=render(
+                "capacity_unavailable", locale, requested=requested, days=calendar.search_days
+            ))
+            return {"delivery_date": None, "delivery_time": None}
+
+        alternative_date, alternative_time = alternative
+        alternative_text = format_delivery_slot(alternative_date, alternative_time, locale)
+        if delivery_time and not calendar.is_open(delivery_time):
+            dispatcher.utter_message(text=render(
+                "capacity_closed", locale,
+                requested=requested,
+                opens=calendar.slot_time(calendar.first_slot)[:5],
+                closes=calendar.slot_time(calendar.last_slot)[:5],
+                alternative=alternative_text,
+            ))
+        else:
+            dispatcher.utter_message(text=render(
+                "capacity_full", locale, requested=requested, alternative=alternative_text
+            ))
+        # 같은 날에 빈 시간이 있으면 날짜는 유지하고 시간만 다시 물어봄
+        if alternative_date == delivery_date:
+            return {"delivery_time": None}
+        return {"delivery_date": None, "delivery_time": None}
+
+    async def validate_menu_name(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -285,15 +357,16 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate menu_name value."""
-        valid_menus = ["발렌타인 디너", "프렌치 디너", "잉글리시 디너", "샴페인 축제 디너"]
+        # 띄어쓰기, 별칭, 가벼운 오타를 카탈로그의 정식 메뉴 이름으로 맞춤
+        menu_name = get_menu_matcher().lookup(slot_value)
 
-        if slot_value and any(menu in slot_value for menu in valid_menus):
-            return {"menu_name": slot_value}
+        if menu_name:
+            return {"menu_name": menu_name}
         else:
-            dispatcher.utter_message(text="죄송합니다. 유효한 메뉴를 선택해주세요.")
+            dispatcher.utter_message(text=render("invalid_menu", message_locale(tracker)))
             return {"menu_name": None}
 
-    def validate_menu_quantity(
+    async def validate_menu_quantity(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -301,35 +374,16 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate menu_quantity value."""
-        # Extract menu_quantity entity from the message
-        entities = tracker.latest_message.get('entities', [])
-        quantity_value = None
+        analysis = await get_message_analysis(tracker)
 
-        for entity in entities:
-            if entity['entity'] == 'menu_quantity':
-                quantity_value = entity['value']
-                break
-
-        # If no entity found, try to extract from full text
+        # Extract menu_quantity entity from the message,
+        # falling back to a numeral found in the full text
+        quantity_value = analysis.first('menu_quantity')
         if quantity_value is None:
-            text = tracker.latest_message.get('text', '')
-            # Try to find Korean numbers in the text
-            korean_numbers = ['하나', '한', '둘', '두', '셋', '세', '넷', '네',
-                            '다섯', '여섯', '일곱', '여덟', '아홉', '열']
-            for korean_num in korean_numbers:
-                if korean_num in text:
-                    quantity_value = korean_num
-                    break
-
-            # If still no match, try to find digits
-            if quantity_value is None:
-                import re
-                digit_match = re.search(r'\d+', text)
-                if digit_match:
-                    quantity_value = digit_match.group()
+            quantity_value = analysis.quantity
 
         if quantity_value is None:
-            dispatcher.utter_message(text="올바른 수량을 입력해주세요. (예: 2개, 두 개)")
+            dispatcher.utter_message(text=render("invalid_quantity", message_locale(tracker)))
             return {"menu_quantity": None}
 
         # Try to convert Korean number to int
@@ -340,17 +394,17 @@ class ValidateOrderForm(FormValidationAction):
             try:
                 quantity = int(quantity_value)
             except (ValueError, TypeError):
-                dispatcher.utter_message(text="올바른 수량을 입력해주세요. (예: 2개, 두 개)")
+                dispatcher.utter_message(text=render("invalid_quantity", message_locale(tracker)))
                 return {"menu_quantity": None}
 
         # Validate range
         if quantity > 0 and quantity <= 100:
             return {"menu_quantity": str(quantity)}
         else:
-            dispatcher.utter_message(text="수량은 1개에서 100개 사이로 주문해주세요.")
+            dispatcher.utter_message(text=render("quantity_out_of_range", message_locale(tracker)))
             return {"menu_quantity": None}
 
-    def validate_serving_style(
+    async def validate_serving_style(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -358,15 +412,15 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate serving_style value."""
-        valid_styles = ["심플 스타일", "디럭스 스타일", "그랜드 스타일"]
+        serving_style = get_style_matcher().lookup(slot_value)
 
-        if slot_value and any(style in slot_value for style in valid_styles):
-            return {"serving_style": slot_value}
+        if serving_style:
+            return {"serving_style": serving_style}
         else:
-            dispatcher.utter_message(text="서빙 스타일을 다시 선택해주세요. (심플/디럭스/그랜드)")
+            dispatcher.utter_message(text=render("invalid_serving_style", message_locale(tracker)))
             return {"serving_style": None}
 
-    def validate_side_menu_choice(
+    async def validate_side_menu_choice(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -374,81 +428,29 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate side menu choice and extract side items if selected."""
-        latest_intent = tracker.latest_message.get('intent', {}).get('name')
+        analysis = await get_message_analysis(tracker)
+        latest_intent = analysis.intent
 
         # Check if user wants to add side menu
         if latest_intent == 'select_side_menu':
-            entities = tracker.latest_message.get('entities', [])
-
-            # 엔티티를 텍스트 출현 순서대로 정렬
-            sorted_entities = sorted(entities, key=lambda x: x.get('start', 0))
-
-            # 순서대로 매칭
-            side_items = []
-            current_item = {'name': None, 'quantity': None, 'unit': None}
-
-            for entity in sorted_entities:
-                entity_type = entity['entity']
-                entity_value = entity['value']
-
-                if entity_type == 'side_name':
-                    # 이전 아이템이 있으면 저장
-                    if current_item['name'] is not None:
-                        side_items.append(current_item)
-                    # 새 아이템 시작
-                    current_item = {'name': entity_value, 'quantity': None, 'unit': None}
-
-                elif entity_type == 'side_quantity':
-                    # 한글 숫자를 정수로 변환
-                    converted = korean_number_to_int(entity_value)
-                    if converted is None:
-                        try:
-                            converted = int(entity_value)
-                        except (ValueError, TypeError):
-                            converted = 1
-                    current_item['quantity'] = str(converted)
-
-                elif entity_type == 'side_unit':
-                    current_item['unit'] = entity_value
-
-            # 마지막 아이템 저장
-            if current_item['name'] is not None:
-                side_items.append(current_item)
-
-            # 리스트로 변환
-            side_name_list = []
-            side_quantity_list = []
-            side_unit_list = []
-
-            for item in side_items:
-                name = item['name']
-                quantity = item['quantity'] if item['quantity'] else '1'
-                unit = item['unit']
-
-                # 커피/와인 단위별 이름 처리
-                if name == "커피":
-                    if unit == "포트":
-                        name = "커피 1포트"
-                    # 잔이면 그대로 "커피"
-                elif name == "와인":
-                    if unit == "병":
-                        name = "와인 1병"
-                    # 잔이면 그대로 "와인"
-
-                side_name_list.append(name)
-                side_quantity_list.append(quantity)
-                if unit:
-                    side_unit_list.append(unit)
+            entities = analysis.of_types('side_name', 'side_quantity', 'side_unit')
+            if not entities:
+                # NLU가 엔티티를 놓친 경우 ("스테이크두개") 카탈로그 정규식으로 직접 찾음
+                entities = get_catalogue_patterns().side_entities(analysis.text)
+
+            side_name_list, side_quantity_list, side_unit_list = await run_blocking(
+                assemble_side_items, entities
+            )
 
             if side_name_list and side_quantity_list:
                 return {
                     "side_menu_choice": "yes",
                     "side_name": side_name_list,
                     "side_quantity": side_quantity_list,
-                    "side_unit": side_unit_list if side_unit_list else None
+                    "side_unit": side_unit_list
                 }
             else:
-                dispatcher.utter_message(text="사이드 메뉴와 수량을 함께 알려주세요. (예: 빵 두 개랑 샴페인 한 병)")
+                dispatcher.utter_message(text=render("side_menu_needs_quantity", message_locale(tracker)))
                 return {"side_menu_choice": None}
 
         # Check if user doesn't want side menu
@@ -460,10 +462,10 @@ class ValidateOrderForm(FormValidationAction):
                 "side_unit": None
             }
         else:
-            dispatcher.utter_message(text="사이드 메뉴를 추가하시겠어요?")
+            dispatcher.utter_message(text=render("ask_side_menu", message_locale(tracker)))
             return {"side_menu_choice": None}
 
-    def validate_delivery_date(
+    async def validate_delivery_date(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -471,37 +473,41 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate and convert delivery date to yyyy-mm-dd format."""
-        # Extract date entity from the message
-        entities = tracker.latest_message.get('entities', [])
-        date_value = None
-        time_value = None
+        analysis = await get_message_analysis(tracker)
 
-        for entity in entities:
-            if entity['entity'] == 'date':
-                date_value = entity['value']
-            elif entity['entity'] == 'time':
-                time_value = entity['value']
+        # Extract date entity from the message
+        date_value = analysis.last('date')
+        time_value = analysis.last('time')
 
+        # If no entity found, use the date and time found in the full text
         if date_value is None:
-            dispatcher.utter_message(text="원하시는 배송 일시를 알려주세요!")
-            return {"delivery_date": None}
+            parsed = analysis.temporal
+            if parsed.date is None:
+                dispatcher.utter_message(text=render("ask_delivery_date", message_locale(tracker)))
+                return {"delivery_date": None}
+
+            result = {"delivery_date": parsed.date}
+            if parsed.time:
+                result["delivery_time"] = parsed.time
+            return result
 
         # Convert Korean date expression to yyyy-mm-dd
-        standardized_date = parse_korean_date(date_value)
+        standardized_date, standardized_time = await run_blocking(
+            standardize_delivery, date_value, time_value, analysis.today
+        )
 
         if standardized_date is None:
-            dispatcher.utter_message(text="올바른 날짜 형식을 입력해주세요. (예: 내일, 모레, 12월 8일)")
+            dispatcher.utter_message(text=render("invalid_date", message_locale(tracker)))
             return {"delivery_date": None}
 
         # Also set delivery_time if provided together and convert to HH:MM format
         result = {"delivery_date": standardized_date}
-        if time_value:
-            standardized_time = parse_korean_time(time_value)
+        if standardized_time:
             result["delivery_time"] = standardized_time
 
         return result
 
-    def validate_delivery_time(
+    async def validate_delivery_time(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -509,51 +515,30 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate and convert delivery time to HH:MM:SS format."""
-        # Extract time entity from the message
-        entities = tracker.latest_message.get('entities', [])
-        time_value = None
+        analysis = await get_message_analysis(tracker)
 
-        for entity in entities:
-            if entity['entity'] == 'time':
-                time_value = entity['value']
-                break
-
-        # If no entity found, try to extract from full text
-        if time_value is None:
-            text = tracker.latest_message.get('text', '')
-            import re
-
-            # Try to match numeric time pattern like "6시", "7시 30분"
-            time_match = re.search(r'(\d+)\s*시(?:\s*(\d+)\s*분)?', text)
-            if time_match:
-                hour = time_match.group(1)
-                minute = time_match.group(2) if time_match.group(2) else "00"
-                time_value = f"{hour}시 {minute}분" if minute != "00" else f"{hour}시"
-            else:
-                # Try to match Korean number time pattern like "여섯 시", "일곱 시"
-                korean_hour_pattern = r'(하나|한|둘|두|셋|세|넷|네|다섯|여섯|일곱|여덟|아홉|열|열하나|열한|열둘|열두)\s*시'
-                korean_match = re.search(korean_hour_pattern, text)
-                if korean_match:
-                    korean_hour = korean_match.group(1)
-                    # Convert Korean number to digit
-                    hour_int = korean_number_to_int(korean_hour)
-                    if hour_int:
-                        time_value = f"{hour_int}시"
+        # Extract time entity from the message
+        time_value = analysis.first('time')
 
+        # If no entity found, use the time found in the full text
         if time_value is None:
-            dispatcher.utter_message(text="올바른 시간을 입력해주세요. (예: 6시, 7시 30분)")
-            return {"delivery_time": None}
-
-        # Convert to standard HH:MM:SS format
-        standardized_time = parse_korean_time(time_value)
+            standardized_time = analysis.temporal.time
+            if standardized_time is None:
+                dispatcher.utter_message(text=render("ask_delivery_time", message_locale(tracker)))
+                return {"delivery_time": None}
+        else:
+            # Convert to standard HH:MM:SS format (the original text means it failed)
+            standardized_time = await run_blocking(parse_korean_time, time_value)
+            if standardized_time == time_value:
+                standardized_time = None
 
-        if standardized_time is None or standardized_time == time_value:
-            dispatcher.utter_message(text="올바른 시간 형식을 입력해주세요. (예: 6시, 7시 30분)")
+        if standardized_time is None:
+            dispatcher.utter_message(text=render("invalid_time", message_locale(tracker)))
             return {"delivery_time": None}
 
         return {"delivery_time": standardized_time}
 
-    def validate_order_confirmation(
+    async def validate_order_confirmation(
         self,
         slot_value: Any,
         dispatcher: CollectingDispatcher,
@@ -561,20 +546,21 @@ class ValidateOrderForm(FormValidationAction):
         domain: DomainDict,
     ) -> Dict[Text, Any]:
         """Validate order confirmation."""
-        latest_intent = tracker.latest_message.get('intent', {}).get('name')
+        latest_intent = (await get_message_analysis(tracker)).intent
 
         # 'deny'면 확인 완료
         if latest_intent == 'deny':
             return {"order_confirmation": True}
         # 'affirm'이면 추가 요청이 있다는 뜻이므로 다시 물어봄
         elif latest_intent == 'affirm':
-            dispatcher.utter_message(text="추가로 필요하신 사항을 말씀해주세요.")
+            dispatcher.utter_message(text=render("ask_additional_request", message_locale(tracker)))
             return {"order_confirmation": None}
         else:
             # 명확하지 않으면 다시 물어봄
             return {"order_confirmation": None}
 
 
+@instrument_action
 class ActionSubmitOrder(Action):
     def name(self) -> Text:
         return "action_submit_order"
@@ -592,56 +578,81 @@ class ActionSubmitOrder(Action):
         delivery_date = tracker.get_slot("delivery_date")
         delivery_time = tracker.get_slot("delivery_time")
 
-        # Build order summary message
-        message = f"주문이 완료되었습니다!\n\n"
-        message += f"📋 주문 내역\n"
-        message += f"  📌 메뉴: {menu_name}\n"
-        message += f"  📌 수량: {menu_quantity}개\n"
-        message += f"  📌 서빙 스타일: {serving_style}\n"
-
-        if side_name and side_quantity:
-            message += f"\n🍽️ 사이드 메뉴\n"
-            if isinstance(side_name, list) and isinstance(side_quantity, list):
-                # If we have units, use them; otherwise default to "개"
-                if side_unit and isinstance(side_unit, list):
-                    for name, qty, unit in zip(side_name, side_quantity, side_unit):
-                        message += f"  📌 {name} {qty}{unit}\n"
-                else:
-                    for name, qty in zip(side_name, side_quantity):
-                        message += f"  📌 {name} {qty}개\n"
-            else:
-                unit_str = side_unit if side_unit else "개"
-                message += f" 📌 {side_name} {side_quantity}{unit_str}\n"
+        order_data = {
+            "menu_name": menu_name,
+            "menu_quantity": menu_quantity,
+            "serving_style": serving_style,
+            "side_name": side_name,
+            "side_quantity": side_quantity,
+            "side_unit": side_unit,
+            "delivery_date": delivery_date,
+            "delivery_time": delivery_time
+        }
 
-        message += f"\n📦 배송 정보\n"
-        message += f"  📌 날짜: {delivery_date}\n"
-        message += f"  📌 시간: {delivery_time}\n"
-        message += f"\n감사합니다! 맛있게 드세요 😊"
+        # 사이드 메뉴 슬롯은 리스트가 기본이지만 단일 값도 받음
+        side_lists = _side_slot_lists(side_name, side_quantity, side_unit)
+        quote = get_price_table().quote(menu_name, menu_quantity, serving_style, *side_lists)
+        pricing = quote.to_dict()
+
+        # Queue the order for storage; resubmitting the same order is a no-op
+        order_id, is_new = get_order_sink().submit(tracker.sender_id, order_data, extra=pricing)
+        if is_new:
+            get_capacity_calendar().book(order_id, delivery_date, delivery_time)
+        get_order_cache().complete(tracker.sender_id, order_data)
+
+        message = render_order_summary(order_data, side_lists, quote, message_locale(tracker))
 
         dispatcher.utter_message(
             text=message,
             json_message={
-                "order_data": {
-                    "menu_name": menu_name,
-                    "menu_quantity": menu_quantity,
-                    "serving_style": serving_style,
-                    "side_name": side_name,
-                    "side_quantity": side_quantity,
-                    "side_unit": side_unit,
-                    "delivery_date": delivery_date,
-                    "delivery_time": delivery_time
-                }
+                "order_data": {**order_data, "order_id": order_id, **pricing}
             }
         )
 
-        # Reset slots
-        return [
-            SlotSet("menu_name", None),
-            SlotSet("menu_quantity", None),
-            SlotSet("serving_style", None),
-            SlotSet("side_name", None),
-            SlotSet("side_quantity", None),
-            SlotSet("side_unit", None),
-            SlotSet("delivery_date", None),
-            SlotSet("delivery_time", None)
+        # Reset slots (the order cache keeps this order for reordering)
+        return [SlotSet(slot_name, None) for slot_name in ORDER_FIELDS]
+
+
+@instrument_action
+class ActionReorderLastOrder(Action):
+    """Start a new order with the sender's last menu, style and sides."""
+
+    def name(self) -> Text:
+        return "action_reorder_last_order"
+
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+
+        locale = message_locale(tracker)
+        last_order = get_order_cache().last_order(tracker.sender_id)
+        if not last_order:
+            dispatcher.utter_message(text=render("reorder_none", locale))
+            return []
+
+        slots: Dict[Text, Any] = {
+            slot_name: last_order.get(slot_name)
+            for slot_name in ("menu_name", "menu_quantity", "serving_style", "side_name", "side_quantity", "side_unit")
+        }
+        slots["side_menu_choice"] = "yes" if slots["side_name"] else "no"
+
+        # 지난 주문의 배송 일시는 이미 지났으므로 이번 메시지에서만 가져옴
+        # ("지난번이랑 똑같이 내일 7시에")
+        analysis = await get_message_analysis(tracker)
+        await run_text_parses(analysis, temporal=True)
+        parsed = analysis.temporal
+        slots["delivery_date"] = parsed.date
+        slots["delivery_time"] = parsed.time
+
+        # 폼이 이 값들을 다시 검증하지 않도록 캐시에 넣어 둠
+        get_order_cache().remember(tracker.sender_id, slots)
+
+        dispatcher.utter_message(text=render(
+            "reorder_summary", locale,
+            menu_name=slots["menu_name"],
+            menu_quantity=slots["menu_quantity"],
+            serving_style=slots["serving_style"],
+        ))
+        return [SlotSet(slot_name, value) for slot_name, value in slots.items()] + [
+            SlotSet("order_confirmation", None)
         ]
@@ -0,0 +1,262 @@
+# 배송 시간대 수용량
+#
+# 이미 받은 주문을 (배송 날짜, 시간대) 버킷으로 세어 두고, 요청한 시간대가
+# 꽉 찼는지와 가장 가까운 빈 시간대를 바로 답합니다. 날짜별로 꽉 찬 시간대
+# 번호를 정렬된 배열로 들고 있어서 빈 시간대는 이분 탐색으로 찾습니다.
+#
+# 시간대 길이, 시간대별 최대 주문 수, 영업 시간은 catalogue.yml의 capacity
+# 항목에서 읽습니다. 처음 쓸 때 주문 저장소에서 주문을 읽어 채우고, 이후에는
+# 이 프로세스에서 받은 주문을 바로 반영하면서 refresh_seconds마다 다른
+# 워커가 저장한 주문을 합칩니다. 합치기는 저장소에서 지난번 이후에 저장된
+# 주문만 읽고 (JSONL은 파일 위치부터), 이벤트 루프를 막지 않도록 별도 스레드에서
+# 돕니다. 배송 날짜가 지난 주문은 그때 잊습니다.
+#
+# 영업 시간(first_slot ~ last_slot) 밖의 시간대는 꽉 찬 것으로 봅니다.
+#
+# catalogue.yml이 바뀌어도 capacity 항목이 그대로면 달력을 그대로 쓰고, 바뀌었으면
+# 이미 센 주문으로 시간대를 다시 나눕니다. 어느 쪽이든 주문 저장소를 다시 읽지
+# 않습니다.
+
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .catalogue import CatalogueCache
+from .clock import get_clock
+from .order_store import get_order_sink
+
+logger = logging.getLogger(__name__)
+
+Slot = Tuple[str, str]
+
+
+def _minutes(value: str) -> int:
+    """Minutes since midnight of 'HH:MM' or 'HH:MM:SS'."""
+    hour, minute = value.split(':')[:2]
+    return int(hour) * 60 + int(minute)
+
+
+class CapacityCalendar:
+    """Booked orders per delivery date and time slot."""
+
+    def __init__(
+        self,
+        slot_minutes: int = 30,
+        max_orders_per_slot: int = 4,
+        first_slot: str = '11:00',
+        last_slot: str = '22:00',
+        search_days: int = 7,
+        refresh_seconds: float = 5.0,
+    ) -> None:
+        self._counts: Dict[Tuple[str, int], int] = {}
+        # 날짜 → 꽉 찬 시간대 번호 (정렬됨)
+        self._full: Dict[str, List[int]] = {}
+        # 날짜 → 센 주문 id → 배송 시각(분). 지난 날짜는 통째로 버림
+        self._order_ids: Dict[str, Dict[str, int]] = {}
+        # 이 날짜보다 이른 주문은 세지 않음
+        self._first_day = ''
+        self._lock = threading.Lock()
+        # 저장소에서 이어 읽을 위치 (OrderBackend.read_new)
+        self._cursor: Any = None
+        self._refreshed_at = 0.0
+        self._refreshing = False
+        self.configure(slot_minutes, max_orders_per_slot, first_slot, last_slot, search_days, refresh_seconds)
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> 'CapacityCalendar':
+        return cls(**(catalogue.get('capacity') or {}))
+
+    def configure(
+        self,
+        slot_minutes: int = 30,
+        max_orders_per_slot: int = 4,
+        first_slot: str = '11:00',
+        last_slot: str = '22:00',
+        search_days: int = 7,
+        refresh_seconds: float = 5.0,
+    ) -> None:
+        """Apply new settings, re-bucketing the orders already counted."""
+        with self._lock:
+            self.settings = {
+                'slot_minutes': slot_minutes,
+                'max_orders_per_slot': max_orders_per_slot,
+                'first_slot': first_slot,
+                'last_slot': last_slot,
+                'search_days': search_days,
+                'refresh_seconds': refresh_seconds,
+            }
+            self.slot_minutes = slot_minutes
+            self.max_orders_per_slot = max_orders_per_slot
+            self.first_slot = _minutes(first_slot) // slot_minutes
+            self.last_slot = _minutes(last_slot) // slot_minutes
+            self.search_days = search_days
+            self.refresh_seconds = refresh_seconds
+            self._counts = {}
+            for delivery_date, order_ids in self._order_ids.items():
+                for minutes in order_ids.values():
+                    key = (delivery_date, minutes // slot_minutes)
+                    self._counts[key] = self._counts.get(key, 0) + 1
+            self._full = {}
+            for (delivery_date, slot), count in sorted(self._counts.items()):
+                if count >= max_orders_per_slot:
+                    self._full.setdefault(delivery_date, []).append(slot)
+
+    def slot_of(self, time_value: str) -> int:
+        return _minutes(time_value) // self.slot_minutes
+
+    def slot_time(self, slot: int) -> str:
+        minutes = slot * self.slot_minutes
+        return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+    def book(self, order_id: str, delivery_date: Optional[str], delivery_time: Optional[str]) -> bool:
+        """Count one order against its slot; returns False if already counted."""
+        if not delivery_date or not delivery_time:
+            return False
+        minutes = _minutes(delivery_time)
+        with self._lock:
+            if delivery_date < self._first_day:
+                return False
+            order_ids = self._order_ids.setdefault(delivery_date, {})
+            if order_id in order_ids:
+                return False
+            order_ids[order_id] = minutes
+            slot = minutes // self.slot_minutes
+            key = (delivery_date, slot)
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+            if count == self.max_orders_per_slot:
+                insort(self._full.setdefault(delivery_date, []), slot)
+        return True
+
+    def load(self, orders: Iterable[Dict[str, Any]]) -> 'CapacityCalendar':
+        """Book every order not counted yet."""
+        for order in orders:
+            self.book(order.get('order_id', ''), order.get('delivery_date'), order.get('delivery_time'))
+        return self
+
+    def prune(self, today: str) -> None:
+        """Forget every order delivered before today ('YYYY-MM-DD')."""
+        with self._lock:
+            self._first_day = max(self._first_day, today)
+            for delivery_date in [day for day in self._order_ids if day < self._first_day]:
+                del self._order_ids[delivery_date]
+                self._full.pop(delivery_date, None)
+            for key in [key for key in self._counts if key[0] < self._first_day]:
+                del self._counts[key]
+
+    def load_new(self, backend: Any) -> None:
+        """Book the orders backend stored since the last call, then prune past days."""
+        orders, self._cursor = backend.read_new(self._cursor)
+        self.load(orders)
+        self.prune(get_clock().today().isoformat())
+        self._refreshed_at = time.monotonic()
+
+    def refresh(self, force: bool = False) -> None:
+        """Merge orders other processes stored since the last load.
+
+        Runs on a background thread and returns at once, unless force is set.
+        """
+        if not force and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        if force:
+            self.load_new(get_order_sink().backend)
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name='capacity-refresh', daemon=True).start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.load_new(get_order_sink().backend)
+        except Exception:
+            logger.exception("Failed to read new orders for the capacity calendar")
+            # 실패해도 다음 주기에 다시 시도
+            self._refreshed_at = time.monotonic()
+        finally:
+            self._refreshing = False
+
+    def booked(self, delivery_date: str, delivery_time: str) -> int:
+        return self._counts.get((delivery_date, self.slot_of(delivery_time)), 0)
+
+    def is_open(self, delivery_time: str) -> bool:
+        """True when delivery_time falls between first_slot and last_slot."""
+        return self.first_slot <= self.slot_of(delivery_time) <= self.last_slot
+
+    def is_full(self, delivery_date: str, delivery_time: str) -> bool:
+        """True when the slot has no room left; slots outside business hours are always full."""
+        if not self.is_open(delivery_time):
+            return True
+        return self.booked(delivery_date, delivery_time) >= self.max_orders_per_slot
+
+    def _first_free(self, delivery_date: str, slot: int) -> int:
+        full = self._full.get(delivery_date)
+        if not full:
+            return slot
+        index = bisect_left(full, slot)
+        if index == len(full) or full[index] != slot:
+            return slot
+        # 연속으로 꽉 찬 구간에서는 full[i] - i 가 같으므로 그 끝을 이분 탐색
+        run_key = slot - index
+        low, high = index + 1, len(full)
+        while low < high:
+            middle = (low + high) // 2
+            if full[middle] - middle == run_key:
+                low = middle + 1
+            else:
+                high = middle
+        return full[low - 1] + 1
+
+    def next_free(self, delivery_date: str, delivery_time: Optional[str] = None) -> Optional[Slot]:
+        """Earliest free (date, time) at or after the requested slot within search_days.
+
+        Without a time, the search starts at the first slot of the day.
+        """
+        day = date.fromisoformat(delivery_date)
+        start = self.slot_of(delivery_time) if delivery_time else self.first_slot
+        with self._lock:
+            for offset in range(self.search_days + 1):
+                current = (day + timedelta(days=offset)).isoformat()
+                slot = self._first_free(current, max(start, self.first_slot) if offset == 0 else self.first_slot)
+                if slot <= self.last_slot:
+                    return current, self.slot_time(slot)
+        return None
+
+    def is_day_full(self, delivery_date: str) -> bool:
+        """True when no slot between first_slot and last_slot is free."""
+        with self._lock:
+            return self._first_free(delivery_date, self.first_slot) > self.last_slot
+
+
+_calendar: Optional[CapacityCalendar] = None
+
+
+def _build_calendar(catalogue: Dict[str, Any]) -> CapacityCalendar:
+    global _calendar
+    settings = catalogue.get('capacity') or {}
+    if _calendar is not None:
+        # 다른 항목만 바뀌었으면 그대로, capacity가 바뀌었으면 센 주문으로 다시 나눔
+        if CapacityCalendar(**settings).settings != _calendar.settings:
+            _calendar.configure(**settings)
+        return _calendar
+    sink = get_order_sink()
+    # 아직 기록되지 않은 주문까지 포함해서 읽음
+    sink.flush()
+    calendar = CapacityCalendar(**settings)
+    calendar.load_new(sink.backend)
+    _calendar = calendar
+    return calendar
+
+
+_CALENDAR = CatalogueCache(_build_calendar)
+
+
+def get_capacity_calendar() -> CapacityCalendar:
+    """Return the calendar, merging recently stored orders first."""
+    calendar = _CALENDAR.get()
+    calendar.refresh()
+    return calendar
@@ -0,0 +1,92 @@
+# catalogue.yml 로더
+#
+# 메뉴, 추천 규칙 등 코드 밖에서 관리하는 데이터를 읽어옵니다. 파일의
+# 수정 시각을 확인해서 바뀌었을 때만 다시 읽고, 파생 인덱스를 다시 만듭니다.
+# 수정 시각은 CHECK_INTERVAL 초에 한 번만 확인합니다.
+#
+# 파일이 잘못되어 읽거나 만들 수 없으면 마지막으로 만든 값을 계속 쓰고, 같은
+# 수정 시각에 대해서는 오류를 한 번만 남기고 다시 읽지 않습니다.
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'catalogue.yml')
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+CHECK_INTERVAL = 1.0
+
+
+def read_catalogue(path: str = CATALOGUE_PATH) -> Dict[str, Any]:
+    """Read and parse the catalogue file."""
+    # ruamel.yaml은 import가 무거우므로 카탈로그를 처음 읽을 때 불러옴
+    from ruamel.yaml import YAML
+
+    with open(path, encoding='utf-8') as f:
+        return YAML(typ='safe').load(f) or {}
+
+
+class CatalogueCache(Generic[T]):
+    """Build an object from the catalogue and rebuild it when the file changes.
+
+    The file is stat()-ed on access, at most once per check_interval
+    seconds; parsing and the builder run once per modification. When that
+    fails, the last good value is kept; before the first good build the
+    error is raised again.
+    """
+
+    def __init__(
+        self,
+        builder: Callable[[Dict[str, Any]], T],
+        path: str = CATALOGUE_PATH,
+        check_interval: float = CHECK_INTERVAL,
+    ) -> None:
+        self._builder = builder
+        self._path = path
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = float('-inf')
+        self._value: Optional[T] = None
+        # 마지막으로 실패한 수정 시각과 그때의 오류
+        self._failed_mtime: Optional[float] = None
+        self._error: Optional[Exception] = None
+
+    def get(self) -> T:
+        now = time.monotonic()
+        if now - self._checked_at < self._check_interval and self._mtime is not None:
+            return self._value
+        try:
+            mtime: Optional[float] = os.stat(self._path).st_mtime
+        except OSError as exc:
+            mtime = None
+            self._fail(mtime, exc)
+        if mtime is not None and mtime != self._mtime and mtime != self._failed_mtime:
+            with self._lock:
+                if mtime != self._mtime and mtime != self._failed_mtime:
+                    try:
+                        self._value = self._builder(read_catalogue(self._path))
+                    except Exception as exc:
+                        self._fail(mtime, exc)
+                    else:
+                        self._mtime = mtime
+                        self._failed_mtime = self._error = None
+        self._checked_at = now
+        if self._mtime is None:
+            # 한 번도 만들지 못했으면 쓸 값이 없음
+            raise self._error
+        return self._value
+
+    def _fail(self, mtime: Optional[float], error: Exception) -> None:
+        if self._error is None or mtime != self._failed_mtime:
+            if self._mtime is None:
+                logger.error("Could not load %s: %s", self._path, error)
+            else:
+                logger.error("Could not load %s, keeping the previous version: %s", self._path, error)
+        self._failed_mtime = mtime
+        self._error = error
@@ -0,0 +1,72 @@
+# KST 시계
+#
+# 날짜 계산에 쓰는 "지금"을 한 곳에서 제공합니다. 시간대 객체는 zoneinfo로
+# 한 번만 만들어 재사용하고, 한 턴의 검증 메서드들은 턴 시작 시점에 찍어 둔
+# 같은 시각(message_analysis.MessageAnalysis.now)을 기준으로 날짜를 풉니다.
+#
+# 테스트와 벤치마크에서는 set_clock(FrozenClock(...))으로 시각을 고정할 수
+# 있습니다.
+
+from datetime import date, datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str) -> tzinfo:
+    """Return a shared tzinfo for an IANA zone name."""
+    return ZoneInfo(name)
+
+
+KST = get_timezone('Asia/Seoul')
+
+
+class Clock:
+    """Source of the current time in KST."""
+
+    def now(self) -> datetime:
+        return datetime.now(KST)
+
+    def today(self) -> date:
+        return self.now().date()
+
+
+class FrozenClock(Clock):
+    """Clock that always returns the same moment.
+
+    A naive moment is taken to be KST.
+    """
+
+    def __init__(self, moment: datetime) -> None:
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=KST)
+        self.moment = moment.astimezone(KST)
+
+    def now(self) -> datetime:
+        return self.moment
+
+    @classmethod
+    def on(cls, day: date, hour: int = 12) -> 'FrozenClock':
+        """Freeze the clock at the given hour of a KST calendar day."""
+        return cls(datetime(day.year, day.month, day.day, hour, tzinfo=KST))
+
+    @classmethod
+    def at_timestamp(cls, timestamp: float) -> 'FrozenClock':
+        return cls(datetime.fromtimestamp(timestamp, timezone.utc))
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    """Return the clock used by the parsers and validators."""
+    return _clock
+
+
+def set_clock(clock: Optional[Clock] = None) -> Clock:
+    """Install a clock (None restores the system clock); returns the old one."""
+    global _clock
+    previous = _clock
+    _clock = clock if clock is not None else Clock()
+    return previous
@@ -0,0 +1,212 @@
+# 메뉴/서빙 스타일 이름 퍼지 매칭
+#
+# "프렌치디너", "프랜치 디너", "그랜드스타일로요"처럼 띄어쓰기나 오타가 섞인
+# 슬롯 값을 카탈로그의 정식 이름으로 풀어 줍니다.
+#
+#   1. 공백과 문장 부호를 빼고 소문자로 만든 키가 그대로 있으면 바로 반환
+#   2. 한글 음절을 자모로 풀어서(프 → ㅍㅡ) 한 글자 오타를 한 번의 편집으로 셈
+#   3. 자모 2-gram 역색인으로 후보를 좁히고, 후보마다 Myers 비트 병렬
+#      알고리즘으로 입력 안의 가장 가까운 부분 문자열과의 편집 거리를 계산
+#
+# 후보 필터는 q-gram 보조정리를 씁니다. 편집 k번은 키의 q-gram을 최대 k*q개
+# 지우므로, 키의 서로 다른 q-gram G개 중 G - k*q개 이상을 입력과 공유해야
+# 합니다. 그러면 키의 q-gram 중 아무 k*q + t개에는 공유하는 것이 t개 이상
+# 있으므로, 역색인에는 키마다 가장 드문 q-gram k*q + t개만 넣고 그중 t개
+# 이상이 입력에 나온 키만 후보로 삼습니다 ("디너"처럼 모든 메뉴에 있는
+# q-gram은 보통 색인되지 않음).
+
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .catalogue import CatalogueCache
+
+GRAM_SIZE = 2
+# 후보가 되려면 입력에 나와야 하는 색인된 q-gram 수 (위 설명의 t)
+PREFIX_HITS = 3
+MAX_EDIT_RATIO = 0.2
+MATCH_CACHE_SIZE = 1024
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_COUNT = 11172
+
+
+def normalize(text: str) -> str:
+    """NFC, lower-case, letters and digits only."""
+    return ''.join(char for char in unicodedata.normalize('NFC', text).lower() if char.isalnum())
+
+
+def decompose(text: str) -> str:
+    """Split precomposed Hangul syllables into conjoining jamo."""
+    chars = []
+    for char in text:
+        offset = ord(char) - _SYLLABLE_BASE
+        if 0 <= offset < _SYLLABLE_COUNT:
+            chars.append(chr(0x1100 + offset // 588))
+            chars.append(chr(0x1161 + offset % 588 // 28))
+            if offset % 28:
+                chars.append(chr(0x11A7 + offset % 28))
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class FuzzyMatch(NamedTuple):
+    value: str
+    # 매칭된 이름 또는 별칭
+    alias: str
+    distance: int
+
+
+class _Key:
+    __slots__ = ('value', 'alias', 'length', 'max_edits', 'peq', 'grams', 'min_shared', 'prefix_hits')
+
+    def __init__(self, value: str, alias: str, jamo: str, max_edit_ratio: float) -> None:
+        self.value = value
+        self.alias = alias
+        self.length = len(jamo)
+        self.max_edits = int(len(jamo) * max_edit_ratio)
+        # 문자 → 키 안에서 그 문자가 나오는 위치의 비트마스크
+        self.peq: Dict[str, int] = {}
+        for position, char in enumerate(jamo):
+            self.peq[char] = self.peq.get(char, 0) | (1 << position)
+        self.grams = frozenset(_grams(jamo))
+        self.min_shared = len(self.grams) - self.max_edits * GRAM_SIZE
+        self.prefix_hits = min(PREFIX_HITS, self.min_shared)
+
+    def distance_in(self, text: str) -> int:
+        """Edit distance to the closest substring of text (Myers, 1999)."""
+        length = self.length
+        mask = (1 << length) - 1
+        high = 1 << (length - 1)
+        peq = self.peq
+        pv, mv, score = mask, 0, length
+        best = length
+        for char in text:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+                if score < best:
+                    best = score
+                    if not best:
+                        return 0
+            # 탐색 모드: 시작 위치가 자유로우므로 ph에 1을 넣지 않음
+            ph = (ph << 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+        return best
+
+
+class FuzzyIndex:
+    """Resolve noisy names to canonical values.
+
+    Each value can have aliases; an input matches when some alias occurs
+    in it with at most max_edit_ratio × (alias length in jamo) edits.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Iterable[str]]], max_edit_ratio: float = MAX_EDIT_RATIO) -> None:
+        self._exact: Dict[str, FuzzyMatch] = {}
+        self._keys: List[_Key] = []
+        for value, aliases in entries:
+            for alias in (value, *aliases):
+                normalized = normalize(alias)
+                if not normalized or normalized in self._exact:
+                    continue
+                self._exact[normalized] = FuzzyMatch(value, alias, 0)
+                self._keys.append(_Key(value, alias, decompose(normalized), max_edit_ratio))
+
+        # 긴 이름이 먼저 (같은 거리면 "샴페인 축제 디너"가 "샴페인 축제"보다 우선)
+        self._keys.sort(key=lambda key: -key.length)
+        frequency: Dict[str, int] = {}
+        for key in self._keys:
+            for gram in key.grams:
+                frequency[gram] = frequency.get(gram, 0) + 1
+        self._postings: Dict[str, List[int]] = {}
+        # 편집 허용치에 비해 짧아서 q-gram 필터를 쓸 수 없는 키
+        self._unfiltered: List[int] = []
+        for index, key in enumerate(self._keys):
+            if key.min_shared <= 0:
+                self._unfiltered.append(index)
+                continue
+            rarest = sorted(key.grams, key=lambda gram: (frequency[gram], gram))
+            for gram in rarest[:len(key.grams) - key.min_shared + key.prefix_hits]:
+                self._postings.setdefault(gram, []).append(index)
+
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _candidates(self, jamo: str) -> List[int]:
+        grams = _grams(jamo)
+        postings = self._postings
+        hits = Counter(chain.from_iterable(postings[gram] for gram in grams if gram in postings))
+        keys = self._keys
+        candidates = [
+            index for index, count in hits.items()
+            if count >= keys[index].prefix_hits and len(keys[index].grams & grams) >= keys[index].min_shared
+        ]
+        candidates.extend(self._unfiltered)
+        return sorted(candidates)
+
+    def _match(self, text: str) -> Optional[FuzzyMatch]:
+        normalized = normalize(text)
+        if not normalized:
+            return None
+        exact = self._exact.get(normalized)
+        if exact is not None:
+            return exact
+
+        jamo = decompose(normalized)
+        best: Optional[Tuple[int, int]] = None
+        for index in self._candidates(jamo):
+            key = self._keys[index]
+            if key.length - key.max_edits > len(jamo):
+                continue
+            distance = key.distance_in(jamo)
+            if distance <= key.max_edits and (best is None or distance < best[0]):
+                best = (distance, index)
+                if not distance:
+                    break
+        if best is None:
+            return None
+        key = self._keys[best[1]]
+        return FuzzyMatch(key.value, key.alias, best[0])
+
+    def lookup(self, text: Any) -> Optional[str]:
+        """Canonical value for text, or None when nothing is close enough."""
+        if not isinstance(text, str):
+            return None
+        found = self.match(text)
+        return found.value if found else None
+
+
+def _entries(section: Dict[str, Any]) -> List[Tuple[str, List[str]]]:
+    return [(entry['name'], list(entry.get('aliases') or [])) for entry in section.values()]
+
+
+_MENU_MATCHER = CatalogueCache(lambda catalogue: FuzzyIndex(_entries(catalogue.get('menus', {}))))
+_STYLE_MATCHER = CatalogueCache(lambda catalogue: FuzzyIndex(_entries(catalogue.get('serving_styles', {}))))
+
+
+def get_menu_matcher() -> FuzzyIndex:
+    """Return the menu name index, rebuilt if catalogue.yml changed."""
+    return _MENU_MATCHER.get()
+
+
+def get_style_matcher() -> FuzzyIndex:
+    """Return the serving style index, rebuilt if catalogue.yml changed."""
+    return _STYLE_MATCHER.get()
@@ -0,0 +1,70 @@
+# Aho–Corasick 다중 키워드 매처
+#
+# 키워드가 수천 개여도 입력 문장을 한 번만 훑어서 등장하는 모든 키워드를
+# 찾습니다. 오토마톤은 생성 시점에 한 번만 만들어집니다.
+
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class KeywordAutomaton(Generic[T]):
+    """Match every occurrence of a fixed keyword set in one pass.
+
+    Each keyword carries a payload; `find` yields (start, end, payload)
+    for every (possibly overlapping) occurrence in the text.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, T]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 각 상태에서 끝나는 (키워드 길이, payload) 목록
+        self._output: List[List[Tuple[int, T]]] = [[]]
+
+        for keyword, payload in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append((len(keyword), payload))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """Yield (start, end, payload) for every keyword found in text."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in output[state]:
+                end = index + 1
+                yield end - length, end, payload
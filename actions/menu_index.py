@@ -0,0 +1,84 @@
+# 상황별 메뉴 추천 인덱스
+#
+# catalogue.yml의 추천 규칙 키워드를 하나의 Aho–Corasick 오토마톤으로
+# 만들어 두고, 상황 문장을 한 번 훑어서 매칭된 규칙의 가중치를 합산합니다.
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalogue import CatalogueCache
+from .keyword_automaton import KeywordAutomaton
+
+
+class MenuIndex:
+    """Occasion keyword → weighted menu recommendations."""
+
+    def __init__(
+        self,
+        menus: Dict[str, Dict[str, Any]],
+        rules: List[Dict[str, Any]],
+        default: List[str],
+        max_recommendations: int,
+    ) -> None:
+        self.menus = menus
+        self.default = [menus[key] for key in default]
+        self.max_recommendations = max_recommendations
+        # 카탈로그 순서를 동점일 때의 우선순위로 사용
+        self._order = {key: position for position, key in enumerate(menus)}
+        self._rule_weights: List[Tuple[Tuple[str, float], ...]] = []
+
+        keywords = []
+        for rule_id, rule in enumerate(rules):
+            weights = tuple((key, float(weight)) for key, weight in rule['menus'].items())
+            for key, _ in weights:
+                if key not in menus:
+                    raise ValueError(f"Unknown menu '{key}' in recommendation rule {rule_id}")
+            self._rule_weights.append(weights)
+            keywords.extend((keyword.lower(), rule_id) for keyword in rule['keywords'])
+
+        self._automaton = KeywordAutomaton(keywords)
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> "MenuIndex":
+        recommendations = catalogue.get('recommendations', {})
+        return cls(
+            menus=catalogue['menus'],
+            rules=recommendations.get('rules', []),
+            default=recommendations.get('default', []),
+            max_recommendations=recommendations.get('max_recommendations', 2),
+        )
+
+    def matched_rules(self, occasion: str) -> List[int]:
+        """Return the ids of every rule whose keywords appear in occasion."""
+        seen = set()
+        for _, _, rule_id in self._automaton.find(occasion.lower()):
+            seen.add(rule_id)
+        return sorted(seen)
+
+    def recommend(self, occasion: Optional[str]) -> List[Dict[str, Any]]:
+        """Return menus for the occasion, highest score first.
+
+        Every matched rule contributes its weights once, however often its
+        keywords repeat. Falls back to the default menus when nothing
+        matches, and returns [] when there is no occasion at all.
+        """
+        if not occasion:
+            return []
+
+        scores: Dict[str, float] = {}
+        for rule_id in self.matched_rules(occasion):
+            for key, weight in self._rule_weights[rule_id]:
+                scores[key] = scores.get(key, 0.0) + weight
+
+        if not scores:
+            return list(self.default)
+
+        ranked = sorted(scores, key=lambda key: (-scores[key], self._order[key]))
+        return [self.menus[key] for key in ranked[:self.max_recommendations]]
+
+
+_MENU_INDEX = CatalogueCache(MenuIndex.from_catalogue)
+
+
+def get_menu_index() -> MenuIndex:
+    """Return the menu index, rebuilt if catalogue.yml changed."""
+    return _MENU_INDEX.get()
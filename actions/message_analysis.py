@@ -0,0 +1,155 @@
+# 턴 단위 메시지 분석
+#
+# 한 턴에서 여러 validate_* 메서드가 같은 latest_message를 각자 훑지 않도록,
+# 엔티티를 종류별로 묶어 두고, 본문에서 찾는 보조 추출(수량·시각 후보 스캔,
+# 날짜/시간)은 처음 필요할 때 한 번만 실행합니다. 결과는 Tracker에 붙여 두고 같은 턴
+# 안에서 재사용합니다. 웹훅 배치(actions/webhook.py)는 분석을 미리 만들어
+# 컨텍스트 변수로 넘겨 줍니다. 본문 파싱은 run_blocking(actions/offload.py)을
+# 거치므로 ACTIONS_EXECUTOR로 실행 위치를 고를 수 있습니다.
+
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .clock import get_clock
+from .number_scanner import QUANTITY, Candidate, first_candidate, get_numeric_scanner
+from .offload import run_blocking
+from .temporal import TemporalExpression, parse_temporal
+
+
+_UNSET: Any = object()
+
+# 슬롯 → 검증에 필요한 본문 파싱 (날짜/시간, 수량)
+SLOT_TEXT_PARSES = {
+    "menu_quantity": (False, True),
+    "delivery_date": (True, False),
+    "delivery_time": (True, False),
+}
+
+
+class MessageAnalysis:
+    """Everything the validators read from one user message."""
+
+    __slots__ = ("text", "intent", "entities", "by_type", "now", "_numbers", "_temporal")
+
+    def __init__(self, text: str, intent: Optional[str], entities: List[Dict[str, Any]],
+                 now: Optional[datetime] = None) -> None:
+        self.text = text
+        self.intent = intent
+        # 문장 순서대로 정렬된 엔티티
+        self.entities = entities
+        self.by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for entity in entities:
+            self.by_type.setdefault(entity["entity"], []).append(entity)
+        # 이 턴의 모든 날짜 계산이 기준으로 삼는 KST 시각
+        self.now = now if now is not None else get_clock().now()
+        self._numbers = _UNSET
+        self._temporal = _UNSET
+
+    @property
+    def today(self) -> date:
+        """KST calendar day of this turn."""
+        return self.now.date()
+
+    @property
+    def numbers(self) -> List[Candidate]:
+        """Quantity and unit candidates found in the text."""
+        if self._numbers is _UNSET:
+            self._numbers = get_numeric_scanner().scan(self.text)
+        return self._numbers
+
+    @property
+    def quantity(self) -> Optional[str]:
+        """First quantity in the text, for turns without a quantity entity."""
+        candidate = first_candidate(self.numbers, QUANTITY)
+        return candidate.text if candidate is not None else None
+
+    @property
+    def temporal(self) -> TemporalExpression:
+        """Date/time found in the text, for turns without date/time entities."""
+        if self._temporal is _UNSET:
+            self._temporal = parse_temporal(self.text, self.today)
+        return self._temporal
+
+    def preset(self, temporal: Any = _UNSET, numbers: Any = _UNSET) -> None:
+        """Store text parses computed ahead of time, e.g. for a webhook batch."""
+        if temporal is not _UNSET:
+            self._temporal = temporal
+        if numbers is not _UNSET:
+            self._numbers = numbers
+
+    def missing(self, temporal: bool, numbers: bool) -> Tuple[bool, bool]:
+        """Which of the requested text parses have not been run yet."""
+        return temporal and self._temporal is _UNSET, numbers and self._numbers is _UNSET
+
+    def first(self, entity_type: str) -> Optional[Any]:
+        """Value of the first entity of this type, or None."""
+        entities = self.by_type.get(entity_type)
+        return entities[0]["value"] if entities else None
+
+    def last(self, entity_type: str) -> Optional[Any]:
+        """Value of the last entity of this type, or None."""
+        entities = self.by_type.get(entity_type)
+        return entities[-1]["value"] if entities else None
+
+    def of_types(self, *entity_types: str) -> List[Dict[str, Any]]:
+        """Entities of any of the given types, in text order."""
+        return [entity for entity in self.entities if entity["entity"] in entity_types]
+
+
+def build_message_analysis(latest_message: Dict[str, Any]) -> MessageAnalysis:
+    """Group the entities of a latest_message dict by type."""
+    entities = latest_message.get("entities") or []
+    if any(entities[i].get("start", 0) > entities[i + 1].get("start", 0) for i in range(len(entities) - 1)):
+        entities = sorted(entities, key=lambda entity: entity.get("start", 0))
+    return MessageAnalysis(
+        text=latest_message.get("text") or "",
+        intent=(latest_message.get("intent") or {}).get("name"),
+        entities=entities,
+    )
+
+
+def parse_message_texts(jobs: List[Tuple[str, date, bool, bool]]) -> List[Dict[str, Any]]:
+    """Run the text parsers for many messages in one call.
+
+    jobs are (text, today, want_temporal, want_quantity); each result holds
+    the requested "temporal" and "numbers" values for MessageAnalysis.preset.
+    """
+    scan = get_numeric_scanner().scan
+    results = []
+    for text, today, want_temporal, want_quantity in jobs:
+        parsed: Dict[str, Any] = {}
+        if want_temporal:
+            parsed["temporal"] = parse_temporal(text, today)
+        if want_quantity:
+            parsed["numbers"] = scan(text)
+        results.append(parsed)
+    return results
+
+
+async def run_text_parses(analysis: MessageAnalysis, temporal: bool = False, numbers: bool = False) -> None:
+    """Run the text parses the analysis still lacks through run_blocking."""
+    temporal, numbers = analysis.missing(temporal, numbers)
+    if temporal or numbers:
+        [parsed] = await run_blocking(parse_message_texts, [(analysis.text, analysis.today, temporal, numbers)])
+        analysis.preset(**parsed)
+
+
+# (latest_message, 미리 만든 분석) — 같은 dict 객체일 때만 씀
+PRIMED_ANALYSIS: ContextVar[Optional[Tuple[Dict[str, Any], MessageAnalysis]]] = ContextVar(
+    "primed_message_analysis", default=None
+)
+
+
+async def get_message_analysis(tracker: Any) -> MessageAnalysis:
+    """Return the analysis of tracker.latest_message, built once per turn."""
+    message = tracker.latest_message
+    cached = getattr(tracker, "_message_analysis", None)
+    if cached is None or cached[0] is not message:
+        primed = PRIMED_ANALYSIS.get()
+        if primed is not None and primed[0] is message:
+            cached = primed
+        else:
+            cached = (message, build_message_analysis(message))
+        tracker._message_analysis = cached
+    return cached[1]
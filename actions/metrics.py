@@ -0,0 +1,295 @@
+# 액션 서버 지표 수집
+#
+# 액션/검증 메서드의 지연 시간 히스토그램, 호출 수, 슬롯 거절 수, 파서
+# 실패율을 모으고 Prometheus 텍스트 형식으로 내보냅니다.
+#
+#   ACTIONS_METRICS_PORT  설정하면 이 포트에서 /metrics 엔드포인트를 엽니다.
+#
+# 파서 호출 수는 지표를 내보내는 프로세스에서만 셉니다. 포트가 없으면
+# track_parser는 함수를 감싸지 않고 그대로 돌려줍니다. 감쌀지는 데코레이터가
+# 적용될 때 정해지므로, count_parser_calls()는 actions.actions를 import 하기
+# 전에 불러야 합니다.
+#
+# process 실행기(ACTIONS_EXECUTOR=process)에서 돌아가는 파서 호출은 워커
+# 프로세스에서 집계되므로 여기에 나타나지 않습니다.
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .profiling import get_profiler
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 히스토그램 구간
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    inner = ",".join('{}="{}"'.format(key, str(value).replace('"', '\\"')) for key, value in pairs)
+    return "{" + inner + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_format_labels(labels)} {value:g}" for labels, value in items)
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        # labels → [구간별 개수..., +Inf 개수, 합계]
+        self._values: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._values.items())
+        for labels, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative:g}")
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {cumulative:g}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-1]:g}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative:g}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        metric = Counter(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str) -> Histogram:
+        metric = Histogram(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Register a callback that returns extra exposition lines at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception:
+                logger.exception("Metrics collector failed")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# track_parser가 파서를 감쌀지 (데코레이터가 적용될 때 한 번 봄)
+_count_parsers = bool(os.environ.get("ACTIONS_METRICS_PORT"))
+
+
+def count_parser_calls(enabled: bool = True) -> None:
+    """Make track_parser count the parsers it decorates from now on.
+
+    Parsers decorated earlier keep their behaviour, so call this before
+    importing actions.actions or any other module that decorates parsers.
+    """
+    global _count_parsers
+    _count_parsers = enabled
+
+
+ACTION_LATENCY = REGISTRY.histogram("actions_action_latency_seconds", "Latency of action runs.")
+ACTION_CALLS = REGISTRY.counter("actions_action_calls_total", "Action runs.")
+ACTION_ERRORS = REGISTRY.counter("actions_action_errors_total", "Action runs that raised.")
+VALIDATOR_LATENCY = REGISTRY.histogram("actions_validator_latency_seconds", "Latency of validate_* methods.")
+VALIDATOR_CALLS = REGISTRY.counter("actions_validator_calls_total", "validate_* calls.")
+SLOT_REJECTIONS = REGISTRY.counter("actions_slot_rejections_total", "Slot values rejected by a validator.")
+PARSER_CALLS = REGISTRY.counter("actions_parser_calls_total", "Korean parser calls.")
+PARSER_FAILURES = REGISTRY.counter("actions_parser_failures_total", "Korean parser calls that could not parse their input.")
+
+
+OnDone = Callable[[Any, float, Any, Optional[BaseException]], None]
+
+
+def _wrap_timed(func: Callable, on_done: OnDone) -> Callable:
+    """Wrap a (possibly async) method; on_done(self, elapsed, result, error)."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = await func(self, *args, **kwargs)
+            except BaseException as exc:
+                on_done(self, time.perf_counter() - start, None, exc)
+                raise
+            on_done(self, time.perf_counter() - start, result, None)
+            return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException as exc:
+            on_done(self, time.perf_counter() - start, None, exc)
+            raise
+        on_done(self, time.perf_counter() - start, result, None)
+        return result
+    return wrapper
+
+
+def instrument_action(cls: type) -> type:
+    """Class decorator that times run() and every validate_<slot>() method.
+
+    Only methods defined on the decorated class itself are wrapped as
+    validators; run() is wrapped even when it is inherited.
+
+    A validator call counts as a rejection when it returns None for its
+    own slot. Slow runs are reported to the slow-turn profiler when it is on.
+    """
+    def record_run(action: Any, elapsed: float, result: Any, error: Optional[BaseException]) -> None:
+        action_name = action.name()
+        ACTION_LATENCY.observe(elapsed, action=action_name)
+        ACTION_CALLS.inc(action=action_name)
+        if error is not None:
+            ACTION_ERRORS.inc(action=action_name)
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.observe(action_name, elapsed)
+
+    # 상속받은 run()도 감쌈 (FormValidationAction 등)
+    cls.run = _wrap_timed(cls.run, record_run)
+
+    for attribute, method in list(cls.__dict__.items()):
+        if not attribute.startswith("validate_") or not callable(method):
+            continue
+        slot = attribute[len("validate_"):]
+
+        def record_validation(action: Any, elapsed: float, result: Any, error: Optional[BaseException],
+                              validator: str = attribute, slot: str = slot) -> None:
+            VALIDATOR_LATENCY.observe(elapsed, validator=validator)
+            VALIDATOR_CALLS.inc(validator=validator)
+            if error is None and isinstance(result, dict) and result.get(slot) is None:
+                SLOT_REJECTIONS.inc(slot=slot)
+        setattr(cls, attribute, _wrap_timed(method, record_validation))
+
+    return cls
+
+
+def track_parser(name: str, failed: Callable[[Any, Any], bool]) -> Callable[[Callable], Callable]:
+    """Count calls and failures of a parser; failed(result, text) decides failure.
+
+    Returns the parser unchanged when parser counting is off.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not _count_parsers:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(text: Any, *args: Any, **kwargs: Any) -> Any:
+            result = func(text, *args, **kwargs)
+            PARSER_CALLS.inc(parser=name)
+            if failed(result, text):
+                PARSER_FAILURES.inc(parser=name)
+            return result
+        return wrapper
+    return decorator
+
+
+def _metrics_handler() -> type:
+    # http.server는 지표 포트를 설정했을 때만 import
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return MetricsHandler
+
+
+_server: Optional[Any] = None
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[Any]:
+    """Serve /metrics on a background thread; port defaults to ACTIONS_METRICS_PORT.
+
+    Does nothing when no port is configured or the server already runs.
+    """
+    global _server
+    if _server is not None:
+        return _server
+    if port is None:
+        configured = os.environ.get("ACTIONS_METRICS_PORT")
+        if not configured:
+            return None
+        port = int(configured)
+    from http.server import ThreadingHTTPServer
+
+    try:
+        _server = ThreadingHTTPServer((host, port), _metrics_handler())
+    except OSError as exc:
+        logger.warning("Could not start metrics endpoint on port %s: %s", port, exc)
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="actions-metrics", daemon=True).start()
+    logger.info("Metrics endpoint is up on http://%s:%s/metrics", host, port)
+    return _server
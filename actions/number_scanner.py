@@ -0,0 +1,98 @@
+# 수량 후보 스캐너
+#
+# NLU가 수량 엔티티를 놓친 턴에는 문장에서 직접 찾습니다. 수량(과 단위)을
+# 이름 붙은 그룹으로 묶은 정규식 하나를 미리 컴파일해 두고, 문장을 한 번 훑어
+# 위치와 함께 모든 후보를 뽑습니다. 시각과 날짜는 temporal.py가 읽습니다.
+#
+# 수사와 글자가 같은 다른 말은 문맥 규칙으로 거릅니다.
+#   - 앞에 한글이 붙어 있으면 단어의 일부 ("주세요"의 "세", "스테이크"의 "이")
+#   - 단위 없이 쓴 "네"는 대답 ("네 그걸로 주세요")
+#   - 단위 없이 쓴 한 글자 한자어는 다른 말 ("이 메뉴로", "오 좋아요")
+#   - "한 번", "여섯 시", "두 시간", "삼십 분"처럼 횟수·시각·기간을 꾸미는 수는
+#     수량이 아님. 고유어 수 뒤의 "분"은 사람 수 ("두 분")
+#   - 고유어 수 뒤의 "만"은 조사 ("열만 주세요"는 10)
+
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .catalogue import CatalogueCache
+from .numerals import NATIVE_ONES, NATIVE_TENS, SINO_CHARS, parse_korean_number
+from .patterns import BARE_REJECTED, MENU_COUNTERS, MINUTES, NOT_COUNTED, catalogue_vocabulary, factor_alternation
+
+QUANTITY = "quantity"
+UNIT = "unit"
+
+
+class Candidate(NamedTuple):
+    """A number-like span found in an utterance."""
+
+    kind: str
+    text: str
+    value: Any
+    start: int
+    end: int
+
+
+def _native() -> str:
+    tens = factor_alternation(NATIVE_TENS)
+    ones = factor_alternation(NATIVE_ONES)
+    return rf"(?:{tens}{ones}?|{ones})"
+
+
+class NumericScanner:
+    """Find quantity and unit candidates in one regex pass."""
+
+    def __init__(self, units: Iterable[str]) -> None:
+        native = _native()
+        sino = f"[{SINO_CHARS}]+"
+        unit = factor_alternation(set(units) | set(MENU_COUNTERS))
+        # 수가 시작할 수 없는 자리는 대안을 하나씩 시도하지 않고 바로 넘김
+        starts = "".join(sorted({word[0] for word in NATIVE_ONES + NATIVE_TENS} | set(SINO_CHARS)))
+        not_counted = "|".join(NOT_COUNTED)
+        self.source = (
+            # 두 개, 3인분, 하나만요, 스물하나, 두 분 (삼십 분, 10분은 기간)
+            rf"(?=[\d{starts}])(?<![가-힣])(?!(?:\d+|{sino})\s*{MINUTES})(?P<quantity>\d+|{native}|{sino})"
+            rf"(?:\s?(?P<unit>{unit})"
+            rf"|(?!\s*(?:{not_counted}))(?=(?:만|씩)?(?:이?요)?(?:\s|$|[.,!?~])))"
+        )
+        self.regex = re.compile(self.source)
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> "NumericScanner":
+        return cls(catalogue_vocabulary(catalogue)["side_unit"])
+
+    def scan(self, text: str) -> List[Candidate]:
+        """Every candidate in text, in order."""
+        candidates = []
+        for match in self.regex.finditer(text):
+            self._quantity(match, candidates)
+        return candidates
+
+    @staticmethod
+    def _quantity(match: "re.Match", candidates: List[Candidate]) -> None:
+        text = match.group("quantity")
+        unit = match.group("unit")
+        if unit is None and text in BARE_REJECTED:
+            return
+        value = parse_korean_number(text)
+        if value is None:
+            return
+        candidates.append(Candidate(QUANTITY, text, value, *match.span("quantity")))
+        if unit is not None:
+            candidates.append(Candidate(UNIT, unit, unit, *match.span("unit")))
+
+
+def first_candidate(candidates: List[Candidate], kind: str) -> Optional[Candidate]:
+    """The first candidate of this kind, or None."""
+    for candidate in candidates:
+        if candidate.kind == kind:
+            return candidate
+    return None
+
+
+_SCANNER = CatalogueCache(NumericScanner.from_catalogue)
+
+
+def get_numeric_scanner() -> NumericScanner:
+    """Return the scanner, rebuilt if catalogue.yml changed."""
+    return _SCANNER.get()
@@ -0,0 +1,181 @@
+# 한국어 수사(數詞) 파서
+#
+# 고유어(하나, 스물, 서른...)와 한자어(일, 십, 백, 천, 만...) 수사를 모두
+# 처리합니다. 어휘 트라이는 import 시점에 한 번만 만들어지고, 파싱은
+# 입력을 한 번 훑으면서 가장 긴 접두어를 매칭합니다.
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 토큰 종류
+_ZERO = 0
+_DIGIT = 1      # 한자어 한 자리 수: 일, 이, 삼 ...
+_UNIT = 2       # 한자어 자릿수: 십, 백, 천
+_MYRIAD = 3     # 만
+_NATIVE = 4     # 고유어 한 자리 수: 하나, 한, 둘, 두 ...
+_NATIVE_TENS = 5  # 고유어 십 단위: 열, 스물, 서른 ...
+
+_LEXICON: Tuple[Tuple[str, int, int], ...] = (
+    ('영', _ZERO, 0), ('공', _ZERO, 0),
+    ('일', _DIGIT, 1), ('이', _DIGIT, 2), ('삼', _DIGIT, 3),
+    ('사', _DIGIT, 4), ('오', _DIGIT, 5), ('육', _DIGIT, 6),
+    ('륙', _DIGIT, 6), ('칠', _DIGIT, 7), ('팔', _DIGIT, 8),
+    ('구', _DIGIT, 9),
+    ('십', _UNIT, 10), ('백', _UNIT, 100), ('천', _UNIT, 1000),
+    ('만', _MYRIAD, 10000),
+    ('하나', _NATIVE, 1), ('한', _NATIVE, 1),
+    ('둘', _NATIVE, 2), ('두', _NATIVE, 2),
+    ('셋', _NATIVE, 3), ('세', _NATIVE, 3), ('석', _NATIVE, 3),
+    ('넷', _NATIVE, 4), ('네', _NATIVE, 4), ('넉', _NATIVE, 4),
+    ('다섯', _NATIVE, 5), ('여섯', _NATIVE, 6), ('일곱', _NATIVE, 7),
+    ('여덟', _NATIVE, 8), ('아홉', _NATIVE, 9),
+    ('열', _NATIVE_TENS, 10), ('스물', _NATIVE_TENS, 20),
+    ('스무', _NATIVE_TENS, 20), ('서른', _NATIVE_TENS, 30),
+    ('마흔', _NATIVE_TENS, 40), ('쉰', _NATIVE_TENS, 50),
+    ('예순', _NATIVE_TENS, 60), ('일흔', _NATIVE_TENS, 70),
+    ('여든', _NATIVE_TENS, 80), ('아흔', _NATIVE_TENS, 90),
+)
+
+# 트라이 노드: {문자: 자식 노드}, 단어 끝 노드는 _TERMINAL 키에 (종류, 값)을 저장
+_TERMINAL = ''
+
+
+def _build_trie(lexicon: Iterable[Tuple[str, int, int]]) -> Dict[str, Any]:
+    root: Dict[str, Any] = {}
+    for word, kind, value in lexicon:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = (kind, value)
+    return root
+
+
+_TRIE = _build_trie(_LEXICON)
+
+# 수사에 쓰이는 모든 글자 (정규식 문자 클래스용)
+NUMERAL_CHARS = ''.join(sorted({char for word, _, _ in _LEXICON for char in word}))
+
+# 고유어 한 자리 수와 십 단위 (스물, 서른...), 한자어 수사 글자 (일, 십, 백, 만...)
+NATIVE_ONES = tuple(word for word, kind, _ in _LEXICON if kind == _NATIVE)
+NATIVE_TENS = tuple(word for word, kind, _ in _LEXICON if kind == _NATIVE_TENS)
+SINO_CHARS = ''.join(word for word, kind, _ in _LEXICON if kind in (_ZERO, _DIGIT, _UNIT, _MYRIAD))
+
+
+def numeral_words(large: bool = False) -> List[str]:
+    """Lexicon words for quantity patterns.
+
+    영/공 and, unless large is set, 백/천/만 are left out: they are far more
+    often part of other words ("빵만") than quantities people order.
+    """
+    return [
+        word for word, kind, value in _LEXICON
+        if kind != _ZERO and (large or value < 100)
+    ]
+
+
+_ASCII_DIGITS = frozenset('0123456789')
+
+
+def _match(text: str, pos: int, end: int):
+    """Return (kind, value, next_pos) for the longest lexicon word at pos."""
+    node = _TRIE
+    best = None
+    i = pos
+    while i < end:
+        node = node.get(text[i])
+        if node is None:
+            break
+        i += 1
+        terminal = node.get(_TERMINAL)
+        if terminal is not None:
+            best = (terminal[0], terminal[1], i)
+    return best
+
+
+def parse_korean_number(text: str) -> Optional[int]:
+    """Parse a Korean or Arabic numeral into an int.
+
+    Handles native forms (스물하나, 열두), Sino-Korean forms (백이십,
+    삼천오백, 이만 삼천) and mixed forms (스물3). Returns None when the
+    text is not a well-formed numeral.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+
+    end = len(text)
+    pos = 0
+    total = 0           # 만 단위 이상 누적값
+    section = 0         # 만 미만 누적값
+    pending = None      # 자릿수를 기다리는 한 자리 수
+    last_unit = 0       # 직전 자릿수 (자릿수는 내림차순이어야 함)
+    native_ones = False  # 고유어 한 자리 수 뒤에는 아무것도 올 수 없음
+    seen = False
+
+    while pos < end:
+        char = text[pos]
+        if char == ' ':
+            pos += 1
+            continue
+        if native_ones:
+            return None
+
+        if char in _ASCII_DIGITS:
+            start = pos
+            while pos < end and text[pos] in _ASCII_DIGITS:
+                pos += 1
+            if pending is not None:
+                return None
+            pending = int(text[start:pos])
+            seen = True
+            continue
+
+        matched = _match(text, pos, end)
+        if matched is None:
+            return None
+        kind, value, pos = matched
+        seen = True
+
+        if kind == _ZERO:
+            if pending is not None or section or total:
+                return None
+            pending = 0
+        elif kind == _DIGIT:
+            if pending is not None:
+                return None
+            pending = value
+        elif kind == _UNIT:
+            if last_unit and value >= last_unit:
+                return None
+            section += (pending if pending is not None else 1) * value
+            pending = None
+            last_unit = value
+        elif kind == _MYRIAD:
+            if total:
+                return None
+            multiplier = section + (pending or 0)
+            total = (multiplier or 1) * value
+            section = 0
+            pending = None
+            last_unit = 0
+        elif kind == _NATIVE_TENS:
+            if pending is not None or (last_unit and last_unit <= 10):
+                return None
+            section += value
+            last_unit = 10
+        else:  # _NATIVE
+            if pending is not None:
+                return None
+            pending = value
+            native_ones = True
+
+    if not seen:
+        return None
+    return total + section + (pending or 0)
+
+
+def parse_korean_numbers(tokens: Iterable[str]) -> List[Optional[int]]:
+    """Parse many numeral tokens at once, preserving order."""
+    parse = parse_korean_number
+    return [parse(token) for token in tokens]
@@ -0,0 +1,80 @@
+# CPU 작업 오프로딩
+#
+# 날짜/시간·수량 파싱과 사이드 메뉴 조립처럼 CPU를 쓰는 작업을 액션 서버의
+# 이벤트 루프 밖에서 실행할 수 있게 합니다. 폼 검증기와 웹훅 배치의 본문 파싱이
+# 모두 run_blocking을 거칩니다. 기본값은 inline으로, 이벤트 루프에서 바로
+# 실행합니다. 파싱은 GIL을 잡고 도는 순수 파이썬 코드라 스레드로 넘기면
+# 몇 마이크로초짜리 일에 스레드 전환만 더해지므로, 측정해서 무거운 작업이
+# 있을 때만 다른 실행기를 고릅니다.
+#
+#   ACTIONS_EXECUTOR          inline (기본값) | thread | process
+#   ACTIONS_EXECUTOR_WORKERS  워커 수 (기본값 4)
+#
+# process 실행기에 넘기는 함수와 인자는 pickle 가능해야 하므로 모듈 최상위
+# 함수만 넘깁니다.
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+EXECUTOR_KINDS = ('thread', 'process', 'inline')
+
+_lock = threading.Lock()
+_executor: Optional[Executor] = None
+_kind = os.environ.get('ACTIONS_EXECUTOR', 'inline')
+_max_workers = int(os.environ.get('ACTIONS_EXECUTOR_WORKERS', '4'))
+
+
+def configure_executor(kind: str = 'inline', max_workers: int = 4) -> None:
+    """Switch the executor used by run_blocking, shutting down the old one."""
+    global _kind, _max_workers
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"Unknown executor kind '{kind}', expected one of {EXECUTOR_KINDS}")
+    shutdown_executor()
+    with _lock:
+        _kind = kind
+        _max_workers = max_workers
+
+
+def get_executor() -> Optional[Executor]:
+    """Return the shared executor, creating it on first use.
+
+    Returns None in inline mode.
+    """
+    global _executor
+    if _kind == 'inline':
+        return None
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                if _kind == 'process':
+                    from concurrent.futures import ProcessPoolExecutor
+                    _executor = ProcessPoolExecutor(max_workers=_max_workers)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=_max_workers, thread_name_prefix='actions-cpu'
+                    )
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the shared executor; the next call recreates it."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run func(*args) on the configured executor without blocking the loop."""
+    executor = get_executor()
+    if executor is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args))
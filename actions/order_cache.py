@@ -0,0 +1,330 @@
+# 세션별 주문 캐시
+#
+# 주문 폼에서 검증을 마친 슬롯 값을 sender_id별로 기억해 둡니다. 대화가 폼을
+# 벗어났다가 돌아오거나 트래커가 새로 만들어져도 이미 검증한 슬롯은 다시
+# 묻거나 파싱하지 않고, 마지막으로 제출한 주문은 "지난번이랑 똑같이"
+# 재주문에 씁니다.
+#
+# 항목은 메모리에 LRU로 최대 ORDER_CACHE_SIZE개까지 두고 TTL이 지나면
+# 버립니다. ORDER_CACHE_PATH를 지정하면 메모리에서 밀려난 항목과 프로세스
+# 종료 시 남은 항목을 SQLite 파일에 내려 두었다가, 메모리에 없을 때 다시
+# 읽습니다. 제출한 주문은 바로 기록합니다.
+#
+# 워커가 여럿이면 (python -m actions.server) 같은 sender의 요청이 워커마다
+# 나뉘어 오므로, 워커별 메모리 캐시는 다른 워커에서 이미 제출된 주문을 이어
+# 받을 수 있습니다. 그래서 ORDER_CACHE_PATH가 있으면 모든 읽기와 쓰기가 SQLite
+# 파일을 바로 거치고, 없으면 캐시를 끕니다 (이어 받기와 재주문이 동작하지 않음).
+#
+#   ORDER_CACHE_TTL             작성 중인 주문을 기억하는 시간(초) (기본값 1800)
+#   ORDER_CACHE_LAST_ORDER_TTL  마지막 주문을 기억하는 시간(초) (기본값 2592000, 30일)
+#   ORDER_CACHE_SIZE            종류별로 메모리에 두는 최대 sender 수 (기본값 10000)
+#   ORDER_CACHE_PATH            디스크 보관 파일 경로 (기본값: 없음, 메모리만 사용)
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .order_store import ORDER_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# 폼에서 기억하는 슬롯 (order_confirmation은 매번 새로 받음)
+CACHED_SLOTS = ORDER_FIELDS + ("side_menu_choice",)
+
+PARTIAL = "partial"
+LAST_ORDER = "last_order"
+
+# (만료 시각, 슬롯 값)
+Entry = Tuple[float, Dict[str, Any]]
+
+
+class SQLiteSpill:
+    """On-disk store for cache entries evicted from memory."""
+
+    def __init__(self, path: str) -> None:
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS order_cache (
+                kind TEXT NOT NULL,
+                sender_id TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (kind, sender_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def write(self, kind: str, entries: Iterable[Tuple[str, Entry]]) -> None:
+        rows = [
+            (kind, sender_id, expires_at, json.dumps(slots, ensure_ascii=False))
+            for sender_id, (expires_at, slots) in entries
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO order_cache VALUES (?, ?, ?, ?)", rows)
+
+    def read(self, kind: str, sender_id: str, now: float) -> Optional[Entry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, payload FROM order_cache WHERE kind = ? AND sender_id = ? AND expires_at > ?",
+                (kind, sender_id, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def delete(self, kind: str, sender_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM order_cache WHERE kind = ? AND sender_id = ?", (kind, sender_id))
+
+    def purge(self, now: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM order_cache WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _Bucket:
+    """LRU map of sender_id → Entry with a TTL, spilling evictions to disk.
+
+    A shared bucket keeps nothing in memory and reads and writes the
+    spill directly, so several processes see the same entries.
+    """
+
+    def __init__(self, kind: str, ttl: float, capacity: int, spill: Optional[SQLiteSpill],
+                 shared: bool = False) -> None:
+        self.kind = kind
+        self.ttl = ttl
+        self.capacity = capacity
+        self.spill = spill
+        self.shared = shared and spill is not None
+        self.entries: "OrderedDict[str, Entry]" = OrderedDict()
+
+    def get(self, sender_id: str, now: float) -> Optional[Dict[str, Any]]:
+        if self.shared:
+            entry = self.spill.read(self.kind, sender_id, now)
+            return entry[1] if entry is not None else None
+        entry = self.entries.get(sender_id)
+        if entry is not None:
+            if entry[0] > now:
+                self.entries.move_to_end(sender_id)
+                return entry[1]
+            del self.entries[sender_id]
+            return None
+        if self.spill is not None:
+            entry = self.spill.read(self.kind, sender_id, now)
+            if entry is not None:
+                self._store(sender_id, entry)
+                return entry[1]
+        return None
+
+    def put(self, sender_id: str, slots: Dict[str, Any], now: float) -> Entry:
+        entry = (now + self.ttl, slots)
+        if self.shared:
+            self.spill.write(self.kind, [(sender_id, entry)])
+        else:
+            self._store(sender_id, entry)
+        return entry
+
+    def pop(self, sender_id: str) -> None:
+        self.entries.pop(sender_id, None)
+        if self.spill is not None:
+            self.spill.delete(self.kind, sender_id)
+
+    def _store(self, sender_id: str, entry: Entry) -> None:
+        self.entries[sender_id] = entry
+        self.entries.move_to_end(sender_id)
+        if len(self.entries) > self.capacity:
+            evicted = self.entries.popitem(last=False)
+            if self.spill is not None:
+                self.spill.write(self.kind, [evicted])
+
+    def flush(self, now: float) -> None:
+        if self.spill is not None:
+            self.spill.write(self.kind, [(key, entry) for key, entry in self.entries.items() if entry[0] > now])
+
+
+class PartialOrderCache:
+    """Validated order slots per sender_id, plus each sender's last order.
+
+    Partial entries are merged turn by turn while the order form runs and
+    dropped when the order is submitted; the submitted order then becomes
+    the sender's last order.
+
+    With shared=True every call reads and writes the spill file, so caches
+    in several worker processes on the same file agree.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1800.0,
+        last_order_ttl: float = 30 * 86400.0,
+        capacity: int = 10000,
+        spill: Optional[SQLiteSpill] = None,
+        now: Callable[[], float] = time.time,
+        shared: bool = False,
+    ) -> None:
+        self.spill = spill
+        self._now = now
+        self._lock = threading.Lock()
+        self._partial = _Bucket(PARTIAL, ttl, capacity, spill, shared)
+        self._last = _Bucket(LAST_ORDER, last_order_ttl, capacity, spill, shared)
+        if spill is not None:
+            spill.purge(now())
+
+    def partial(self, sender_id: str) -> Dict[str, Any]:
+        """Slots already validated for this sender's order in progress."""
+        with self._lock:
+            return dict(self._partial.get(sender_id, self._now()) or {})
+
+    def remember(self, sender_id: str, slots: Dict[str, Any]) -> None:
+        """Merge validated slots; a None value forgets that slot."""
+        slots = {name: value for name, value in slots.items() if name in CACHED_SLOTS}
+        if not slots:
+            return
+        with self._lock:
+            now = self._now()
+            current = dict(self._partial.get(sender_id, now) or {})
+            for name, value in slots.items():
+                if value is None:
+                    current.pop(name, None)
+                else:
+                    current[name] = value
+            if current:
+                self._partial.put(sender_id, current, now)
+            else:
+                self._partial.pop(sender_id)
+
+    def complete(self, sender_id: str, order_data: Dict[str, Any]) -> None:
+        """Forget the order in progress and keep order_data as the last order."""
+        last = {name: order_data.get(name) for name in ORDER_FIELDS}
+        with self._lock:
+            now = self._now()
+            self._partial.pop(sender_id)
+            entry = self._last.put(sender_id, last, now)
+            if self.spill is not None and not self._last.shared:
+                # 재주문에 쓰므로 메모리에서 밀려나기를 기다리지 않고 바로 기록
+                self.spill.write(LAST_ORDER, [(sender_id, entry)])
+
+    def last_order(self, sender_id: str) -> Optional[Dict[str, Any]]:
+        """The sender's last submitted order, or None."""
+        with self._lock:
+            last = self._last.get(sender_id, self._now())
+        return dict(last) if last else None
+
+    def forget(self, sender_id: str) -> None:
+        with self._lock:
+            self._partial.pop(sender_id)
+            self._last.pop(sender_id)
+
+    def __len__(self) -> int:
+        return len(self._partial.entries) + len(self._last.entries)
+
+    def close(self) -> None:
+        """Write what is still in memory to the spill file."""
+        if self.spill is None:
+            return
+        with self._lock:
+            now = self._now()
+            try:
+                self._partial.flush(now)
+                self._last.flush(now)
+            except Exception:
+                logger.exception("Failed to write the order cache to disk")
+            self.spill.close()
+            self.spill = self._partial.spill = self._last.spill = None
+
+
+def split_cached(slots: Dict[str, Any], cached: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Split slots into those still to validate and names already validated.
+
+    A slot counts as validated when its value equals the cached value.
+    """
+    pending = {}
+    validated = []
+    for name, value in slots.items():
+        if value is not None and name in cached and cached[name] == value:
+            validated.append(name)
+        else:
+            pending[name] = value
+    return pending, validated
+
+
+class DisabledOrderCache(PartialOrderCache):
+    """Order cache that remembers nothing, for workers that cannot share one."""
+
+    def partial(self, sender_id: str) -> Dict[str, Any]:
+        return {}
+
+    def remember(self, sender_id: str, slots: Dict[str, Any]) -> None:
+        pass
+
+    def complete(self, sender_id: str, order_data: Dict[str, Any]) -> None:
+        pass
+
+    def last_order(self, sender_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+
+_cache: Optional[PartialOrderCache] = None
+_cache_lock = threading.Lock()
+# 같은 요청을 나눠 받는 워커 프로세스 수 (actions.server가 정함)
+_workers = 1
+
+
+def set_worker_count(workers: int) -> None:
+    """Tell get_order_cache how many worker processes share the senders."""
+    global _workers
+    _workers = workers
+
+
+def get_order_cache() -> PartialOrderCache:
+    """Return the process-wide order cache, creating it on first use.
+
+    With several workers the cache is shared through ORDER_CACHE_PATH,
+    or turned off when that is unset.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                path = os.environ.get("ORDER_CACHE_PATH")
+                if _workers > 1 and not path:
+                    logger.warning(
+                        "Order cache is off: %d workers need ORDER_CACHE_PATH to share unfinished orders", _workers
+                    )
+                    _cache = DisabledOrderCache()
+                else:
+                    _cache = PartialOrderCache(
+                        ttl=float(os.environ.get("ORDER_CACHE_TTL", "1800")),
+                        last_order_ttl=float(os.environ.get("ORDER_CACHE_LAST_ORDER_TTL", str(30 * 86400))),
+                        capacity=int(os.environ.get("ORDER_CACHE_SIZE", "10000")),
+                        spill=SQLiteSpill(path) if path else None,
+                        shared=_workers > 1,
+                    )
+                    atexit.register(_cache.close)
+    return _cache
+
+
+def close_order_cache() -> None:
+    """Write the process-wide cache to its spill file, if this process created one."""
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
@@ -0,0 +1,333 @@
+# 주문 저장소
+#
+# 제출된 주문을 메모리 큐에 넣고, 백그라운드 스레드가 일정 개수가 쌓이거나
+# 일정 시간이 지나면 한 번의 트랜잭션으로 묶어서 저장합니다. 프로세스가
+# 종료될 때 남은 주문을 모두 기록합니다.
+#
+#   ORDER_STORE_BACKEND         sqlite (기본값) | jsonl
+#   ORDER_STORE_PATH            저장 파일 경로 (기본값 orders.db / orders.jsonl)
+#   ORDER_STORE_BATCH_SIZE      한 번에 기록할 최대 주문 수 (기본값 50)
+#   ORDER_STORE_FLUSH_INTERVAL  기록 주기(초) (기본값 1.0)
+#
+# 같은 주문을 다시 제출해도 한 번만 저장합니다. 최근 주문 키는 프로세스마다
+# 메모리에 두므로, 워커가 여럿이면 재시도가 다른 워커로 가서 같은 주문이 다시
+# 기록될 수 있습니다. SQLite는 order_id가 기본 키라 무시되고, JSONL은 두 줄이
+# 남지만 읽을 때 order_id로 중복을 거릅니다.
+#
+# 주문 레코드는 orjson이 있으면 orjson으로 인코딩합니다 (없으면 json).
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 다른 워커의 주문은 저장소에 늦게 기록될 수 있으므로, 시각으로 이어 읽을 때
+# 이만큼 이전에 만들어진 주문부터 다시 읽음
+READ_LOOKBACK = timedelta(seconds=60)
+
+ORDER_FIELDS = (
+    "menu_name",
+    "menu_quantity",
+    "serving_style",
+    "side_name",
+    "side_quantity",
+    "side_unit",
+    "delivery_date",
+    "delivery_time",
+)
+
+
+# json.dumps(sort_keys=True, ensure_ascii=False)와 같은 출력, 인코더는 한 번만 만듦
+_KEY_ENCODER = json.JSONEncoder(sort_keys=True, ensure_ascii=False)
+
+
+def order_key(sender_id: str, order_data: Dict[str, Any]) -> str:
+    """Return the idempotency key of an order: sender_id plus a slot hash."""
+    digest = hashlib.sha256(_KEY_ENCODER.encode(order_data).encode('utf-8')).hexdigest()[:16]
+    return f"{sender_id}:{digest}"
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Serialize an order record as UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record)
+        except TypeError:
+            # orjson이 못 다루는 값(문자열이 아닌 키 등)은 json으로
+            pass
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class OrderBackend:
+    """Storage backend for batches of order records."""
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def iter_orders(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield stored orders, only those created after since when given."""
+        raise NotImplementedError
+
+    def read_new(self, cursor: Any = None) -> Tuple[List[Dict[str, Any]], Any]:
+        """Return the orders stored since cursor (None: all) and the next cursor.
+
+        The default cursor is a created_at time READ_LOOKBACK in the past, so
+        the same order can come back on the next read; callers skip orders
+        they already have by order_id.
+        """
+        next_cursor = (datetime.now(timezone.utc) - READ_LOOKBACK).isoformat()
+        return list(self.iter_orders(since=cursor)), next_cursor
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteOrderBackend(OrderBackend):
+    """Store orders in a SQLite table, one transaction per batch."""
+
+    def __init__(self, path: str) -> None:
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                order_id TEXT PRIMARY KEY,
+                sender_id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                delivery_date TEXT,
+                delivery_time TEXT,
+                menu_quantity TEXT,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS orders_delivery ON orders (delivery_date, delivery_time)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS orders_created ON orders (created_at)")
+        self._conn.commit()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        rows = [
+            (
+                record["order_id"],
+                record["sender_id"],
+                record["created_at"],
+                record.get("delivery_date"),
+                record.get("delivery_time"),
+                record.get("menu_quantity"),
+                encode_record(record).decode("utf-8"),
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            # 같은 주문이 다시 들어오면 무시 (멱등성)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def iter_orders(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM orders WHERE created_at > ? ORDER BY created_at", (since or "",)
+            ).fetchall()
+        for (payload,) in rows:
+            yield json.loads(payload)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JsonlOrderBackend(OrderBackend):
+    """Append orders to a local JSON Lines file."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        lines = b"".join(encode_record(record) + b"\n" for record in records)
+        with self._lock, open(self._path, "ab") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_orders(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield stored orders; a retried order written twice is yielded once."""
+        if not os.path.exists(self._path):
+            return
+        seen = set()
+        with open(self._path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if since is not None and record.get("created_at", "") <= since:
+                        continue
+                    # 다른 워커가 같은 주문을 다시 기록했으면 처음 것만 씀
+                    order_id = record.get("order_id")
+                    if order_id in seen:
+                        continue
+                    seen.add(order_id)
+                    yield record
+
+    def read_new(self, cursor: Any = None) -> Tuple[List[Dict[str, Any]], Any]:
+        """Orders appended after byte offset cursor, and the offset to read from next.
+
+        Only complete lines are read; a line still being written is read next time.
+        """
+        offset = cursor or 0
+        if not os.path.exists(self._path):
+            return [], offset
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return records, offset + end
+
+
+BACKENDS = {
+    "sqlite": (SQLiteOrderBackend, "orders.db"),
+    "jsonl": (JsonlOrderBackend, "orders.jsonl"),
+}
+
+
+class OrderSink:
+    """Write-behind queue in front of an OrderBackend.
+
+    submit() only appends to an in-memory queue. A background thread
+    writes the queue to the backend when batch_size orders are waiting or
+    flush_interval seconds have passed, and close() drains what is left.
+    """
+
+    def __init__(
+        self,
+        backend: OrderBackend,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        seen_capacity: int = 10000,
+    ) -> None:
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._seen_capacity = seen_capacity
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="order-sink", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self, sender_id: str, order_data: Dict[str, Any], extra: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, bool]:
+        """Queue an order and return (order_id, is_new).
+
+        Submitting the same slots for the same sender again returns the
+        existing order_id with is_new=False and queues nothing. extra
+        (e.g. pricing) is stored with the order but not part of its key.
+        """
+        order_id = order_key(sender_id, order_data)
+        with self._condition:
+            if order_id in self._seen:
+                self._seen.move_to_end(order_id)
+                return order_id, False
+            self._seen[order_id] = None
+            if len(self._seen) > self._seen_capacity:
+                self._seen.popitem(last=False)
+
+            self._queue.append({
+                "order_id": order_id,
+                "sender_id": sender_id,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                **order_data,
+                **(extra or {}),
+            })
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+        return order_id, True
+
+    def flush(self) -> None:
+        """Write every queued order now."""
+        with self._condition:
+            batch, self._queue = self._queue, []
+        if batch:
+            try:
+                self.backend.write_batch(batch)
+            except Exception:
+                logger.exception("Failed to write %d orders, re-queueing", len(batch))
+                with self._condition:
+                    self._queue[:0] = batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._closed and len(self._queue) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self) -> None:
+        """Stop the background thread after draining the queue."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.backend.close()
+
+
+_sink: Optional[OrderSink] = None
+_sink_lock = threading.Lock()
+
+
+def create_backend(kind: Optional[str] = None, path: Optional[str] = None) -> OrderBackend:
+    """Create the backend selected by ORDER_STORE_BACKEND/ORDER_STORE_PATH."""
+    kind = kind or os.environ.get("ORDER_STORE_BACKEND", "sqlite")
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown order store backend '{kind}', expected one of {tuple(BACKENDS)}")
+    backend_class, default_path = BACKENDS[kind]
+    return backend_class(path or os.environ.get("ORDER_STORE_PATH", default_path))
+
+
+def get_order_sink() -> OrderSink:
+    """Return the process-wide order sink, creating it on first use."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = OrderSink(
+                    create_backend(),
+                    batch_size=int(os.environ.get("ORDER_STORE_BATCH_SIZE", "50")),
+                    flush_interval=float(os.environ.get("ORDER_STORE_FLUSH_INTERVAL", "1.0")),
+                )
+                atexit.register(_sink.close)
+    return _sink
+
+
+def close_order_sink() -> None:
+    """Drain and close the process-wide sink, if this process created one."""
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
@@ -0,0 +1,244 @@
+# 카탈로그 기반 정규식
+#
+# 메뉴 이름, 서빙 스타일, 사이드 메뉴, 단위, 상황 키워드, 수사를 catalogue.yml과
+# numerals.py에서 모아 접두어를 묶은 정규식 하나로 만듭니다.
+#
+#   ["발렌타인 디너", "발렌타인", "잉글리시", "잉글리쉬"]
+#     → (?:발렌타인(?: ?디너)?|잉글리[쉬시])
+#
+# 같은 정규식을 scripts/compile_catalogue.py가 data/nlu_catalogue.yml의 regex
+# 항목으로 쓰고, 액션 서버는 NLU가 엔티티를 놓쳤을 때 문장에서 직접 찾는
+# 데 씁니다. 이름 안의 공백은 있어도 없어도 매칭됩니다.
+#
+# NLU의 수량 정규식은 문맥 없이 문장 전체에 적용되므로, 다른 말의 일부인 수사를
+# 정규식 안에서 거릅니다 (number_scanner.py와 같은 규칙).
+#   - 앞에 한글이 붙어 있으면 단어의 일부 ("스테이크"의 "이"). 메뉴·사이드 이름의
+#     끝 글자 바로 뒤는 예외 ("빵두개"). 이름마다 뒤보기를 두지 않고 끝 글자를
+#     문자 클래스 하나로 모아, 카탈로그가 커져도 정규식 길이가 거의 늘지 않음
+#   - 뒤에 단위나 공백, 문장 끝이 와야 함 ("세요"의 "세")
+#   - 단위 없이 쓴 "네"와 한 글자 한자어는 다른 말 ("네 그걸로", "이 메뉴로")
+#   - "한 번", "여섯 시", "삼십 분"처럼 횟수·시각·기간을 꾸미는 수는 수량이 아님.
+#     고유어 수 뒤의 "분"은 사람 수 ("두 분")
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .catalogue import CatalogueCache
+from .numerals import NUMERAL_CHARS, SINO_CHARS, numeral_words
+
+_END = ''
+
+# (NLU regex 이름, 어휘) — 수량은 아래에서 따로 만듦
+Vocabulary = Dict[str, List[str]]
+
+# 사이드 메뉴 단위 외에 메인 메뉴 수량에 붙는 단위 ("두 분"은 사람 수)
+MENU_COUNTERS = ("개", "인분", "세트", "명", "분")
+
+# 이 말 앞의 수는 횟수·시각이라 수량이 아님 ("한 번", "여섯 시")
+NOT_COUNTED = ("번", "시")
+
+# 아라비아 숫자나 한자어 수 뒤의 "분"은 기간 ("삼십 분", "10분"). 고유어 수 뒤는
+# 사람 수라 MENU_COUNTERS의 단위로 읽음 ("두 분")
+MINUTES = "분"
+
+# 단위 없이는 수량으로 보지 않는 형태
+BARE_REJECTED = frozenset({"네"} | set(SINO_CHARS) - {"십", "백"})
+
+
+def _literal(char: str) -> str:
+    return ' ?' if char == ' ' else re.escape(char)
+
+
+def _trie(words: Iterable[str]) -> Dict[str, Any]:
+    root: Dict[str, Any] = {}
+    for word in words:
+        if not word:
+            continue
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = True
+    return root
+
+
+def _node_pattern(node: Dict[str, Any]) -> Optional[str]:
+    """Pattern for everything below node; None when node only ends a word."""
+    branches = []
+    chars = []
+    for char in sorted(key for key in node if key != _END):
+        rest = _node_pattern(node[char])
+        if rest is None and char != ' ':
+            chars.append(re.escape(char))
+        else:
+            branches.append(_literal(char) + (rest or ''))
+    if chars:
+        branches.append(chars[0] if len(chars) == 1 else '[' + ''.join(chars) + ']')
+    if not branches:
+        return None
+
+    optional = _END in node
+    if len(branches) == 1:
+        branch = branches[0]
+        if not optional:
+            return branch
+        # 한 글자나 문자 클래스면 괄호 없이 ? 만 붙임
+        if len(branch) == 1 or (branch.startswith('[') and branch.endswith(']') and branch.count('[') == 1):
+            return branch + '?'
+        return f'(?:{branch})?'
+    return f"(?:{'|'.join(branches)}){'?' if optional else ''}"
+
+
+def factor_alternation(words: Iterable[str]) -> str:
+    """Prefix-factored regex matching any of words, longest form first."""
+    pattern = _node_pattern(_trie(words))
+    return pattern or '(?!)'
+
+
+def flat_alternation(words: Iterable[str]) -> str:
+    """Plain a|b|c alternation of words, longest first (for comparison)."""
+    unique = sorted(set(word for word in words if word), key=lambda word: (-len(word), word))
+    return '(?:' + '|'.join(''.join(_literal(char) for char in word) for word in unique) + ')'
+
+
+def _forms(entries: Dict[str, Any]) -> List[str]:
+    forms = []
+    for entry in entries.values():
+        forms.append(entry['name'])
+        forms.extend(entry.get('aliases') or [])
+    return forms
+
+
+def catalogue_vocabulary(catalogue: Dict[str, Any]) -> Vocabulary:
+    """Words per NLU entity, taken from catalogue.yml."""
+    sides = catalogue.get('sides', {})
+    units = {sides.get('default_unit', '개')}
+    units.update((sides.get('default_units') or {}).values())
+    for prices in (sides.get('prices') or {}).values():
+        units.update(prices)
+    keywords = []
+    for rule in (catalogue.get('recommendations') or {}).get('rules', []):
+        keywords.extend(keyword for keyword in rule['keywords'] if keyword not in keywords)
+    return {
+        'menu_name': _forms(catalogue.get('menus', {})),
+        'serving_style': _forms(catalogue.get('serving_styles', {})),
+        'side_name': list(sides.get('names') or []),
+        'side_unit': sorted(units),
+        'occasion': keywords,
+    }
+
+
+def catalogue_synonyms(catalogue: Dict[str, Any]) -> List[Tuple[str, List[str]]]:
+    """(canonical name, other spellings) for menus and serving styles."""
+    synonyms = []
+    for section in ('menus', 'serving_styles'):
+        for entry in (catalogue.get(section) or {}).values():
+            aliases = list(entry.get('aliases') or [])
+            spaceless = entry['name'].replace(' ', '')
+            if spaceless != entry['name']:
+                aliases.append(spaceless)
+            if aliases:
+                synonyms.append((entry['name'], aliases))
+    return synonyms
+
+
+def quantity_pattern() -> str:
+    """Arabic digits or a run of Korean numeral words (스물하나, 열두)."""
+    return rf"(?:\d+|{factor_alternation(numeral_words())}+)"
+
+
+def guarded_quantity_pattern(
+    units: Iterable[str],
+    names: Iterable[str] = (),
+    alternation: Callable[[Iterable[str]], str] = factor_alternation,
+) -> str:
+    """quantity_pattern() limited to numbers that stand on their own.
+
+    The number must not follow Hangul (except the last syllable of one of
+    names), must be followed by one of units, a space or the end of the
+    sentence, and a bare 네 or single Sino-Korean numeral needs a unit.
+    Digits and Sino-Korean numerals before 분 are minutes, not quantities.
+    """
+    unit = alternation(units)
+    bare = ''.join(sorted(BARE_REJECTED))
+    minutes = rf'(?!(?:\d+|[{SINO_CHARS}]+)\s*{MINUTES})'
+    finals = ''.join(sorted({name[-1] for name in names if name and '가' <= name[-1] <= '힣'}))
+    after_name = f'|(?<=[{finals}])' if finals else ''
+    return (
+        rf'(?:(?<![가-힣]){after_name}){minutes}'
+        rf'(?:\d+|(?![{bare}](?![{NUMERAL_CHARS}])(?!\s?{unit})){alternation(numeral_words())}+)'
+        rf'(?=\s?{unit}|(?!\s*(?:{"|".join(NOT_COUNTED)}))(?:만|씩)?(?:이?요)?(?:\s|$|[.,!?~]))'
+    )
+
+
+def catalogue_quantity_pattern(
+    vocabulary: Vocabulary, alternation: Callable[[Iterable[str]], str] = factor_alternation
+) -> str:
+    """The menu_quantity / side_quantity NLU regex for a catalogue vocabulary."""
+    return guarded_quantity_pattern(
+        set(vocabulary['side_unit']) | set(MENU_COUNTERS),
+        vocabulary['menu_name'] + vocabulary['side_name'],
+        alternation,
+    )
+
+
+class CataloguePatterns:
+    """Compiled catalogue regexes, shared with the generated NLU data."""
+
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        self.vocabulary = vocabulary
+        self.sources: Dict[str, str] = {name: factor_alternation(words) for name, words in vocabulary.items()}
+        self.sources['menu_quantity'] = self.sources['side_quantity'] = catalogue_quantity_pattern(vocabulary)
+        self.regexes = {name: re.compile(source, re.IGNORECASE) for name, source in self.sources.items()}
+
+        # 수량 뒤에는 단위나 공백, 문장 끝이 와야 하고, 앞에 한글이 붙어 있으면 안 됨
+        # ("스테이크"의 "이", "주세요"의 "세"). 사이드 이름 바로 뒤는 예외 ("빵두개")
+        quantity_unit = r'(?P<quantity>{quantity}) ?(?:(?P<unit>{unit})|(?=\s|$|[.,!?]))'.format(
+            quantity=quantity_pattern(), unit=self.sources['side_unit']
+        )
+        self._quantity_unit = re.compile(r'(?<![가-힣])' + quantity_unit)
+        self._quantity_after_name = re.compile(quantity_unit)
+        # 띄어쓰기 없이 쓴 이름("에그스크램블")을 카탈로그 이름으로
+        self._side_names = {name.replace(' ', '').lower(): name for name in vocabulary['side_name']}
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> 'CataloguePatterns':
+        return cls(catalogue_vocabulary(catalogue))
+
+    def side_entities(self, text: str) -> List[Dict[str, Any]]:
+        """side_name / side_quantity / side_unit entities found in text, in order."""
+        entities = []
+        covered = []
+        quantities = []
+        for match in self.regexes['side_name'].finditer(text):
+            name = match.group()
+            value = self._side_names.get(name.replace(' ', '').lower(), name)
+            entities.append(_entity('side_name', value, match.start(), match.end()))
+            covered.append((match.start(), match.end()))
+            quantities.append(self._quantity_after_name.match(text, match.end()))
+        quantities.extend(self._quantity_unit.finditer(text))
+
+        seen = set()
+        for match in quantities:
+            if match is None:
+                continue
+            start = match.start('quantity')
+            if start in seen or any(low <= start < high for low, high in covered):
+                continue
+            seen.add(start)
+            entities.append(_entity('side_quantity', match.group('quantity'), start, match.end('quantity')))
+            if match.group('unit'):
+                entities.append(_entity('side_unit', match.group('unit'), match.start('unit'), match.end('unit')))
+        entities.sort(key=lambda entity: entity['start'])
+        return entities
+
+
+def _entity(name: str, value: str, start: int, end: int) -> Dict[str, Any]:
+    return {'entity': name, 'value': value, 'start': start, 'end': end, 'extractor': 'CataloguePatterns'}
+
+
+_PATTERNS = CatalogueCache(CataloguePatterns.from_catalogue)
+
+
+def get_catalogue_patterns() -> CataloguePatterns:
+    """Return the catalogue regexes, rebuilt if catalogue.yml changed."""
+    return _PATTERNS.get()
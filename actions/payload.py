@@ -0,0 +1,181 @@
+# 웹훅 요청 본문 선택적 디코딩
+#
+# Rasa는 액션을 부를 때마다 트래커 전체(대화의 모든 이벤트)를 보냅니다. 대화가
+# 길어질수록 본문이 끝없이 커지지만, 액션이 읽는 것은 latest_message, 슬롯,
+# active_loop와 마지막 사용자 메시지 이후의 이벤트(폼이 붙인 슬롯 후보)뿐입니다.
+#
+# 그래서 JSON을 파싱하기 전에 원본 바이트에서 events 배열의 시작과 마지막
+# "user" 이벤트의 위치를 찾아, 그 사이의 이벤트를 잘라낸 바이트만 파싱합니다.
+# JSON 문자열 안의 따옴표는 항상 이스케이프되므로 {"event": "user" 같은 바이트
+# 열은 문자열 안에 나올 수 없습니다. 잘라낸 결과가 올바른 JSON이 아니거나,
+# 남은 첫 이벤트가 latest_message와 맞지 않거나, Rasa가 events 뒤에 쓰는 키
+# (active_loop, latest_action_name)가 없어졌으면 (마지막 사용자 이벤트 표시가
+# events 배열 뒤에 있었던 경우) 전체를 파싱합니다. 16KB보다 작은 본문은 잘라도
+# 얻는 것이 없어 그대로 파싱합니다.
+#
+#   ACTIONS_SLIM_PAYLOADS        0이면 자르지 않고 전체를 파싱 (기본값 1)
+#   ACTIONS_DECODE_SAMPLE_RATE   전체 파싱 시간도 재서 절약 시간을 추정하는 요청 비율 (기본값 0.01)
+
+import json
+import os
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .metrics import REGISTRY
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CODEC = "orjson" if orjson is not None else "json"
+
+_EVENTS_KEY = re.compile(rb'"events":(\s*)\[')
+# json.dumps 기본 구분자(Rasa)와 공백 없는 구분자: (사용자 이벤트 시작, 이벤트 시작)
+_SPACED_MARKERS = (b'{"event": "user"', b'{"event": ')
+_COMPACT_MARKERS = (b'{"event":"user"', b'{"event":')
+_WHITESPACE = b" \t\r\n"
+_COMMA = ord(",")
+# Rasa가 트래커에서 events 뒤에 쓰는 키 — 잘못 자르면 같이 잘려 나감
+_KEYS_AFTER_EVENTS = ("active_loop", "latest_action_name")
+
+BODY_BYTES = REGISTRY.counter("actions_webhook_body_bytes_total", "Webhook request body bytes received.")
+SKIPPED_BYTES = REGISTRY.counter("actions_webhook_skipped_bytes_total", "Body bytes of old events not decoded.")
+SKIPPED_EVENTS = REGISTRY.counter("actions_webhook_skipped_events_total", "Old tracker events not decoded.")
+DECODE_SECONDS = REGISTRY.counter("actions_webhook_decode_seconds_total", "Time spent decoding webhook bodies.")
+SLIM_FALLBACKS = REGISTRY.counter(
+    "actions_webhook_slim_fallbacks_total", "Bodies decoded in full because the trimmed body did not check out."
+)
+SAMPLED_DECODES = REGISTRY.counter("actions_webhook_sampled_decodes_total", "Bodies also decoded in full for comparison.")
+SAMPLED_FULL_SECONDS = REGISTRY.counter(
+    "actions_webhook_sampled_full_decode_seconds_total", "Full decode time of the sampled bodies."
+)
+SAMPLED_SLIM_SECONDS = REGISTRY.counter(
+    "actions_webhook_sampled_slim_decode_seconds_total", "Trimmed decode time of the sampled bodies."
+)
+DECODES = REGISTRY.counter("actions_webhook_decodes_total", "Webhook bodies decoded.")
+SLIM_DECODES = REGISTRY.counter("actions_webhook_slim_decodes_total", "Webhook bodies decoded without old events.")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def trim_events(body: bytes) -> Optional[Tuple[bytes, int, int]]:
+    """Cut the tracker events before the last user event out of a raw body.
+
+    Returns (trimmed body, bytes removed, events removed), or None when
+    there is nothing to cut.
+    """
+    events = _EVENTS_KEY.search(body)
+    if events is None:
+        return None
+    array_start = events.end()
+    # 본문 전체가 같은 구분자로 직렬화되므로 "events": 뒤의 공백으로 판단
+    user_marker, event_marker = _SPACED_MARKERS if events.group(1) else _COMPACT_MARKERS
+    last_user = body.rfind(user_marker, array_start)
+    if last_user < 0:
+        return None
+    # 앞 원소 뒤의 쉼표 바로 다음이어야 함 (배열의 첫 원소면 자를 것이 없음)
+    before = last_user - 1
+    while before >= array_start and body[before] in _WHITESPACE:
+        before -= 1
+    if before < array_start or body[before] != _COMMA:
+        return None
+    removed = last_user - array_start
+    return body[:array_start] + body[last_user:], removed, body.count(event_marker, array_start, last_user)
+
+
+def _looks_trimmed_correctly(action_call: Any) -> bool:
+    tracker = action_call.get("tracker") if isinstance(action_call, dict) else None
+    if not isinstance(tracker, dict):
+        return False
+    events = tracker.get("events")
+    if not isinstance(events, list) or not events or not isinstance(events[0], dict):
+        return False
+    if any(key not in tracker for key in _KEYS_AFTER_EVENTS):
+        return False
+    first = events[0]
+    latest_message = tracker.get("latest_message") or {}
+    return first.get("event") == "user" and first.get("text") == latest_message.get("text")
+
+
+class PayloadDecoder:
+    """Decode webhook bodies, skipping tracker events the actions never read."""
+
+    def __init__(self, slim: bool = True, sample_rate: float = 0.01, min_bytes: int = 16384) -> None:
+        self.slim = slim
+        self.sample_rate = sample_rate
+        # 짧은 대화는 잘라도 디코딩 시간이 거의 줄지 않음
+        self.min_bytes = min_bytes
+
+    def decode(self, body: bytes) -> Any:
+        started = time.perf_counter()
+        DECODES.inc()
+        BODY_BYTES.inc(len(body))
+        trimmed = trim_events(body) if self.slim and len(body) >= self.min_bytes else None
+        action_call = None
+        if trimmed is not None:
+            try:
+                action_call = json_loads(trimmed[0])
+            except ValueError:
+                action_call = None
+            if action_call is not None and not _looks_trimmed_correctly(action_call):
+                action_call = None
+            if action_call is None:
+                SLIM_FALLBACKS.inc()
+        if action_call is None:
+            action_call = json_loads(body)
+            trimmed = None
+        elapsed = time.perf_counter() - started
+        DECODE_SECONDS.inc(elapsed)
+
+        if trimmed is not None:
+            SLIM_DECODES.inc()
+            SKIPPED_BYTES.inc(trimmed[1])
+            SKIPPED_EVENTS.inc(trimmed[2])
+            if self.sample_rate > 0 and random.random() < self.sample_rate:
+                full_started = time.perf_counter()
+                json_loads(body)
+                SAMPLED_DECODES.inc()
+                SAMPLED_FULL_SECONDS.inc(time.perf_counter() - full_started)
+                SAMPLED_SLIM_SECONDS.inc(elapsed)
+        return action_call
+
+
+def decode_savings() -> Dict[str, float]:
+    """Bytes skipped and the decode time saved, estimated from the sampled bodies."""
+    sampled = SAMPLED_DECODES.value()
+    saved_per_body = (SAMPLED_FULL_SECONDS.value() - SAMPLED_SLIM_SECONDS.value()) / sampled if sampled else 0.0
+    return {
+        "decodes": DECODES.value(),
+        "slim_decodes": SLIM_DECODES.value(),
+        "body_bytes": BODY_BYTES.value(),
+        "skipped_bytes": SKIPPED_BYTES.value(),
+        "skipped_events": SKIPPED_EVENTS.value(),
+        "decode_seconds": DECODE_SECONDS.value(),
+        "estimated_saved_seconds": saved_per_body * SLIM_DECODES.value(),
+    }
+
+
+def _savings_metrics() -> List[str]:
+    return [
+        "# HELP actions_webhook_decode_saved_seconds_estimate Decode time saved by skipping old events (sampled estimate).",
+        "# TYPE actions_webhook_decode_saved_seconds_estimate gauge",
+        f"actions_webhook_decode_saved_seconds_estimate {decode_savings()['estimated_saved_seconds']}",
+    ]
+
+
+REGISTRY.add_collector(_savings_metrics)
+
+
+def decoder_from_env() -> PayloadDecoder:
+    """PayloadDecoder configured by ACTIONS_SLIM_PAYLOADS and ACTIONS_DECODE_SAMPLE_RATE."""
+    return PayloadDecoder(
+        slim=os.environ.get("ACTIONS_SLIM_PAYLOADS", "1") != "0",
+        sample_rate=float(os.environ.get("ACTIONS_DECODE_SAMPLE_RATE", "0.01")),
+    )
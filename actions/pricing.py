@@ -0,0 +1,211 @@
+# 주문 금액 계산
+#
+# catalogue.yml의 메뉴 가격, 서빙 스타일 추가 금액, 사이드 메뉴 단가로
+# (메뉴, 스타일) 가격표와 (사이드 메뉴, 단위) 가격표를 미리 만들어 두고,
+# 주문 슬롯 값을 한 번 훑어 원 단위 정수로 합계를 냅니다. 메뉴와 수량 조합은
+# 몇 가지로 반복되므로, 같은 슬롯 값의 견적은 캐시에서 돌려줍니다.
+#
+# 수량이 비어 있으면 1개로 보고, 0 이하이거나 읽을 수 없는 수량은 그 항목을
+# 합계에서 빼고 가격 확인이 필요한 항목(unpriced)으로 돌려줍니다.
+
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .catalogue import CatalogueCache
+from .numerals import parse_korean_number
+
+QUOTE_CACHE_SIZE = 1024
+
+
+class PriceLine(NamedTuple):
+    """One priced line of an order; unit_price is None when unknown, quantity when invalid."""
+
+    label: str
+    quantity: Optional[int]
+    unit_price: Optional[int]
+
+    @property
+    def amount(self) -> Optional[int]:
+        if self.unit_price is None or self.quantity is None:
+            return None
+        return self.unit_price * self.quantity
+
+
+class OrderQuote(NamedTuple):
+    lines: List[PriceLine]
+    total: int
+    # 가격을 찾지 못했거나 수량이 잘못된 항목 (합계에서 빠짐)
+    unpriced: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "currency": "KRW",
+            "total_price": self.total,
+            "lines": [
+                {"item": line.label, "quantity": line.quantity, "unit_price": line.unit_price, "amount": line.amount}
+                for line in self.lines
+            ],
+            "unpriced": list(self.unpriced),
+        }
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        # 검증을 마친 슬롯 값은 대부분 아라비아 숫자
+        if value.isascii() and value.isdigit():
+            return int(value)
+        number = parse_korean_number(value.strip())
+        if number is not None:
+            return number
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _quantity(value: Any) -> Optional[int]:
+    """Positive quantity of a slot value: 1 when missing, None when not a positive number."""
+    if value is None or value == "":
+        return 1
+    quantity = _to_int(value)
+    return quantity if quantity is not None and quantity > 0 else None
+
+
+class PriceTable:
+    """Precomputed menu×style and side×unit prices, in won."""
+
+    def __init__(
+        self,
+        menu_prices: Dict[str, int],
+        style_surcharges: Dict[str, int],
+        side_prices: Dict[Tuple[str, str], int],
+        default_units: Dict[str, str],
+        default_unit: str,
+        display_names: Dict[str, Tuple[str, str]],
+    ) -> None:
+        # (메뉴 이름, 스타일 이름) → 1개 가격
+        self.matrix: Dict[Tuple[str, str], int] = {
+            (menu, style): price + surcharge
+            for menu, price in menu_prices.items()
+            for style, surcharge in style_surcharges.items()
+        }
+        self.menu_names = tuple(menu_prices)
+        self.style_names = tuple(style_surcharges)
+        self.side_prices = side_prices
+        self.default_units = default_units
+        self.default_unit = default_unit
+        # "커피 1포트" 같은 표시 이름 → (메뉴, 단위)
+        self.display_names = display_names
+        self._quote_cached = lru_cache(maxsize=QUOTE_CACHE_SIZE)(self._quote)
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> "PriceTable":
+        menus = catalogue.get("menus", {})
+        styles = catalogue.get("serving_styles", {})
+        sides = catalogue.get("sides", {})
+        side_prices = {
+            (name, unit): int(price)
+            for name, units in (sides.get("prices") or {}).items()
+            for unit, price in units.items()
+        }
+        display_names = {
+            display: (name, unit)
+            for name, units in (sides.get("display_names") or {}).items()
+            for unit, display in units.items()
+        }
+        return cls(
+            menu_prices={menu["name"]: int(menu["price"]) for menu in menus.values() if "price" in menu},
+            style_surcharges={style["name"]: int(style.get("surcharge", 0)) for style in styles.values()},
+            side_prices=side_prices,
+            default_units=dict(sides.get("default_units") or {}),
+            default_unit=sides.get("default_unit", "개"),
+            display_names=display_names,
+        )
+
+    @staticmethod
+    def _find(names: Sequence[str], value: Optional[str]) -> Optional[str]:
+        # 슬롯 값에 이름이 포함되어 있으면 인정 (validate_menu_name과 같은 규칙)
+        if not value:
+            return None
+        for name in names:
+            if name in value:
+                return name
+        return None
+
+    def menu_unit_price(self, menu_name: Optional[str], serving_style: Optional[str]) -> Optional[int]:
+        menu = self._find(self.menu_names, menu_name)
+        style = self._find(self.style_names, serving_style)
+        if menu is None or style is None:
+            return None
+        return self.matrix[(menu, style)]
+
+    def side_unit_price(self, name: str, unit: Optional[str]) -> Optional[int]:
+        if name in self.display_names:
+            name, unit = self.display_names[name]
+        unit = unit or self.default_units.get(name, self.default_unit)
+        return self.side_prices.get((name, unit))
+
+    def quote(
+        self,
+        menu_name: Optional[str],
+        menu_quantity: Any,
+        serving_style: Optional[str],
+        side_names: Optional[Sequence[str]] = None,
+        side_quantities: Optional[Sequence[Any]] = None,
+        side_units: Optional[Sequence[Optional[str]]] = None,
+    ) -> OrderQuote:
+        """Price an order from its slot values.
+
+        Quotes are shared between calls with the same values; do not modify them.
+        """
+        try:
+            return self._quote_cached(
+                menu_name, menu_quantity, serving_style,
+                tuple(side_names or ()), tuple(side_quantities or ()), tuple(side_units or ()),
+            )
+        except TypeError:
+            # 해시할 수 없는 값은 캐시 없이 계산
+            return self._quote(menu_name, menu_quantity, serving_style, side_names, side_quantities, side_units)
+
+    def _quote(
+        self,
+        menu_name: Optional[str],
+        menu_quantity: Any,
+        serving_style: Optional[str],
+        side_names: Optional[Sequence[str]],
+        side_quantities: Optional[Sequence[Any]],
+        side_units: Optional[Sequence[Optional[str]]],
+    ) -> OrderQuote:
+        lines = [PriceLine(
+            f"{menu_name} ({serving_style})",
+            _quantity(menu_quantity),
+            self.menu_unit_price(menu_name, serving_style),
+        )]
+
+        side_names = side_names or ()
+        side_quantities = side_quantities or ()
+        side_units = side_units or ()
+        for position, name in enumerate(side_names):
+            quantity = _quantity(side_quantities[position] if position < len(side_quantities) else None)
+            unit = side_units[position] if position < len(side_units) else None
+            lines.append(PriceLine(name, quantity, self.side_unit_price(name, unit)))
+
+        total = 0
+        unpriced = []
+        for line in lines:
+            amount = line.amount
+            if amount is None:
+                unpriced.append(line.label)
+            else:
+                total += amount
+        return OrderQuote(lines, total, unpriced)
+
+
+_PRICES = CatalogueCache(PriceTable.from_catalogue)
+
+
+def get_price_table() -> PriceTable:
+    """Return the price table, rebuilt if catalogue.yml changed."""
+    return _PRICES.get()
@@ -0,0 +1,153 @@
+# 느린 턴 샘플링 프로파일러
+#
+# 켜 두면 별도 스레드가 일정 간격으로 모든 스레드의 호출 스택을 샘플링해
+# 최근 몇 초 분량을 메모리에 둡니다. 액션 실행이 기준 시간보다 오래 걸리면
+# 그 실행 구간의 샘플을 flamegraph.pl, speedscope 등이 읽는 접힌 스택 형식
+# ("스레드;함수;함수 개수")으로 파일에 씁니다. 요청을 동시에 처리하므로 같은
+# 구간에 실행된 다른 요청의 스택도 함께 담깁니다.
+#
+#   ACTIONS_PROFILE_SLOW_MS      설정하면 켜짐: 이보다 오래 걸린 액션 실행을 기록
+#   ACTIONS_PROFILE_INTERVAL_MS  샘플링 간격 (기본값 5)
+#   ACTIONS_PROFILE_DIR          파일을 쓸 디렉터리 (기본값 profiles)
+
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 프로세스당 최대 파일 수와 액션별 최소 간격(초) (느린 요청이 몰려도 디스크를 채우지 않도록)
+MAX_DUMPS = 200
+MIN_DUMP_GAP = 1.0
+# 샘플을 보관하는 시간(초)
+HISTORY_SECONDS = 30.0
+
+# (perf_counter 시각, 스레드 이름, 바깥쪽부터의 코드 객체)
+Sample = Tuple[float, str, Tuple[Any, ...]]
+
+# 일을 기다리며 멈춰 있는 스레드의 가장 안쪽 프레임 (파일 이름, 함수)
+_IDLE_FRAMES = frozenset({("threading.py", "wait"), ("thread.py", "_worker"), ("queue.py", "get")})
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def fold_samples(samples: List[Sample]) -> List[str]:
+    """Collapsed-stack lines ('thread;outer;inner count'), most frequent first."""
+    stacks = Counter(
+        ";".join([thread_name, *(_frame_label(code) for code in codes)]) for _, thread_name, codes in samples
+    )
+    return [f"{stack} {count}" for stack, count in stacks.most_common()]
+
+
+class SlowTurnProfiler:
+    """Sample every thread's stack and dump the samples of slow action runs."""
+
+    def __init__(self, threshold: float, interval: float = 0.005, directory: str = "profiles") -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.directory = directory
+        self.dumps = 0
+        self._last_dump: Dict[str, float] = {}
+        self._samples: Deque[Sample] = deque(maxlen=max(1, int(HISTORY_SECONDS / interval)))
+        self._requests: "queue.Queue[Tuple[str, float, float]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="actions-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def observe(self, action_name: str, elapsed: float) -> None:
+        """Called when an action run ends; queues a dump when it was slow."""
+        if elapsed >= self.threshold:
+            end = time.perf_counter()
+            self._requests.put((action_name, end - elapsed, end))
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            self._sample(own)
+            while True:
+                try:
+                    action_name, start, end = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                self._dump(action_name, start, end)
+
+    def _sample(self, own: int) -> None:
+        now = time.perf_counter()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.reverse()
+            self._samples.append((now, names.get(ident, str(ident)), tuple(codes)))
+
+    def _dump(self, action_name: str, start: float, end: float) -> None:
+        if self.dumps >= MAX_DUMPS or end - self._last_dump.get(action_name, float("-inf")) < MIN_DUMP_GAP:
+            return
+        samples = [sample for sample in self._samples if start <= sample[0] <= end]
+        if not samples:
+            return
+        self.dumps += 1
+        self._last_dump[action_name] = end
+        path = os.path.join(
+            self.directory, f"{action_name}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self.dumps}.folded"
+        )
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(fold_samples(samples)) + "\n")
+        except OSError as exc:
+            logger.warning("Could not write profile %s: %s", path, exc)
+            return
+        logger.info("%s took %.0f ms; wrote %d stack samples to %s",
+                    action_name, (end - start) * 1000, len(samples), path)
+
+
+_UNCONFIGURED: Any = object()
+_profiler: Any = _UNCONFIGURED
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[SlowTurnProfiler]:
+    """Return the running profiler configured by ACTIONS_PROFILE_*, or None when off.
+
+    The sampling thread starts on first use, so each forked worker runs its own.
+    """
+    global _profiler
+    if _profiler is _UNCONFIGURED:
+        with _profiler_lock:
+            if _profiler is _UNCONFIGURED:
+                threshold = os.environ.get("ACTIONS_PROFILE_SLOW_MS")
+                profiler = None
+                if threshold:
+                    profiler = SlowTurnProfiler(
+                        threshold=float(threshold) / 1000.0,
+                        interval=float(os.environ.get("ACTIONS_PROFILE_INTERVAL_MS", "5")) / 1000.0,
+                        directory=os.environ.get("ACTIONS_PROFILE_DIR", "profiles"),
+                    )
+                    profiler.start()
+                _profiler = profiler
+    return _profiler
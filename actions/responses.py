@@ -0,0 +1,140 @@
+# 응답 문구 템플릿
+#
+# 검증 메시지, 추천 문구, 주문 요약처럼 액션 서버가 직접 보내는 문구를
+# responses.yml에서 읽어 미리 쪼개 두고(리터럴과 {필드}), 같은 입력으로
+# 다시 렌더링하면 캐시된 문자열을 돌려줍니다. 언어별 문구는 locales 아래에
+# 두며, 없는 문구는 기본 언어로 대체합니다. 같은 문구는 모든 언어에서 같은
+# 필드를 써야 하며, 다르면 불러올 때 거절합니다.
+#
+#   ACTIONS_LOCALE  메시지 metadata에 locale이 없을 때 쓰는 언어 (기본값: responses.yml의 default_locale)
+#
+# domain.yml의 utter_* 응답은 Rasa가 직접 보내므로 그대로 둡니다.
+
+import os
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalogue import CatalogueCache
+
+RESPONSES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'responses.yml')
+
+RENDER_CACHE_SIZE = 4096
+
+# (리터럴, 필드 이름, 형식 지정자) — 필드 이름이 None이면 리터럴만
+Part = Tuple[str, Optional[str], str]
+
+
+class Template:
+    """A str.format template parsed and checked once."""
+
+    __slots__ = ('source', 'parts', 'fields', 'literal')
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        parts: List[Part] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if conversion:
+                raise ValueError(f"Conversions are not supported in response templates: {source!r}")
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"Response template fields must be plain names: {source!r}")
+            if spec and '{' in spec:
+                raise ValueError(f"Nested fields are not supported in response templates: {source!r}")
+            parts.append((literal, field, spec or ''))
+        self.parts = tuple(parts)
+        self.fields = frozenset(field for _, field, _ in parts if field)
+        # 필드가 없는 문구는 {{ }} 이스케이프만 풀어 둔 문자열 그대로 씀
+        self.literal: Optional[str] = ''.join(part[0] for part in parts) if not self.fields else None
+
+    def render(self, values: Dict[str, Any]) -> str:
+        if self.literal is not None:
+            return self.literal
+        # 미리 쪼개 둔 조각을 이어 붙임 (원문을 다시 파싱하지 않음)
+        out: List[str] = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(values[field], spec))
+        return ''.join(out)
+
+
+class ResponseCatalogue:
+    """Compiled templates per locale with a memo of rendered messages."""
+
+    def __init__(self, locales: Dict[str, Dict[str, str]], default_locale: str) -> None:
+        if default_locale not in locales:
+            raise ValueError(f"Default locale '{default_locale}' has no templates")
+        self.default_locale = default_locale
+        self.templates: Dict[str, Dict[str, Template]] = {
+            locale: {name: Template(source) for name, source in templates.items()}
+            for locale, templates in locales.items()
+        }
+        # 언어마다 필드가 다르면 어떤 언어에서는 렌더링할 때 KeyError가 나므로 미리 거절
+        fields: Dict[str, Tuple[str, frozenset]] = {}
+        for locale, templates in self.templates.items():
+            for name, template in templates.items():
+                first_locale, first_fields = fields.setdefault(name, (locale, template.fields))
+                if template.fields != first_fields:
+                    raise ValueError(
+                        f"Response '{name}' uses fields {sorted(template.fields)} in '{locale}' "
+                        f"but {sorted(first_fields)} in '{first_locale}'"
+                    )
+        # 빠진 문구는 기본 언어로 채워 둠
+        defaults = self.templates[default_locale]
+        for templates in self.templates.values():
+            for name, template in defaults.items():
+                templates.setdefault(name, template)
+        self._render_cached = lru_cache(maxsize=RENDER_CACHE_SIZE)(self._render)
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> 'ResponseCatalogue':
+        return cls(catalogue.get('locales', {}), catalogue.get('default_locale', 'ko'))
+
+    def resolve_locale(self, locale: Optional[str]) -> str:
+        """Map 'en-US', 'en_US' or 'EN' to a configured locale, else the default."""
+        if locale:
+            locale = locale.replace('_', '-').lower()
+            if locale in self.templates:
+                return locale
+            language = locale.split('-')[0]
+            if language in self.templates:
+                return language
+        return self.default_locale
+
+    def template(self, name: str, locale: Optional[str] = None) -> Template:
+        """Compiled template, for messages that are unique per call and not worth caching."""
+        return self.templates[self.resolve_locale(locale)][name]
+
+    def _render(self, name: str, locale: str, items: Tuple[Tuple[str, Any], ...]) -> str:
+        return self.templates[locale][name].render(dict(items))
+
+    def render(self, name: str, locale: Optional[str] = None, /, **values: Any) -> str:
+        locale = self.resolve_locale(locale)
+        try:
+            # 키워드 순서는 호출하는 곳마다 고정이라 정렬하지 않음
+            return self._render_cached(name, locale, tuple(values.items()))
+        except TypeError:
+            # 리스트처럼 해시할 수 없는 값은 캐시 없이 렌더링
+            return self._render(name, locale, tuple(values.items()))
+
+    def cache_info(self):
+        return self._render_cached.cache_info()
+
+
+_RESPONSES = CatalogueCache(ResponseCatalogue.from_catalogue, path=RESPONSES_PATH)
+
+
+def get_responses() -> ResponseCatalogue:
+    """Return the response templates, rebuilt if responses.yml changed."""
+    return _RESPONSES.get()
+
+
+def message_locale(tracker: Any) -> Optional[str]:
+    """Locale requested in the latest message metadata, else ACTIONS_LOCALE."""
+    metadata = (tracker.latest_message or {}).get('metadata') or {}
+    return metadata.get('locale') or os.environ.get('ACTIONS_LOCALE')
+
+
+def render(name: str, locale: Optional[str] = None, /, **values: Any) -> str:
+    """Render a response template by name; values may use any field name."""
+    return get_responses().render(name, locale, **values)
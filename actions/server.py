@@ -0,0 +1,280 @@
+# 멀티 워커 액션 서버
+#
+# rasa run actions 는 프로세스 하나로 돌아가 CPU 코어 하나만 씁니다. 이
+# 모듈은 리스닝 소켓을 먼저 열고 액션 패키지, 숫자/날짜 파서, 메뉴 인덱스,
+# 사이드 메뉴 카탈로그를 미리 준비한 다음 워커를 fork 합니다. 워커들은 준비된
+# 메모리를 copy-on-write 로 공유하고 같은 소켓에서 요청을 나눠 받습니다.
+#
+#   python -m actions.server --port 5055 --workers 4
+#
+#   ACTIONS_WORKERS       워커 수 (기본값: CPU 코어 수)
+#   ACTIONS_METRICS_PORT  설정하면 워커 i 는 이 포트 + i 에서 /metrics 를 엽니다.
+#   ACTIONS_BATCH_SIZE, ACTIONS_BATCH_WINDOW_MS
+#                         /webhook 요청 묶음 처리 (actions/webhook.py)
+#   ACTIONS_SLIM_PAYLOADS, ACTIONS_DECODE_SAMPLE_RATE
+#                         트래커 이벤트 선택적 디코딩 (actions/payload.py)
+#
+# 신호
+#   SIGHUP           카탈로그를 다시 읽고 워커를 하나씩 새로 띄운 뒤 이전 워커를
+#                    종료합니다 (요청 유실 없음).
+#   SIGTERM, SIGINT  모든 워커가 처리 중인 요청을 마치도록 기다린 뒤 종료합니다.
+#
+# 워커는 SIGTERM을 받으면 새 연결을 받지 않고 처리 중인 요청을 마친 뒤, 주문
+# 저장소 큐에 남은 주문과 주문 캐시를 기록하고 끝납니다. 워커는 os._exit로
+# 끝나 atexit 처리기가 돌지 않으므로 여기서 직접 닫습니다.
+#
+# 코드 변경은 전체 재시작이 필요합니다. 카탈로그 변경은 재시작 없이도
+# 반영됩니다 (actions/catalogue.py).
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 5055
+# 워커가 이보다 빨리 죽으면 다시 띄우기 전에 잠시 기다림
+MIN_WORKER_LIFETIME = 1.0
+RESPAWN_DELAY = 1.0
+
+
+def warm_up(actions_package: str = "actions"):
+    """Import the action package and build its shared state before forking.
+
+    Returns the ActionExecutor with every action registered.
+    """
+    from rasa_sdk.executor import ActionExecutor
+
+    from .fuzzy_match import get_menu_matcher, get_style_matcher
+    from .menu_index import get_menu_index
+    from .number_scanner import get_numeric_scanner
+    from .patterns import get_catalogue_patterns
+    from .side_items import get_side_item_assembler
+
+    executor = ActionExecutor()
+    executor.register_package(actions_package)
+    get_menu_index()
+    get_menu_matcher()
+    get_style_matcher()
+    get_catalogue_patterns()
+    get_numeric_scanner()
+    get_side_item_assembler()
+
+    # 준비된 객체를 GC 대상에서 빼서 워커에서 참조 횟수만 바뀌어도 페이지가
+    # 복사되는 일을 줄임
+    gc.collect()
+    gc.freeze()
+    return executor
+
+
+def bind_socket(host: str, port: int, backlog: int = 1024) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve_worker(index: int, sock: socket.socket, action_executor, cors: str,
+                 endpoints: str, metrics_port: Optional[int]) -> None:
+    """Run one Sanic server on the inherited socket until SIGTERM."""
+    from sanic import Sanic
+    from rasa_sdk.endpoint import create_app_for_serve
+
+    from .metrics import start_metrics_server
+    from .payload import decoder_from_env
+    from .webhook import batcher_from_env, install_webhook
+
+    if metrics_port is not None:
+        start_metrics_server(metrics_port + index)
+
+    app = create_app_for_serve(action_executor, cors_origins=cors, endpoints=endpoints)
+    install_webhook(app, action_executor, batcher_from_env(action_executor), decoder_from_env())
+    app.prepare(sock=sock, single_process=True, motd=False, access_log=False)
+    Sanic.serve_single(primary=app)
+
+
+def close_worker_state() -> None:
+    """Write queued orders and the order cache before a worker exits."""
+    from .order_cache import close_order_cache
+    from .order_store import close_order_sink
+
+    for close in (close_order_sink, close_order_cache):
+        try:
+            close()
+        except Exception:
+            logger.exception("Failed to close %s", close.__name__)
+
+
+def _exit_before_serving(signum, frame) -> None:
+    # Sanic이 신호 처리기를 달기 전에는 받은 요청이 없으므로 바로 정리하고 끝냄
+    raise SystemExit(0)
+
+
+class Supervisor:
+    """Pre-forking supervisor that keeps a fixed number of workers alive."""
+
+    def __init__(self, sock: socket.socket, workers: int, action_executor, cors: str = "*",
+                 endpoints: str = "endpoints.yml", metrics_port: Optional[int] = None,
+                 actions_package: str = "actions") -> None:
+        self.sock = sock
+        self.workers = workers
+        self.action_executor = action_executor
+        self.cors = cors
+        self.endpoints = endpoints
+        self.metrics_port = metrics_port
+        self.actions_package = actions_package
+        # pid → (워커 번호, 시작 시각)
+        self.children: Dict[int, tuple] = {}
+        self._stopping = False
+        self._reload_requested = False
+
+    def spawn(self, index: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            # 서버가 뜬 뒤에는 Sanic이 SIGTERM/SIGINT에 처리 중인 요청을 마치고 멈춤
+            signal.signal(signal.SIGTERM, _exit_before_serving)
+            signal.signal(signal.SIGINT, _exit_before_serving)
+            code = 0
+            try:
+                serve_worker(index, self.sock, self.action_executor, self.cors,
+                             self.endpoints, self.metrics_port)
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else 0
+            except BaseException:
+                logger.exception("Worker %d crashed", index)
+                code = 1
+            finally:
+                # 남은 주문을 기록하는 동안 다시 온 신호로 끊기지 않게 함
+                signal.signal(signal.SIGTERM, signal.SIG_IGN)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                close_worker_state()
+                logging.shutdown()
+                os._exit(code)
+        self.children[pid] = (index, time.monotonic())
+        logger.info("Started worker %d (pid %d)", index, pid)
+        return pid
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame) -> None:
+        self._reload_requested = True
+
+    def reload(self) -> None:
+        """Replace every worker one at a time, refreshing the warm state first."""
+        logger.info("Reloading workers")
+        gc.unfreeze()
+        self.action_executor = warm_up(self.actions_package)
+        for pid, (index, _) in list(self.children.items()):
+            self.spawn(index)
+            self._terminate(pid)
+
+    def _terminate(self, pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        # 종료 중인 워커는 다시 띄우지 않음
+        self.children.pop(pid, None)
+
+    def _reap(self) -> List[int]:
+        exited = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self.children:
+                exited.append(pid)
+                index, started = self.children.pop(pid)
+                logger.warning("Worker %d (pid %d) exited with status %d", index, pid, status)
+                if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                    time.sleep(RESPAWN_DELAY)
+                if not self._stopping:
+                    self.spawn(index)
+        return exited
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        for index in range(self.workers):
+            self.spawn(index)
+
+        while not self._stopping:
+            if self._reload_requested:
+                self._reload_requested = False
+                self.reload()
+            self._reap()
+            time.sleep(0.2)
+
+        logger.info("Stopping %d workers", len(self.children))
+        pids = list(self.children)
+        for pid in pids:
+            self._terminate(pid)
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.sock.close()
+        return 0
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the custom actions server with several worker processes.")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default=os.environ.get("SANIC_HOST", "0.0.0.0"))
+    parser.add_argument("-w", "--workers", type=int,
+                        default=int(os.environ.get("ACTIONS_WORKERS", "0")) or os.cpu_count() or 1)
+    parser.add_argument("--actions", default="actions", help="action package to load")
+    parser.add_argument("--cors", default="*")
+    parser.add_argument("--endpoints", default="endpoints.yml")
+    parser.add_argument("--loglevel", default="INFO")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = create_argument_parser().parse_args(argv)
+    logging.basicConfig(level=args.loglevel, format="%(asctime)s [%(process)d] %(levelname)s %(name)s - %(message)s")
+
+    # 지표 서버는 워커마다 따로 띄우므로 패키지를 import 할 때 열리지 않게 함
+    metrics_port = os.environ.pop("ACTIONS_METRICS_PORT", None)
+    if metrics_port:
+        from .metrics import count_parser_calls
+
+        count_parser_calls()
+
+    # 워커가 여럿이면 주문 캐시를 ORDER_CACHE_PATH로 공유함 (actions/order_cache.py)
+    from .order_cache import set_worker_count
+
+    set_worker_count(args.workers)
+
+    sock = bind_socket(args.host, args.port)
+    action_executor = warm_up(args.actions)
+    logger.info("Action server listening on http://%s:%d with %d workers", args.host, args.port, args.workers)
+
+    supervisor = Supervisor(
+        sock, args.workers, action_executor,
+        cors=args.cors,
+        endpoints=args.endpoints,
+        metrics_port=int(metrics_port) if metrics_port else None,
+        actions_package=args.actions,
+    )
+    return supervisor.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
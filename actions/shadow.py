@@ -0,0 +1,198 @@
+# 파서 섀도 실행
+#
+# 파서를 새 구현으로 바꾸기 전에 실제 요청에서 어떻게 동작하는지 확인합니다.
+# 후보 구현을 등록하면 현재 구현의 호출 중 일부를 골라, 응답이 나간 뒤 별도
+# 스레드에서 같은 인자로 후보를 실행하고 결과와 지연 시간을 비교합니다.
+# 응답에는 항상 현재 구현의 결과만 쓰입니다.
+#
+#   ACTIONS_SHADOW        파서 이름=모듈:함수, 쉼표로 구분
+#                         (예: korean_number_to_int=mypkg.numbers:parse_number)
+#   ACTIONS_SHADOW_RATE   비교할 호출 비율 (기본값 0.01)
+#   ACTIONS_SHADOW_LOG    설정하면 결과가 다른 입력을 이 JSONL 파일에 기록
+#
+# 섀도 실행 여부는 파서 모듈을 import 할 때 정해집니다. ACTIONS_SHADOW가 없으면
+# shadowed는 파서를 감싸지 않아 호출마다 드는 비용이 없습니다. 코드에서
+# set_shadow_runner()로 켤 때도 actions.actions를 import 하기 전에 불러야 합니다.
+#
+# 후보는 GIL을 나눠 쓰는 스레드에서 돌기 때문에, 후보의 지연 시간은 부하가
+# 높을수록 실제보다 크게 나올 수 있습니다.
+#
+# process 실행기(ACTIONS_EXECUTOR=process)에서 호출된 파서는 그 워커 프로세스에서
+# 비교되므로 지표에는 나타나지 않고 ACTIONS_SHADOW_LOG에만 남습니다.
+
+import functools
+import importlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# 이보다 많이 밀려 있으면 새 비교는 버림
+MAX_PENDING = 1000
+
+SHADOW_CALLS = REGISTRY.counter("actions_shadow_calls_total", "Parser calls compared with a shadow candidate.")
+SHADOW_DIVERGENCES = REGISTRY.counter(
+    "actions_shadow_divergences_total", "Shadow comparisons where the candidate returned a different result."
+)
+SHADOW_ERRORS = REGISTRY.counter("actions_shadow_errors_total", "Shadow candidate calls that raised.")
+SHADOW_DROPPED = REGISTRY.counter("actions_shadow_dropped_total", "Sampled calls dropped because the queue was full.")
+SHADOW_LATENCY = REGISTRY.histogram(
+    "actions_shadow_latency_seconds", "Latency of the current and the candidate parser on the same inputs."
+)
+
+
+def load_candidate(path: str) -> Callable:
+    """Import 'package.module:function'."""
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Shadow candidate '{path}' must look like 'module:function'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def parse_shadow_spec(spec: str) -> Dict[str, Callable]:
+    """'name=module:function,...' → {parser name: candidate}."""
+    candidates = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, path = item.partition("=")
+        candidates[name.strip()] = load_candidate(path.strip())
+    return candidates
+
+
+class ShadowRunner:
+    """Run candidate parsers on a sample of calls, off the response path."""
+
+    def __init__(self, candidates: Dict[str, Callable], rate: float = 0.01, log_path: Optional[str] = None) -> None:
+        self.candidates = candidates
+        self.rate = rate
+        self.log_path = log_path
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def wants(self, name: str) -> bool:
+        return name in self.candidates and random.random() < self.rate
+
+    def submit(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], result: Any, elapsed: float) -> None:
+        with self._lock:
+            if self._pending >= MAX_PENDING:
+                SHADOW_DROPPED.inc(parser=name)
+                return
+            self._pending += 1
+            if self._executor is None:
+                # fork 이후 워커에서 처음 쓸 때 만듦
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="actions-shadow")
+        self._executor.submit(self._compare, name, args, kwargs, result, elapsed)
+
+    def _compare(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], expected: Any, elapsed: float) -> None:
+        try:
+            started = time.perf_counter()
+            try:
+                actual = self.candidates[name](*args, **kwargs)
+            except Exception as exc:
+                SHADOW_ERRORS.inc(parser=name)
+                self._record(name, args, kwargs, expected, f"{type(exc).__name__}: {exc}")
+                return
+            candidate_elapsed = time.perf_counter() - started
+            SHADOW_CALLS.inc(parser=name)
+            SHADOW_LATENCY.observe(elapsed, parser=name, implementation="current")
+            SHADOW_LATENCY.observe(candidate_elapsed, parser=name, implementation="candidate")
+            if actual != expected:
+                SHADOW_DIVERGENCES.inc(parser=name)
+                self._record(name, args, kwargs, expected, actual)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _record(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], expected: Any, actual: Any) -> None:
+        logger.warning("Shadow %s diverged for %r: current %r, candidate %r", name, args, expected, actual)
+        if not self.log_path:
+            return
+        line = json.dumps(
+            {"parser": name, "args": args, "kwargs": kwargs, "current": expected, "candidate": actual,
+             "time": time.time()},
+            ensure_ascii=False, default=str,
+        )
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as exc:
+            logger.warning("Could not write shadow divergence to %s: %s", self.log_path, exc)
+
+    def close(self) -> None:
+        """Wait for queued comparisons."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_UNCONFIGURED: Any = object()
+_runner: Any = _UNCONFIGURED
+_runner_lock = threading.Lock()
+
+
+def get_shadow_runner() -> Optional[ShadowRunner]:
+    """Return the runner configured by ACTIONS_SHADOW*, or None when unset."""
+    global _runner
+    if _runner is _UNCONFIGURED:
+        with _runner_lock:
+            if _runner is _UNCONFIGURED:
+                spec = os.environ.get("ACTIONS_SHADOW", "")
+                runner = None
+                if spec:
+                    try:
+                        runner = ShadowRunner(
+                            parse_shadow_spec(spec),
+                            rate=float(os.environ.get("ACTIONS_SHADOW_RATE", "0.01")),
+                            log_path=os.environ.get("ACTIONS_SHADOW_LOG"),
+                        )
+                        logger.info("Shadowing parsers: %s", ", ".join(sorted(runner.candidates)))
+                    except (ImportError, AttributeError, ValueError) as exc:
+                        logger.error("Ignoring ACTIONS_SHADOW=%r: %s", spec, exc)
+                _runner = runner
+    return _runner
+
+
+def set_shadow_runner(runner: Optional[ShadowRunner]) -> None:
+    """Install a runner (None turns shadowing off), replacing the env configuration.
+
+    Parsers decorated while shadowing was off stay unwrapped, so install
+    the first runner before importing actions.actions; parsers that are
+    already wrapped pick up later replacements on their next call.
+    """
+    global _runner
+    with _runner_lock:
+        _runner = runner
+
+
+def shadowed(name: str) -> Callable[[Callable], Callable]:
+    """Compare calls of a parser with its registered shadow candidate, if any.
+
+    The parser is returned unchanged when shadowing is off at decoration
+    time (ACTIONS_SHADOW unset and no runner installed).
+    """
+    def decorator(func: Callable) -> Callable:
+        if _runner is None or (_runner is _UNCONFIGURED and not os.environ.get("ACTIONS_SHADOW")):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            runner = _runner if _runner is not _UNCONFIGURED else get_shadow_runner()
+            if runner is None or not runner.wants(name):
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            runner.submit(name, args, kwargs, result, time.perf_counter() - started)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,124 @@
+# 사이드 메뉴 엔티티 조립
+#
+# side_name / side_quantity / side_unit 엔티티를 문장 순서대로 한 번 훑어서
+# 사이드 메뉴 항목으로 묶습니다. 단위별 표시 이름과 기본 단위는
+# catalogue.yml의 sides 항목에서 읽습니다.
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .catalogue import CatalogueCache
+from .numerals import parse_korean_number
+
+
+class SideItem:
+    """One side line of an order."""
+
+    __slots__ = ("name", "quantity", "unit")
+
+    def __init__(self, name: str, quantity: Optional[int] = None, unit: Optional[str] = None) -> None:
+        self.name = name
+        self.quantity = quantity
+        self.unit = unit
+
+    def __repr__(self) -> str:
+        return f"SideItem({self.name!r}, {self.quantity!r}, {self.unit!r})"
+
+
+def _parse_quantity(value: Any) -> int:
+    quantity = parse_korean_number(value) if isinstance(value, str) else None
+    if quantity is None:
+        try:
+            quantity = int(value)
+        except (ValueError, TypeError):
+            quantity = 1
+    return quantity
+
+
+class SideItemAssembler:
+    """Table-driven assembly of side entities into SideItem records."""
+
+    def __init__(
+        self,
+        default_unit: str,
+        default_units: Dict[str, str],
+        display_names: Dict[Tuple[str, str], str],
+    ) -> None:
+        self.default_unit = default_unit
+        self.default_units = default_units
+        self.display_names = display_names
+
+    @classmethod
+    def from_catalogue(cls, catalogue: Dict[str, Any]) -> "SideItemAssembler":
+        sides = catalogue.get("sides", {})
+        display_names = {
+            (name, unit): display
+            for name, units in (sides.get("display_names") or {}).items()
+            for unit, display in units.items()
+        }
+        return cls(
+            default_unit=sides.get("default_unit", "개"),
+            default_units=dict(sides.get("default_units") or {}),
+            display_names=display_names,
+        )
+
+    def assemble(self, entities: Iterable[Dict[str, Any]]) -> List[SideItem]:
+        """Group entities into items in one pass over them in text order.
+
+        Quantities and units attach to the side name before them. When
+        that item already has one, or no name has been seen yet, they are
+        held for the next name instead ("두 개 빵이랑 한 병 샴페인").
+        """
+        entities = list(entities)
+        if any(entities[i].get("start", 0) > entities[i + 1].get("start", 0) for i in range(len(entities) - 1)):
+            entities.sort(key=lambda entity: entity.get("start", 0))
+
+        items: List[SideItem] = []
+        current: Optional[SideItem] = None
+        pending_quantity: Optional[int] = None
+        pending_unit: Optional[str] = None
+
+        for entity in entities:
+            kind = entity["entity"]
+            value = entity["value"]
+            if kind == "side_name":
+                current = SideItem(value, pending_quantity, pending_unit)
+                items.append(current)
+                pending_quantity = pending_unit = None
+            elif kind == "side_quantity":
+                quantity = _parse_quantity(value)
+                if current is not None and current.quantity is None:
+                    current.quantity = quantity
+                else:
+                    pending_quantity = quantity
+            elif kind == "side_unit":
+                if current is not None and current.unit is None and pending_quantity is None:
+                    current.unit = value
+                else:
+                    pending_unit = value
+
+        for item in items:
+            if item.quantity is None:
+                item.quantity = 1
+            if item.unit is None:
+                item.unit = self.default_units.get(item.name, self.default_unit)
+        return items
+
+    def to_slot_lists(self, items: Iterable[SideItem]) -> Tuple[List[str], List[str], List[str]]:
+        """Return the parallel side_name/side_quantity/side_unit slot lists."""
+        names: List[str] = []
+        quantities: List[str] = []
+        units: List[str] = []
+        display_names = self.display_names
+        for item in items:
+            names.append(display_names.get((item.name, item.unit), item.name))
+            quantities.append(str(item.quantity))
+            units.append(item.unit)
+        return names, quantities, units
+
+
+_ASSEMBLER = CatalogueCache(SideItemAssembler.from_catalogue)
+
+
+def get_side_item_assembler() -> SideItemAssembler:
+    """Return the assembler, rebuilt if catalogue.yml changed."""
+    return _ASSEMBLER.get()
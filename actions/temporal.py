@@ -0,0 +1,156 @@
+# 한국어 날짜/시간 표현 파서
+#
+# 날짜와 시간 패턴을 하나의 정규식으로 미리 컴파일해 두고, 입력을 한 번만
+# 훑어 날짜와 시간을 함께 뽑아냅니다. 결과는 (정규화된 표현, KST 날짜)를
+# 키로 하는 LRU 캐시에 저장되므로 "내일 6시" 같은 반복 표현은 다시
+# 파싱하지 않습니다.
+#
+# parse_temporal은 메시지 분석과 웹훅 배치를 포함한 모든 날짜/시간 파싱이
+# 거치는 곳이라, 파서 호출 지표와 섀도 비교를 여기에 붙입니다.
+
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from .clock import get_clock
+from .metrics import track_parser
+from .numerals import NUMERAL_CHARS, parse_korean_number
+from .shadow import shadowed
+
+CACHE_SIZE = 1024
+
+_WEEKDAYS = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
+_RELATIVE_DAYS = {'오늘': 0, '내일': 1, '모레': 2}
+
+# 말로 하는 시각은 고유어로만 셈 ("일시", "이시", "오시나요"의 한자어는 시각이 아님)
+_NATIVE_HOURS = '열[한두]?|한|두|세|네|다섯|여섯|일곱|여덟|아홉'
+
+# 띄어 쓰지 않아도 시각 앞에 올 수 있는 말 ("저녁여섯시", "내일일곱시")
+_BEFORE_HOUR = ('오늘', '내일', '모레', '아침', '점심', '저녁', '오전', '오후', '밤')
+
+_TOKEN_RE = re.compile(
+    r'(?P<relative>오늘|내일|모레)'
+    r'|(?P<week>이번|다음)\s*주\s*(?P<weekday>[월화수목금토일])요일'
+    r'|(?P<month>\d+)\s*월\s*(?P<day>\d+)\s*일'
+    # 단어의 일부인 수사는 건너뜀 ("배송 일시는"), "두 시간"은 시각이 아님
+    r'|(?P<hour>\d+|(?:(?<![가-힣]){after})(?:{hours}))\s*시(?!간)'
+    r'(?:\s*(?:(?P<minute>\d+|[{chars}]+)\s*분|(?P<half>반)))?'.format(
+        hours=_NATIVE_HOURS,
+        chars=NUMERAL_CHARS,
+        # 뒤보기는 길이가 고정이어야 하므로 글자 수별로 나눔
+        after=''.join(
+            '|(?<={})'.format('|'.join(word for word in _BEFORE_HOUR if len(word) == length))
+            for length in sorted({len(word) for word in _BEFORE_HOUR})
+        ),
+    )
+)
+
+
+class TemporalExpression(NamedTuple):
+    """Date and time extracted from one utterance.
+
+    date is 'YYYY-MM-DD' and time is 'HH:MM:SS'; either is None when the
+    utterance does not contain it. invalid_date is set when a calendar
+    date was mentioned but does not exist (e.g. 2월 30일).
+    """
+
+    date: Optional[str]
+    time: Optional[str]
+    invalid_date: bool = False
+
+
+def normalize_expression(text: str) -> str:
+    """Collapse whitespace so equivalent phrases share a cache entry."""
+    return ' '.join(text.split())
+
+
+def kst_today() -> date:
+    """Return today's calendar date in KST from the installed clock."""
+    return get_clock().today()
+
+
+def _resolve_weekday(today: date, week: str, weekday: str) -> date:
+    days_ahead = _WEEKDAYS[weekday] - today.weekday()
+    if week == '다음':
+        days_ahead += 7
+    elif days_ahead <= 0:  # 이미 지났으면 다음 주
+        days_ahead += 7
+    return today + timedelta(days=days_ahead)
+
+
+def _resolve_time(hour_text: str, minute_text: Optional[str], half: Optional[str]) -> Optional[str]:
+    hour = parse_korean_number(hour_text)
+    if hour is None or hour > 23:
+        return None
+
+    minute = 0
+    if half:
+        minute = 30
+    elif minute_text:
+        minute = parse_korean_number(minute_text)
+        if minute is None or minute > 59:
+            return None
+
+    # 주문 시간은 항상 오후로 처리 (12시 미만이면 +12)
+    if hour < 12:
+        hour += 12
+
+    return f"{hour:02d}:{minute:02d}:00"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_cached(text: str, day_ordinal: int) -> TemporalExpression:
+    today = date.fromordinal(day_ordinal)
+    resolved_date = None
+    resolved_time = None
+    invalid_date = False
+
+    for match in _TOKEN_RE.finditer(text):
+        if match.group('relative') and resolved_date is None:
+            offset = _RELATIVE_DAYS[match.group('relative')]
+            resolved_date = today + timedelta(days=offset)
+        elif match.group('week') and resolved_date is None:
+            resolved_date = _resolve_weekday(today, match.group('week'), match.group('weekday'))
+        elif match.group('month') and resolved_date is None and not invalid_date:
+            month = int(match.group('month'))
+            day = int(match.group('day'))
+            # 만약 입력된 월/일이 이미 지났으면 내년으로 설정
+            try:
+                target = date(today.year, month, day)
+                if target < today:
+                    target = date(today.year + 1, month, day)
+                resolved_date = target
+            except ValueError:
+                invalid_date = True
+        elif match.group('hour') and resolved_time is None:
+            resolved_time = _resolve_time(match.group('hour'), match.group('minute'), match.group('half'))
+
+    return TemporalExpression(
+        date=resolved_date.strftime("%Y-%m-%d") if resolved_date else None,
+        time=resolved_time,
+        invalid_date=invalid_date,
+    )
+
+
+@shadowed("parse_temporal")
+@track_parser("parse_temporal", failed=lambda result, text: result.date is None and result.time is None)
+def parse_temporal(text: str, today: Optional[date] = None) -> TemporalExpression:
+    """Extract the delivery date and time from text in a single pass.
+
+    Results are cached per KST calendar day, so repeated phrases such as
+    '내일 6시' are only parsed once a day.
+    """
+    if today is None:
+        today = kst_today()
+    return _parse_cached(normalize_expression(text or ''), today.toordinal())
+
+
+def cache_stats():
+    """Return the hit/miss counters of the parse cache."""
+    return _parse_cached.cache_info()
+
+
+def clear_cache() -> None:
+    """Drop every cached parse result."""
+    _parse_cached.cache_clear()
@@ -0,0 +1,262 @@
+# 웹훅 마이크로 배치
+#
+# Rasa는 액션을 실행할 때마다 /webhook 요청을 하나씩 보냅니다. 부하가 높으면
+# 검증 자체보다 요청마다 드는 JSON 디코딩/인코딩과 파싱 준비가 더 큰 비용이라,
+# 잠깐 동안 들어온 요청을 모아서 한 번에 처리합니다.
+#
+#   1. 요청 본문은 orjson이 있으면 orjson으로 디코딩/인코딩 (없으면 json),
+#      마지막 사용자 메시지 이전의 트래커 이벤트는 디코딩하지 않음 (actions/payload.py)
+#   2. 배치 안의 메시지를 분석하고, 텍스트·인텐트·엔티티가 같은 메시지는
+#      분석 하나를 같이 씀
+#   3. 요청된 슬롯에 필요한 본문 파싱(날짜/시간, 수량)을 배치 전체에 대해
+#      run_blocking 한 번으로 실행
+#   4. 액션을 동시에 실행하고 결과를 각 요청에 돌려줌
+#
+#   ACTIONS_BATCH_WINDOW_MS  첫 요청이 들어온 뒤 더 기다리는 시간(ms)
+#                            (기본값 0: 같은 이벤트 루프 차례에 도착한 요청만 묶음)
+#   ACTIONS_BATCH_SIZE       배치 최대 크기 (기본값 64, 1이면 배치하지 않음)
+#
+# 배치하지 않을 때도 /webhook 은 여기서 디코딩해 액션을 바로 실행합니다.
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .message_analysis import (
+    PRIMED_ANALYSIS,
+    SLOT_TEXT_PARSES,
+    MessageAnalysis,
+    build_message_analysis,
+    parse_message_texts,
+)
+from .metrics import REGISTRY
+from .offload import run_blocking
+from .payload import PayloadDecoder, json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 폼 밖에서 본문의 날짜/시간을 읽는 액션
+_TEMPORAL_ACTIONS = frozenset({"action_reorder_last_order"})
+
+BATCHES = REGISTRY.counter("actions_webhook_batches_total", "Webhook batches processed.")
+BATCHED_REQUESTS = REGISTRY.counter("actions_webhook_batched_requests_total", "Webhook requests handled in batches.")
+SHARED_ANALYSES = REGISTRY.counter(
+    "actions_webhook_shared_analyses_total", "Batched requests that reused another request's message analysis."
+)
+
+
+def json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # orjson이 못 다루는 값(문자열이 아닌 키 등)은 json으로
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def decode_action_call(
+    body: bytes, content_encoding: Optional[str] = None, decoder: Optional[PayloadDecoder] = None
+) -> Any:
+    """Decode a webhook request body, inflating it when deflate-encoded."""
+    if content_encoding == "deflate":
+        body = zlib.decompress(body)
+    if decoder is not None:
+        return decoder.decode(body)
+    return json_loads(body)
+
+
+def _analysis_key(message: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    entities = message.get("entities") or []
+    try:
+        key = (
+            message.get("text"),
+            (message.get("intent") or {}).get("name"),
+            tuple((entity.get("entity"), entity.get("value"), entity.get("start")) for entity in entities),
+        )
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+async def prepare_batch(action_calls: List[Dict[str, Any]]) -> List[Optional[MessageAnalysis]]:
+    """Build the message analysis of every call, sharing them between identical messages.
+
+    The text parses the requested slots need are run for the whole batch in
+    one run_blocking call.
+    """
+    analyses: List[Optional[MessageAnalysis]] = []
+    shared: Dict[Tuple[Any, ...], MessageAnalysis] = {}
+    # 분석 id → (분석, 날짜/시간 필요, 수량 필요)
+    wanted: Dict[int, Tuple[MessageAnalysis, bool, bool]] = {}
+    for action_call in action_calls:
+        tracker = action_call.get("tracker") if isinstance(action_call, dict) else None
+        message = tracker.get("latest_message") if isinstance(tracker, dict) else None
+        if not isinstance(message, dict):
+            analyses.append(None)
+            continue
+
+        key = _analysis_key(message)
+        analysis = shared.get(key) if key is not None else None
+        if analysis is None:
+            analysis = build_message_analysis(message)
+            if key is not None:
+                shared[key] = analysis
+        else:
+            SHARED_ANALYSES.inc()
+        analyses.append(analysis)
+
+        requested_slot = (tracker.get("slots") or {}).get("requested_slot")
+        want_temporal, want_quantity = SLOT_TEXT_PARSES.get(requested_slot, (False, False))
+        if action_call.get("next_action") in _TEMPORAL_ACTIONS:
+            want_temporal = True
+        if want_temporal or want_quantity:
+            _, temporal, quantity = wanted.get(id(analysis), (analysis, False, False))
+            wanted[id(analysis)] = (analysis, temporal or want_temporal, quantity or want_quantity)
+
+    if wanted:
+        jobs = list(wanted.values())
+        parsed = await run_blocking(
+            parse_message_texts,
+            [(analysis.text, analysis.today, temporal, quantity) for analysis, temporal, quantity in jobs],
+        )
+        for (analysis, _, _), fields in zip(jobs, parsed):
+            analysis.preset(**fields)
+    return analyses
+
+
+class MicroBatcher:
+    """Group concurrent webhook calls and run them as one batch.
+
+    submit() queues a call and waits for its result. The first call of a
+    batch schedules a flush after window seconds (0: on the next event
+    loop iteration); a full batch is flushed at once.
+    """
+
+    def __init__(self, action_executor: Any, window: float = 0.0, max_batch: int = 64) -> None:
+        self.action_executor = action_executor
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        # 실행 중인 배치 — 이벤트 루프는 태스크를 약하게만 참조하므로 끝날 때까지 잡아 둠
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, action_call: Dict[str, Any]) -> Any:
+        """Run one action call as part of a batch; returns the executor result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((action_call, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            if self.window > 0:
+                self._timer = loop.call_later(self.window, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self.run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        BATCHES.inc()
+        BATCHED_REQUESTS.inc(len(batch))
+        try:
+            analyses = await prepare_batch([action_call for action_call, _ in batch])
+        except Exception:
+            # 준비가 실패해도 액션은 각자 분석을 만들어 실행할 수 있음
+            logger.exception("Failed to prepare a batch of %d webhook calls", len(batch))
+            analyses = [None] * len(batch)
+
+        tasks = []
+        for (action_call, _), analysis in zip(batch, analyses):
+            context = contextvars.copy_context()
+            if analysis is not None:
+                context.run(PRIMED_ANALYSIS.set, (action_call["tracker"]["latest_message"], analysis))
+            tasks.append(asyncio.get_running_loop().create_task(
+                self.action_executor.run(action_call), context=context
+            ))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def batcher_from_env(action_executor: Any) -> Optional[MicroBatcher]:
+    """MicroBatcher configured by ACTIONS_BATCH_*, or None when batching is off."""
+    max_batch = int(os.environ.get("ACTIONS_BATCH_SIZE", "64"))
+    if max_batch <= 1:
+        return None
+    window = float(os.environ.get("ACTIONS_BATCH_WINDOW_MS", "0")) / 1000.0
+    return MicroBatcher(action_executor, window=window, max_batch=max_batch)
+
+
+def install_webhook(
+    app: Any,
+    action_executor: Any,
+    batcher: Optional[MicroBatcher] = None,
+    decoder: Optional[PayloadDecoder] = None,
+) -> None:
+    """Serve POST /webhook of a rasa_sdk Sanic app with decoder and batcher.
+
+    Without a batcher each call runs on action_executor directly; without
+    a decoder bodies are decoded in full. The handler runs as request
+    middleware, so /health, /actions, CORS and the error status codes of
+    rasa_sdk stay as they are.
+    """
+    from sanic import response
+    from rasa_sdk import utils
+    from rasa_sdk.interfaces import ActionExecutionRejection, ActionMissingDomainException, ActionNotFoundException
+
+    def json_response(body: Any, status: int = 200) -> Any:
+        return response.raw(json_dumps(body), status=status, content_type="application/json")
+
+    run = batcher.submit if batcher is not None else action_executor.run
+
+    @app.on_request
+    async def webhook(request: Any) -> Any:
+        if request.method != "POST" or request.path != "/webhook":
+            return None
+        try:
+            action_call = decode_action_call(request.body, request.headers.get("Content-Encoding"), decoder)
+        except (ValueError, zlib.error):
+            action_call = None
+        if not isinstance(action_call, dict):
+            return json_response({"error": "Invalid body request"}, status=400)
+
+        utils.check_version_compatibility(action_call.get("version"))
+        try:
+            result = await run(action_call)
+        except ActionExecutionRejection as e:
+            logger.debug(e)
+            return json_response({"error": e.message, "action_name": e.action_name}, status=400)
+        except ActionNotFoundException as e:
+            logger.error(e)
+            return json_response({"error": e.message, "action_name": e.action_name}, status=404)
+        except ActionMissingDomainException as e:
+            logger.debug(e)
+            return json_response({"error": e.message, "action_name": e.action_name}, status=449)
+        return json_response(result.model_dump() if result else None)
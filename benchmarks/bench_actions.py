@@ -0,0 +1,251 @@
+"""Micro-benchmarks for the custom actions hot paths.
+
+Measures per-call latency (median over several rounds) and peak memory
+allocated per call for the Korean parsers, the form validators and the
+submit action. Results can be saved as a baseline and later runs checked
+against it:
+
+    python -m benchmarks.bench_actions --save benchmarks/baseline.json
+    python -m benchmarks.bench_actions --check benchmarks/baseline.json --threshold 25
+
+The check exits with status 1 when any benchmark is slower than the
+baseline by more than the threshold percentage. Everything runs offline.
+"""
+
+import argparse
+import atexit
+import asyncio
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from typing import Any, Callable, Dict, List, Tuple
+
+# 주문 저장은 임시 디렉터리로 보냄
+_STORE_DIR = tempfile.mkdtemp(prefix="bench-orders-")
+atexit.register(shutil.rmtree, _STORE_DIR, True)
+os.environ.setdefault("ORDER_STORE_BACKEND", "jsonl")
+os.environ.setdefault("ORDER_STORE_PATH", os.path.join(_STORE_DIR, "orders.jsonl"))
+
+from rasa_sdk.executor import CollectingDispatcher  # noqa: E402
+
+from actions import offload  # noqa: E402
+from actions.capacity import CapacityCalendar  # noqa: E402
+from actions.clock import FrozenClock, set_clock  # noqa: E402
+from actions.fuzzy_match import get_menu_matcher  # noqa: E402
+from actions.actions import (  # noqa: E402
+    ActionSubmitOrder,
+    ValidateOrderForm,
+    korean_number_to_int,
+    parse_korean_date,
+    parse_korean_time,
+)
+from actions.number_scanner import get_numeric_scanner  # noqa: E402
+from actions.numerals import parse_korean_numbers  # noqa: E402
+from actions.payload import PayloadDecoder  # noqa: E402
+from actions.temporal import _parse_cached, kst_today, normalize_expression  # noqa: E402
+
+from benchmarks import trackers  # noqa: E402
+from benchmarks.payloads import DOMAIN_PATH, _load_yaml, make_payload  # noqa: E402
+
+Benchmark = Tuple[str, Callable[[], Any]]
+
+
+def _cycle(values: List[Any]) -> Callable[[], Any]:
+    iterator = itertools.cycle(values)
+    return lambda: next(iterator)
+
+
+def build_benchmarks() -> List[Benchmark]:
+    """Return (name, callable) pairs; callables may return coroutines."""
+    form = ValidateOrderForm()
+    submit = ActionSubmitOrder()
+    today = kst_today().toordinal()
+
+    numbers = _cycle(["두", "스물하나", "열두", "백이십", "삼천오백", "12"])
+    times = _cycle(trackers.TIME_UTTERANCES)
+    dates = _cycle(trackers.DATE_UTTERANCES)
+    utterances = _cycle(trackers.QUANTITY_UTTERANCES + trackers.TIME_UTTERANCES + [trackers.SIDE_MENU_TEXT])
+    scan_numbers = get_numeric_scanner().scan
+    uncached = _cycle([normalize_expression(t) for t in trackers.TIME_UTTERANCES + trackers.DATE_UTTERANCES])
+    batch = ["두", "스물하나", "열두", "백이십", "삼천오백", "12"] * 10
+
+    quantity_trackers = _cycle([
+        trackers.make_tracker(text, "set_quantity") for text in trackers.QUANTITY_UTTERANCES
+    ])
+    side_tracker = trackers.side_menu_tracker()
+    delivery = _cycle([trackers.delivery_tracker(d, t) for d, t in zip(trackers.DATE_UTTERANCES, trackers.TIME_UTTERANCES)])
+    senders = itertools.count()
+    noisy_menus = _cycle(["프렌치디너", "프랜치 디너로 할게요", "잉글리쉬 디너", "샴페인축재 디너", "이탈리안 디너"])
+    match_menu = get_menu_matcher().match.__wrapped__
+
+    # 첫 6시간이 꽉 찬 하루
+    # 200턴 대화의 웹훅 본문 (Rasa처럼 json.dumps 기본 구분자)
+    long_body = json.dumps(make_payload(
+        "validate_order_form", "bench", "set_delivery_date", "내일 6시에 보내주세요", [],
+        slots={"requested_slot": "delivery_date"}, slot_events={"delivery_date": "내일"},
+        active_loop="order_form", domain=_load_yaml(DOMAIN_PATH), history=200,
+    )).encode("utf-8")
+    full_decoder = PayloadDecoder(slim=False)
+    slim_decoder = PayloadDecoder(sample_rate=0.0)
+
+    calendar = CapacityCalendar()
+    busy_day = date.fromordinal(today + 1).isoformat()
+    for slot in range(calendar.first_slot, calendar.first_slot + 12):
+        for i in range(calendar.max_orders_per_slot):
+            calendar.book(f"busy-{slot}-{i}", busy_day, calendar.slot_time(slot))
+
+    return [
+        ("korean_number_to_int", lambda: korean_number_to_int(numbers())),
+        ("parse_korean_numbers[60]", lambda: parse_korean_numbers(batch)),
+        ("parse_korean_time", lambda: parse_korean_time(times())),
+        ("parse_korean_date", lambda: parse_korean_date(dates())),
+        ("scan_numbers", lambda: scan_numbers(utterances())),
+        ("parse_temporal_uncached", lambda: _parse_cached.__wrapped__(uncached(), today)),
+        ("validate_menu_quantity", lambda: form.validate_menu_quantity(
+            None, CollectingDispatcher(), quantity_trackers(), trackers.DOMAIN)),
+        ("validate_side_menu_choice", lambda: form.validate_side_menu_choice(
+            "추가할게요", CollectingDispatcher(), side_tracker, trackers.DOMAIN)),
+        ("validate_delivery_date", lambda: form.validate_delivery_date(
+            None, CollectingDispatcher(), delivery(), trackers.DOMAIN)),
+        ("validate_delivery_time", lambda: form.validate_delivery_time(
+            None, CollectingDispatcher(), delivery(), trackers.DOMAIN)),
+        ("fuzzy_menu_match_uncached", lambda: match_menu(noisy_menus())),
+        ("decode_webhook_full[200 turns]", lambda: full_decoder.decode(long_body)),
+        ("decode_webhook_slim[200 turns]", lambda: slim_decoder.decode(long_body)),
+        ("capacity_next_free", lambda: calendar.next_free(busy_day, "11:30:00")),
+        ("action_submit_order", lambda: submit.run(
+            CollectingDispatcher(), trackers.submit_tracker(f"bench-{next(senders)}"), trackers.DOMAIN)),
+    ]
+
+
+def _maybe_await(loop: asyncio.AbstractEventLoop, result: Any) -> Any:
+    if asyncio.iscoroutine(result):
+        return loop.run_until_complete(result)
+    return result
+
+
+def measure(
+    func: Callable[[], Any],
+    loop: asyncio.AbstractEventLoop,
+    number: int,
+    rounds: int,
+) -> Dict[str, float]:
+    """Return median/min ns per call and peak bytes allocated per call."""
+    for _ in range(min(number, 100)):
+        _maybe_await(loop, func())
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            _maybe_await(loop, func())
+        per_call.append((time.perf_counter_ns() - start) / number)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _maybe_await(loop, func())
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ns": statistics.median(per_call),
+        "min_ns": min(per_call),
+        "alloc_peak_bytes": peak,
+    }
+
+
+def check_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Return a message for every benchmark slower than baseline by > threshold%.
+
+    Compares the fastest round, which is far less sensitive to noise from
+    other processes than the median.
+    """
+    failures = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = (result["min_ns"] - reference["min_ns"]) / reference["min_ns"] * 100
+        if change > threshold:
+            failures.append(
+                f"{name}: {result['min_ns']:.0f} ns vs baseline "
+                f"{reference['min_ns']:.0f} ns (+{change:.1f}%)"
+            )
+    return failures
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="calls per round")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--executor", default="inline", choices=offload.EXECUTOR_KINDS,
+                        help="executor for offloaded parsing (default: inline)")
+    parser.add_argument("--today", type=date.fromisoformat, default=date(2025, 1, 15), metavar="YYYY-MM-DD",
+                        help="KST day the clock is frozen at (default: 2025-01-15)")
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline JSON file")
+    parser.add_argument("--check", metavar="PATH", help="compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="allowed slowdown in percent for --check (default: 25)")
+    args = parser.parse_args(argv)
+
+    offload.configure_executor(args.executor)
+    # 날짜 해석 결과가 실행 시점에 따라 달라지지 않도록 시계를 고정
+    set_clock(FrozenClock.on(args.today))
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'benchmark':<28} {'median':>12} {'min':>12} {'alloc peak':>12}")
+    for name, func in build_benchmarks():
+        if args.filter and args.filter not in name:
+            continue
+        result = measure(func, loop, args.number, args.rounds)
+        results[name] = result
+        print(f"{name:<28} {result['median_ns'] / 1000:>9.2f} us {result['min_ns'] / 1000:>9.2f} us "
+              f"{result['alloc_peak_bytes']:>10} B")
+
+    loop.close()
+    offload.shutdown_executor()
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        failures = check_regressions(results, baseline, args.threshold)
+        if failures:
+            print(f"\nRegressions over {args.threshold:.0f}%:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0f}% against {args.check}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
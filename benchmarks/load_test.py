@@ -0,0 +1,229 @@
+"""Load generator for the custom actions /webhook endpoint.
+
+Replays webhook payloads (one JSON request per line, as captured from
+Rasa) or synthesizes them from data/stories.yml, and fires them at a
+running action server with an open-loop arrival rate:
+
+    rasa run actions --port 5055 &
+    python -m benchmarks.load_test --rate 200 --duration 30 --concurrency 64
+    python -m benchmarks.load_test --payloads captured.jsonl --rate 500
+
+Requests are scheduled at fixed (or Poisson) arrival times regardless of
+how fast the server answers, and latency is measured from the scheduled
+time, so a slow server shows up as queueing delay instead of silently
+lowering the offered load. Throughput, latency percentiles and error
+rates are reported per action name.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.payloads import StoryPayloadSynthesizer, load_payloads
+
+
+class HttpConnectionPool:
+    """Minimal keep-alive HTTP/1.1 POST client on asyncio streams."""
+
+    def __init__(self, url: str, size: int) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.path = parts.path or "/"
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def post(self, body: bytes) -> Tuple[int, bytes]:
+        connection = await self._idle.get()
+        try:
+            if connection is None:
+                connection = await self._open()
+            reader, writer = connection
+            writer.write(
+                f"POST {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("connection closed by server")
+            status = int(status_line.split()[1])
+            length = 0
+            keep_alive = True
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "content-length":
+                    length = int(value.strip())
+                elif name == "connection" and value.strip().lower() == "close":
+                    keep_alive = False
+            payload = await reader.readexactly(length) if length else b""
+            if not keep_alive:
+                writer.close()
+                connection = None
+            return status, payload
+        except Exception:
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            raise
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if connection is not None:
+                connection[1].close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Stats:
+    """Per-action latency samples and error counts."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_kinds: Dict[str, int] = defaultdict(int)
+
+    def record(self, action: str, latency: float, error: Optional[str]) -> None:
+        self.latencies[action].append(latency)
+        if error:
+            self.errors[action] += 1
+            self.error_kinds[error] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        rows = {}
+        for action in sorted(self.latencies):
+            samples = sorted(self.latencies[action])
+            rows[action] = {
+                "requests": len(samples),
+                "errors": self.errors[action],
+                "error_rate": self.errors[action] / len(samples),
+                "throughput_rps": len(samples) / elapsed,
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p90_ms": percentile(samples, 0.90) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+        return rows
+
+
+async def run_load(
+    url: str,
+    payloads: List[Dict[str, Any]],
+    rate: float,
+    duration: float,
+    concurrency: int,
+    poisson: bool,
+    seed: Optional[int] = None,
+) -> Tuple[Stats, float]:
+    pool = HttpConnectionPool(url, concurrency)
+    stats = Stats()
+    rng = random.Random(seed)
+    bodies = [(payload["next_action"], json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+              for payload in payloads]
+    loop = asyncio.get_running_loop()
+
+    async def fire(action: str, body: bytes, scheduled: float) -> None:
+        error = None
+        try:
+            status, _ = await pool.post(body)
+            if status >= 400:
+                error = f"HTTP {status}"
+        except Exception as exc:
+            error = type(exc).__name__
+        stats.record(action, loop.time() - scheduled, error)
+
+    tasks = []
+    start = loop.time()
+    scheduled = start
+    for action, body in itertools.cycle(bodies):
+        scheduled += rng.expovariate(rate) if poisson else 1.0 / rate
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(fire(action, body, scheduled)))
+
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+    await pool.close()
+    return stats, elapsed
+
+
+def print_report(rows: Dict[str, Dict[str, Any]], elapsed: float, error_kinds: Dict[str, int]) -> None:
+    header = f"{'action':<28} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    print(header)
+    print("-" * len(header))
+    for action, row in rows.items():
+        print(f"{action:<28} {row['requests']:>7} {row['throughput_rps']:>8.1f} "
+              f"{row['error_rate'] * 100:>5.1f}% {row['p50_ms']:>6.1f}ms {row['p90_ms']:>6.1f}ms "
+              f"{row['p99_ms']:>6.1f}ms {row['max_ms']:>6.1f}ms")
+    total = sum(row["requests"] for row in rows.values())
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    for kind, count in sorted(error_kinds.items()):
+        print(f"  {kind}: {count}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:5055/webhook")
+    parser.add_argument("--payloads", metavar="PATH",
+                        help="JSONL file of webhook payloads (default: synthesize from data/stories.yml)")
+    parser.add_argument("--synthesize", type=int, default=500, metavar="N",
+                        help="number of distinct payloads to synthesize (default: 500)")
+    parser.add_argument("--history", type=int, default=0, metavar="TURNS",
+                        help="earlier turns to add to each synthesized tracker (default: 0)")
+    parser.add_argument("--rate", type=float, default=100.0, help="requests per second to offer")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=32, help="maximum open connections")
+    parser.add_argument("--poisson", action="store_true", help="use Poisson instead of uniform arrivals")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.payloads:
+        payloads = list(load_payloads(args.payloads))
+    else:
+        payloads = list(StoryPayloadSynthesizer(seed=args.seed, history=args.history).generate(args.synthesize))
+    if not payloads:
+        print("No payloads to send", file=sys.stderr)
+        return 1
+
+    stats, elapsed = asyncio.run(run_load(
+        args.url, payloads, args.rate, args.duration, args.concurrency, args.poisson, args.seed
+    ))
+    rows = stats.report(elapsed)
+    print_report(rows, elapsed, stats.error_kinds)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_s": elapsed, "actions": rows}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+# 액션 서버 /webhook 요청 페이로드
+#
+# 캡처한 JSONL 페이로드를 읽거나, data/stories.yml의 스토리와 data/nlu.yml의
+# 예문으로 Rasa가 보내는 것과 같은 형태의 요청을 만들어냅니다.
+
+import json
+import os
+import random
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ruamel.yaml import YAML
+
+from benchmarks.trackers import COMPLETED_ORDER_SLOTS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORIES_PATH = os.path.join(REPO_ROOT, "data", "stories.yml")
+RULES_PATH = os.path.join(REPO_ROOT, "data", "rules.yml")
+NLU_PATH = os.path.join(REPO_ROOT, "data", "nlu.yml")
+DOMAIN_PATH = os.path.join(REPO_ROOT, "domain.yml")
+
+RASA_VERSION = "3.10.0"
+
+_ANNOTATION_RE = re.compile(r"\[([^\]]+)\]\((\w+)\)")
+
+# 폼 슬롯별로 사용자가 답할 때의 인텐트
+FORM_SLOT_INTENTS = {
+    "menu_name": "select_menu",
+    "menu_quantity": "set_quantity",
+    "serving_style": "set_serving_style",
+    "side_menu_choice": "select_side_menu",
+    "delivery_date": "set_delivery_date",
+    "delivery_time": "set_delivery_date",
+    "order_confirmation": "deny",
+}
+
+
+def _load_yaml(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return YAML(typ="safe").load(f) or {}
+
+
+def parse_example(example: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """Turn '[두](menu_quantity)개 주세요' into text plus entity dicts."""
+    text_parts = []
+    entities = []
+    position = 0
+    length = 0
+    for match in _ANNOTATION_RE.finditer(example):
+        prefix = example[position:match.start()]
+        text_parts.append(prefix)
+        length += len(prefix)
+        value, name = match.group(1), match.group(2)
+        entities.append({"entity": name, "value": value, "start": length, "end": length + len(value)})
+        text_parts.append(value)
+        length += len(value)
+        position = match.end()
+    text_parts.append(example[position:])
+    return "".join(text_parts), entities
+
+
+def load_nlu_examples(path: str = NLU_PATH) -> Dict[str, List[Tuple[str, List[Dict[str, Any]]]]]:
+    """Return intent → [(text, entities)] from the NLU training data."""
+    examples: Dict[str, List[Tuple[str, List[Dict[str, Any]]]]] = {}
+    for block in _load_yaml(path).get("nlu", []):
+        if "intent" not in block:
+            continue
+        lines = [line[2:].strip() for line in block["examples"].splitlines() if line.startswith("- ")]
+        examples[block["intent"]] = [parse_example(line) for line in lines]
+    return examples
+
+
+def load_payloads(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield webhook payloads from a JSONL file, one request per line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                payload = json.loads(line)
+                if "next_action" in payload and "tracker" in payload:
+                    yield payload
+
+
+def history_events(turns: int) -> List[Dict[str, Any]]:
+    """Tracker events of that many earlier order form turns, as Rasa keeps them."""
+    events: List[Dict[str, Any]] = []
+    for turn in range(turns):
+        timestamp = 1700000000.0 + turn
+        text = f"프렌치 디너 {turn % 9 + 1}개 주세요"
+        events.extend([
+            {"event": "action", "timestamp": timestamp, "name": "action_listen", "policy": None, "confidence": None},
+            {"event": "user", "timestamp": timestamp, "text": text, "input_channel": "rest",
+             "message_id": f"history-{turn}", "metadata": {},
+             "parse_data": {
+                 "text": text,
+                 "intent": {"name": "select_menu", "confidence": 0.99},
+                 "entities": [{"entity": "menu_name", "value": "프렌치 디너", "start": 0, "end": 6,
+                               "extractor": "RegexEntityExtractor"}],
+                 "intent_ranking": [{"name": "select_menu", "confidence": 0.99},
+                                    {"name": "set_quantity", "confidence": 0.01}],
+             }},
+            {"event": "user_featurization", "timestamp": timestamp, "use_text_for_featurization": False},
+            {"event": "action", "timestamp": timestamp, "name": "order_form", "policy": "RulePolicy",
+             "confidence": 1.0},
+            {"event": "slot", "timestamp": timestamp, "name": "menu_name", "value": "프렌치 디너"},
+            {"event": "bot", "timestamp": timestamp, "text": "몇 개 주문하시겠어요?", "data": {},
+             "metadata": {"utter_action": "utter_ask_menu_quantity"}},
+        ])
+    return events
+
+
+def make_payload(
+    action_name: str,
+    sender_id: str,
+    intent: str,
+    text: str,
+    entities: List[Dict[str, Any]],
+    slots: Optional[Dict[str, Any]] = None,
+    slot_events: Optional[Dict[str, Any]] = None,
+    active_loop: Optional[str] = None,
+    domain: Optional[Dict[str, Any]] = None,
+    history: int = 0,
+) -> Dict[str, Any]:
+    """Build a webhook request body the way Rasa sends it.
+
+    history adds that many earlier turns to the tracker events.
+    """
+    events: List[Dict[str, Any]] = [
+        {"event": "action", "name": "action_session_start"},
+        *history_events(history),
+        {"event": "user", "text": text, "parse_data": {"intent": {"name": intent}, "entities": entities}},
+    ]
+    events.extend({"event": "slot", "name": name, "value": value} for name, value in (slot_events or {}).items())
+    return {
+        "next_action": action_name,
+        "sender_id": sender_id,
+        "tracker": {
+            "sender_id": sender_id,
+            "slots": {**(slots or {}), **(slot_events or {})},
+            "latest_message": {
+                "text": text,
+                "intent": {"name": intent, "confidence": 1.0},
+                "entities": entities,
+            },
+            "latest_event_time": 0,
+            "followup_action": None,
+            "paused": False,
+            "events": events,
+            "latest_input_channel": "rest",
+            "active_loop": {"name": active_loop} if active_loop else {},
+            "latest_action_name": "action_listen",
+        },
+        "domain": domain or {},
+        "version": RASA_VERSION,
+    }
+
+
+class StoryPayloadSynthesizer:
+    """Generate webhook payloads for the custom actions used in stories/rules."""
+
+    def __init__(
+        self,
+        stories_path: str = STORIES_PATH,
+        rules_path: str = RULES_PATH,
+        nlu_path: str = NLU_PATH,
+        domain_path: str = DOMAIN_PATH,
+        seed: Optional[int] = None,
+        history: int = 0,
+    ) -> None:
+        self.domain = _load_yaml(domain_path)
+        self.history = history
+        self.examples = load_nlu_examples(nlu_path)
+        self.random = random.Random(seed)
+        self.form_slots = {
+            name: form.get("required_slots", [])
+            for name, form in (self.domain.get("forms") or {}).items()
+        }
+        custom_actions = set(self.domain.get("actions", []))
+
+        # 스토리/룰마다 호출되는 커스텀 액션을 (액션 이름, 직전 인텐트) 순서로 정리
+        self.flows: List[List[Tuple[str, str]]] = []
+        for path, key in ((stories_path, "stories"), (rules_path, "rules")):
+            for story in _load_yaml(path).get(key, []):
+                flow = []
+                intent = None
+                for step in story.get("steps", []):
+                    if "intent" in step:
+                        intent = step["intent"]
+                    action = step.get("action")
+                    if action in self.form_slots:
+                        flow.append((f"validate_{action}", intent))
+                    elif action in custom_actions:
+                        flow.append((action, intent))
+                if flow:
+                    self.flows.append(flow)
+
+    def _example(self, intent: str) -> Tuple[str, List[Dict[str, Any]]]:
+        candidates = self.examples.get(intent) or [("", [])]
+        return self.random.choice(candidates)
+
+    def payload_for(self, action_name: str, intent: Optional[str], sender_id: str) -> Dict[str, Any]:
+        if action_name.startswith("validate_"):
+            form = action_name[len("validate_"):]
+            slot = self.random.choice(self.form_slots[form])
+            intent = FORM_SLOT_INTENTS.get(slot, intent or "")
+            text, entities = self._example(intent)
+            value = entities[0]["value"] if entities else text
+            return make_payload(
+                action_name, sender_id, intent, text, entities,
+                slots={"requested_slot": slot},
+                slot_events={slot: value},
+                active_loop=form,
+                domain=self.domain,
+                history=self.history,
+            )
+
+        if action_name == "action_submit_order":
+            text, entities = self._example("deny")
+            return make_payload(action_name, sender_id, "deny", text, entities,
+                                slots=dict(COMPLETED_ORDER_SLOTS), domain=self.domain, history=self.history)
+
+        text, entities = self._example(intent or "")
+        slots = {entity["entity"]: entity["value"] for entity in entities}
+        return make_payload(action_name, sender_id, intent or "", text, entities,
+                            slots=slots, domain=self.domain, history=self.history)
+
+    def generate(self, count: int) -> Iterator[Dict[str, Any]]:
+        """Yield count payloads, walking the flows as separate conversations."""
+        produced = 0
+        conversation = 0
+        while produced < count:
+            flow = self.random.choice(self.flows)
+            sender_id = f"load-{conversation}"
+            conversation += 1
+            for action_name, intent in flow:
+                if produced >= count:
+                    return
+                yield self.payload_for(action_name, intent, sender_id)
+                produced += 1
@@ -0,0 +1,656 @@
+"""In-process replay of the conversations in data/stories.yml and data/rules.yml.
+
+Turns every story and rule flow that reaches a custom action into
+conversations of synthetic trackers and runs the actions on them
+directly, with no HTTP server and no trained model:
+
+    python -m benchmarks.replay --conversations 5000
+    python -m benchmarks.replay --conversations 20000 --jobs 8 --seed 3 --json
+
+Order conversations walk the order form one requested slot at a time
+with generated answers (numerals, menu and style spellings, dates and
+times, side menu combinations and occasional invalid answers), run
+validate_order_form for every turn and action_submit_order at the end,
+and check the slot events and quoted total against values worked out
+from catalogue.yml. Reorder conversations place an order, ask for "the
+same as last time" and finish the form from the cached order.
+Conversations are split across worker processes,
+each with its own order store and therefore its own delivery capacity.
+The report gives throughput and per-step latency; the exit status is 1
+when any check failed.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.payloads import StoryPayloadSynthesizer
+
+# 한국어 수사와 기대값
+QUANTITY_WORDS = [
+    ("한", 1), ("두", 2), ("세", 3), ("네", 4), ("다섯", 5),
+    ("열", 10), ("열두", 12), ("스물하나", 21), ("3", 3), ("12", 12),
+]
+QUANTITY_TEMPLATES = ["{}개 주세요", "{} 개 주문할래요", "{}개요"]
+
+# 시간 표현과 기대값 ("오전"은 아직 오후로 풀리므로 넣지 않음)
+TIME_VARIANTS = [
+    ("6시", "18:00:00"), ("7시 30분", "19:30:00"), ("여덟시 삼십분", "20:30:00"),
+    ("일곱 시", "19:00:00"), ("저녁 6시", "18:00:00"), ("여섯시 사십오분", "18:45:00"),
+    ("오후 2시", "14:00:00"), ("12시", "12:00:00"), ("1시", "13:00:00"),
+]
+# 수용량 때문에 한 번 거절된 사용자가 고르는 시간: 12시~21시 30분의 모든 시간대
+ANY_TIME_VARIANTS = [
+    (f"{hour}시 {minute}분" if minute else f"{hour}시", f"{hour:02d}:{minute:02d}:00")
+    for hour in range(12, 22) for minute in (0, 30)
+]
+WEEKDAYS = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+# 잘못된 답변과 그때 기대하는 결과 (슬롯이 비워짐)
+INVALID_ANSWERS = {
+    "menu_name": ("select_menu", "피자 주세요", [("menu_name", "피자")]),
+    "menu_quantity": ("set_quantity", "백오십개 주세요", [("menu_quantity", "백오십")]),
+    "serving_style": ("set_serving_style", "보통 스타일로 할게요", [("serving_style", "보통 스타일")]),
+    "delivery_date": ("set_delivery_date", "언젠가 보내주세요", []),
+    "delivery_time": ("set_delivery_date", "아무 때나요", []),
+}
+
+# 엔티티 → 폼 슬롯 (domain.yml의 from_entity 매핑)
+ENTITY_SLOTS = {
+    "menu_name": "menu_name",
+    "menu_quantity": "menu_quantity",
+    "serving_style": "serving_style",
+    "date": "delivery_date",
+    "time": "delivery_time",
+}
+
+ORDER_SLOTS = [
+    "menu_name", "menu_quantity", "serving_style", "side_name",
+    "side_quantity", "side_unit", "delivery_date", "delivery_time",
+]
+
+MAX_TURNS = 30
+MAX_REPORTED_FAILURES = 20
+
+Entities = List[Dict[str, Any]]
+
+
+class Order(NamedTuple):
+    """A submitted order: the form slots and the values the total is checked against."""
+
+    slots: Dict[str, Any]
+    menu: str
+    quantity: int
+    style: str
+    sides: List[Tuple[str, str, int]]
+
+
+def _entities(text: str, spans: List[Tuple[str, str]]) -> Entities:
+    entities = []
+    position = 0
+    for name, value in spans:
+        start = text.index(value, position)
+        entities.append({"entity": name, "value": value, "start": start, "end": start + len(value)})
+        position = start + len(value)
+    return entities
+
+
+class Turn:
+    """One user message and the slot values the form should end up with."""
+
+    __slots__ = ("intent", "text", "entities", "candidates", "expected")
+
+    def __init__(
+        self,
+        intent: str,
+        text: str,
+        spans: List[Tuple[str, str]],
+        expected: Dict[str, Any],
+        candidates: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.intent = intent
+        self.text = text
+        self.entities = _entities(text, spans)
+        # Rasa가 매핑으로 채워서 검증에 넘기는 슬롯 후보
+        self.candidates = {ENTITY_SLOTS[e["entity"]]: e["value"] for e in self.entities if e["entity"] in ENTITY_SLOTS}
+        self.candidates.update(candidates or {})
+        self.expected = expected
+
+
+class Scenario:
+    """Answer generators and expected values for one worker."""
+
+    def __init__(self, today: date, invalid_rate: float) -> None:
+        from actions.catalogue import read_catalogue
+
+        synthesizer = StoryPayloadSynthesizer(seed=0)
+        self.domain = synthesizer.domain
+        self.examples = synthesizer.examples
+        self.today = today
+        self.invalid_rate = invalid_rate
+
+        # 폼을 거치는 흐름은 주문 대화로, 나머지는 추천 대화로 재생
+        self.flows: List[Tuple[str, Optional[str]]] = []
+        for flow in synthesizer.flows:
+            actions = [action for action, _ in flow]
+            if "action_reorder_last_order" in actions:
+                self.flows.append(("reorder", flow[actions.index("action_reorder_last_order")][1]))
+            elif "validate_order_form" in actions:
+                intent = flow[actions.index("validate_order_form")][1]
+                self.flows.append(("order", intent))
+            elif "action_menu_recommendation" in actions:
+                self.flows.append(("recommendation", flow[actions.index("action_menu_recommendation")][1]))
+
+        catalogue = read_catalogue()
+        self.menu_prices: Dict[str, int] = {}
+        self.menu_forms: List[Tuple[str, str]] = []
+        for menu in catalogue["menus"].values():
+            self.menu_prices[menu["name"]] = int(menu["price"])
+            for form in (menu["name"], menu["name"].replace(" ", ""), *menu.get("aliases", [])):
+                self.menu_forms.append((form, menu["name"]))
+        self.style_surcharges: Dict[str, int] = {}
+        self.style_forms: List[Tuple[str, str]] = []
+        for style in catalogue["serving_styles"].values():
+            self.style_surcharges[style["name"]] = int(style.get("surcharge", 0))
+            for form in (style["name"], style["name"].replace(" ", ""), *style.get("aliases", [])):
+                self.style_forms.append((form, style["name"]))
+
+        sides = catalogue["sides"]
+        self.side_prices = sides["prices"]
+        self.side_display = {
+            (name, unit): display
+            for name, units in (sides.get("display_names") or {}).items()
+            for unit, display in units.items()
+        }
+
+    # 슬롯별 답변 생성
+
+    def invalid_turn(self, rng: random.Random, slot: str, tried: set) -> Optional[Turn]:
+        """Sometimes return a wrong answer for slot, at most once per conversation."""
+        if slot in INVALID_ANSWERS and slot not in tried and rng.random() < self.invalid_rate:
+            tried.add(slot)
+            intent, text, spans = INVALID_ANSWERS[slot]
+            return Turn(intent, text, spans, {slot: None}, {slot: text} if not spans else None)
+        return None
+
+    def menu_turn(self, rng: random.Random, intent: str = "select_menu") -> Tuple[Turn, str]:
+        form, name = rng.choice(self.menu_forms)
+        text = rng.choice(["{} 주문할래요", "{}로 주세요", "{} 먹고 싶어요"]).format(form)
+        return Turn(intent, text, [("menu_name", form)], {"menu_name": name}), name
+
+    def quantity_turn(self, rng: random.Random) -> Tuple[Turn, int]:
+        word, number = rng.choice(QUANTITY_WORDS)
+        text = rng.choice(QUANTITY_TEMPLATES).format(word)
+        # 가끔 엔티티 없이 문장에서 수량을 찾게 함
+        if rng.random() < 0.3:
+            return Turn("set_quantity", text, [], {"menu_quantity": str(number)}, {"menu_quantity": text}), number
+        return Turn("set_quantity", text, [("menu_quantity", word)], {"menu_quantity": str(number)}), number
+
+    def style_turn(self, rng: random.Random) -> Tuple[Turn, str]:
+        form, name = rng.choice(self.style_forms)
+        text = rng.choice(["{}로 할게요", "{} 주세요", "{}이 좋겠어요"]).format(form)
+        return Turn("set_serving_style", text, [("serving_style", form)], {"serving_style": name}), name
+
+    def side_turn(self, rng: random.Random) -> Tuple[Turn, List[Tuple[str, str, int]]]:
+        if rng.random() < 0.3:
+            text = rng.choice(["아니요 괜찮아요", "사이드는 필요없어요"])
+            expected = {"side_menu_choice": "no", "side_name": None, "side_quantity": None, "side_unit": None}
+            return Turn("deny", text, [], expected, {"side_menu_choice": text}), []
+
+        items = []
+        parts = []
+        spans = []
+        for name in rng.sample(sorted(self.side_prices), rng.randint(1, 3)):
+            unit = rng.choice(sorted(self.side_prices[name]))
+            word, number = rng.choice(QUANTITY_WORDS[:6])
+            items.append((name, unit, number))
+            parts.append(f"{name} {word}{unit}")
+            spans += [("side_name", name), ("side_quantity", word), ("side_unit", unit)]
+        text = "이랑 ".join(parts) + " 추가할게요"
+        expected = {
+            "side_menu_choice": "yes",
+            "side_name": [self.side_display.get((name, unit), name) for name, unit, _ in items],
+            "side_quantity": [str(number) for _, _, number in items],
+            "side_unit": [unit for _, unit, _ in items],
+        }
+        return Turn("select_side_menu", text, spans, expected, {"side_menu_choice": text}), items
+
+    def date_choice(self, rng: random.Random, far: bool = False) -> Tuple[str, str]:
+        kind = 3 if far else rng.randrange(4)
+        if kind == 0:
+            return "내일", (self.today + timedelta(days=1)).isoformat()
+        if kind == 1:
+            return "모레", (self.today + timedelta(days=2)).isoformat()
+        if kind == 2:
+            weekday = rng.randrange(7)
+            monday = self.today + timedelta(days=7 - self.today.weekday())
+            return f"다음주 {WEEKDAYS[weekday]}", (monday + timedelta(days=weekday)).isoformat()
+        day = self.today + timedelta(days=rng.randint(1, 180))
+        return f"{day.month}월 {day.day}일", day.isoformat()
+
+    def delivery_turn(self, rng: random.Random, slot: str, with_date: bool = False, flexible: bool = False) -> Turn:
+        """Answer for delivery_date or delivery_time.
+
+        A flexible user, already turned away once for capacity, picks any
+        afternoon slot and a date further out.
+        """
+        time_text, time_value = rng.choice(ANY_TIME_VARIANTS if flexible else TIME_VARIANTS)
+        if slot == "delivery_time" and not with_date:
+            return Turn("set_delivery_date", f"{time_text}에 보내주세요", [("time", time_text)],
+                        {"delivery_time": time_value})
+        date_text, date_value = self.date_choice(rng, far=flexible)
+        if not with_date and rng.random() < 0.5:
+            return Turn("set_delivery_date", f"{date_text}에 배송해주세요", [("date", date_text)],
+                        {"delivery_date": date_value})
+        text = f"{date_text} {time_text}에 배송해주세요"
+        return Turn("set_delivery_date", text, [("date", date_text), ("time", time_text)],
+                    {"delivery_date": date_value, "delivery_time": time_value})
+
+    def accept_suggestion(self, suggestion: Tuple[str, str], date_kept: bool) -> Optional[Turn]:
+        """Answer with the slot the bot suggested, when the parsers can express it."""
+        day, time_value = suggestion
+        hour, minute = int(time_value[:2]), int(time_value[3:5])
+        # 시간 파서는 "오전"을 아직 모르므로 12시 이전 시간은 말할 수 없음
+        if hour < 12:
+            return None
+        time_text = f"{hour}시 {minute}분" if minute else f"{hour}시"
+        if date_kept:
+            return Turn("set_delivery_date", f"{time_text}로 할게요", [("time", time_text)],
+                        {"delivery_time": time_value})
+        date_text = f"{int(day[5:7])}월 {int(day[8:10])}일"
+        text = f"{date_text} {time_text}로 할게요"
+        return Turn("set_delivery_date", text, [("date", date_text), ("time", time_text)],
+                    {"delivery_date": day, "delivery_time": time_value})
+
+    def expected_total(self, menu: str, quantity: int, style: str, sides: List[Tuple[str, str, int]]) -> int:
+        total = (self.menu_prices[menu] + self.style_surcharges[style]) * quantity
+        return total + sum(self.side_prices[name][unit] * number for name, unit, number in sides)
+
+
+def _apply_capacity(
+    expected: Dict[str, Any], state: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Optional[Tuple[str, str]]]:
+    """Adjust a delivery answer for slots already full in this process.
+
+    Returns the expected slots and the slot the bot will suggest, if any.
+    """
+    from actions.capacity import get_capacity_calendar
+
+    delivery_date = expected.get("delivery_date", state.get("delivery_date"))
+    delivery_time = expected.get("delivery_time", state.get("delivery_time"))
+    if not delivery_date:
+        return expected, None
+    calendar = get_capacity_calendar()
+    if delivery_time:
+        if not calendar.is_full(delivery_date, delivery_time):
+            return expected, None
+    elif not calendar.is_day_full(delivery_date):
+        return expected, None
+    alternative = calendar.next_free(delivery_date, delivery_time)
+    if alternative is not None and alternative[0] == delivery_date:
+        return {**expected, "delivery_time": None}, alternative
+    return {**expected, "delivery_date": None, "delivery_time": None}, alternative
+
+
+class Replayer:
+    """Run generated conversations against the actions in this process."""
+
+    def __init__(self, scenario: Scenario) -> None:
+        from actions.actions import ActionRecommendMenu, ActionReorderLastOrder, ActionSubmitOrder, ValidateOrderForm
+
+        self.scenario = scenario
+        self.form = ValidateOrderForm()
+        self.submit = ActionSubmitOrder()
+        self.reorder_last = ActionReorderLastOrder()
+        self.recommend = ActionRecommendMenu()
+        self.timings: Dict[str, List[int]] = {}
+        self.failures: List[Dict[str, Any]] = []
+        self.failure_count = 0
+        self.turns = 0
+        self.required_slots: List[str] = []
+
+    def _fail(self, sender_id: str, step: str, problem: str, **details: Any) -> None:
+        self.failure_count += 1
+        if len(self.failures) < MAX_REPORTED_FAILURES:
+            self.failures.append({"sender_id": sender_id, "step": step, "problem": problem, **details})
+
+    async def _run(self, step: str, action: Any, tracker: Any) -> Tuple[List[Dict[str, Any]], Any]:
+        from rasa_sdk.executor import CollectingDispatcher
+
+        dispatcher = CollectingDispatcher()
+        started = time.perf_counter_ns()
+        events = action.run(dispatcher, tracker, self.scenario.domain)
+        if inspect.isawaitable(events):
+            events = await events
+        self.timings.setdefault(step, []).append(time.perf_counter_ns() - started)
+        self.turns += 1
+        return events, dispatcher
+
+    def _tracker(self, sender_id: str, turn: Turn, slots: Dict[str, Any], active_loop: Optional[str]) -> Any:
+        from rasa_sdk import Tracker
+
+        latest_message = {
+            "text": turn.text,
+            "intent": {"name": turn.intent, "confidence": 1.0},
+            "entities": turn.entities,
+        }
+        events = [
+            {"event": "action", "name": "action_listen"},
+            {"event": "user", "text": turn.text, "parse_data": latest_message},
+        ]
+        events.extend({"event": "slot", "name": name, "value": value} for name, value in turn.candidates.items())
+        return Tracker(sender_id, {**slots, **turn.candidates}, latest_message, events, False, None,
+                       {"name": active_loop} if active_loop else {}, "action_listen")
+
+    async def _empty_state(self) -> Dict[str, Any]:
+        if not self.required_slots:
+            from rasa_sdk.executor import CollectingDispatcher
+
+            self.required_slots = await self.form.required_slots([], CollectingDispatcher(), None, self.scenario.domain)
+        return {slot: None for slot in self.required_slots + ORDER_SLOTS}
+
+    async def order(self, rng: random.Random, sender_id: str, intent: Optional[str]) -> Optional[Order]:
+        scenario = self.scenario
+        state = await self._empty_state()
+        menu = None
+
+        # 폼을 여는 메시지: select_menu면 메뉴가 함께 들어옴
+        if intent == "select_menu":
+            turn, menu = scenario.menu_turn(rng)
+        else:
+            text, spans = rng.choice(scenario.examples.get("menu_order") or [("주문할게요", [])])
+            turn = Turn("menu_order", text, [], {})
+        return await self._complete_order(rng, sender_id, state, turn, "validate_order_form[activate]", menu=menu)
+
+    async def _complete_order(
+        self,
+        rng: random.Random,
+        sender_id: str,
+        state: Dict[str, Any],
+        turn: Turn,
+        step: str,
+        menu: Optional[str] = None,
+        quantity: int = 1,
+        style: Optional[str] = None,
+        sides: Optional[List[Tuple[str, str, int]]] = None,
+    ) -> Optional[Order]:
+        """Answer the form from turn onwards, submit, and check the total.
+
+        Returns the submitted order, or None when a check failed.
+        """
+        scenario = self.scenario
+        sides = sides or []
+        tried: set = set()
+        # 수용량 때문에 거절됐을 때 봇이 제안한 (날짜, 시간)
+        suggestion: Optional[Tuple[str, str]] = None
+        capacity_rejected = False
+
+        for _ in range(MAX_TURNS):
+            events, dispatcher = await self._run(step, self.form, self._tracker(sender_id, turn, state, "order_form"))
+            for event in events:
+                if event.get("event") == "slot":
+                    state[event["name"]] = event["value"]
+            for slot, value in turn.expected.items():
+                if state.get(slot) != value:
+                    self._fail(sender_id, step, "slot mismatch", text=turn.text, slot=slot,
+                               expected=value, actual=state.get(slot),
+                               messages=[m.get("text") for m in dispatcher.messages])
+                    return None
+            # 폼 슬롯을 비우는 건 다시 묻는 것이므로 이유를 알려야 함
+            rejected = any(turn.expected[slot] is None for slot in turn.expected if slot in self.required_slots)
+            if rejected and not dispatcher.messages:
+                self._fail(sender_id, step, "rejected without a message", text=turn.text)
+                return None
+
+            requested = next((slot for slot in self.required_slots if state.get(slot) is None), None)
+            if requested is None:
+                break
+            step = f"validate_order_form[{requested}]"
+
+            turn = scenario.invalid_turn(rng, requested, tried)
+            if turn is None:
+                if requested == "menu_name":
+                    turn, menu = scenario.menu_turn(rng)
+                elif requested == "menu_quantity":
+                    turn, quantity = scenario.quantity_turn(rng)
+                elif requested == "serving_style":
+                    turn, style = scenario.style_turn(rng)
+                elif requested == "side_menu_choice":
+                    turn, sides = scenario.side_turn(rng)
+                elif requested in ("delivery_date", "delivery_time"):
+                    # 사용자는 제안을 받아들이고, 말할 수 없는 제안이면 날짜를 바꿈
+                    if suggestion is not None:
+                        turn = scenario.accept_suggestion(suggestion, date_kept=state.get("delivery_date") is not None)
+                    if turn is None:
+                        turn = scenario.delivery_turn(rng, requested, with_date=suggestion is not None,
+                                                      flexible=capacity_rejected)
+                else:
+                    turn = Turn("deny", "아니요", [], {requested: True}, {requested: False})
+            if requested in ("delivery_date", "delivery_time"):
+                turn.expected, suggestion = _apply_capacity(turn.expected, state)
+                capacity_rejected = capacity_rejected or suggestion is not None
+        else:
+            self._fail(sender_id, step, f"form not complete after {MAX_TURNS} turns",
+                       missing=[slot for slot in self.required_slots if state.get(slot) is None])
+            return None
+
+        menu = state["menu_name"] if menu is None else menu
+        style = state["serving_style"] if style is None else style
+        submitted = dict(state)
+        submit_turn = Turn("deny", "아니요", [], {})
+        events, dispatcher = await self._run(
+            "action_submit_order", self.submit, self._tracker(sender_id, submit_turn, state, None))
+        reset = {event["name"]: event["value"] for event in events if event.get("event") == "slot"}
+        if any(reset.get(slot, "missing") is not None for slot in ORDER_SLOTS):
+            self._fail(sender_id, "action_submit_order", "order slots not reset", events=events)
+            return None
+        order_data = (dispatcher.messages[0].get("custom") or {}).get("order_data", {}) if dispatcher.messages else {}
+        expected_total = scenario.expected_total(menu, quantity, style, sides)
+        if order_data.get("total_price") != expected_total or order_data.get("unpriced"):
+            self._fail(sender_id, "action_submit_order", "total mismatch", expected=expected_total,
+                       actual=order_data.get("total_price"), unpriced=order_data.get("unpriced"))
+            return None
+        return Order(submitted, menu, quantity, style, sides)
+
+    async def reorder(self, rng: random.Random, sender_id: str, intent: Optional[str]) -> None:
+        first = await self.order(rng, sender_id, "menu_order")
+        if first is None:
+            return
+
+        # 재주문 메시지의 날짜/시간은 액션이 문장에서 직접 읽음 (폼 밖이라 슬롯 매핑 없음)
+        text, _ = rng.choice(self.scenario.examples.get(intent or "reorder") or [("지난번이랑 똑같이 주문해주세요", [])])
+        state = await self._empty_state()
+        turn = Turn(intent or "reorder", text, [], {})
+        events, dispatcher = await self._run(
+            "action_reorder_last_order", self.reorder_last, self._tracker(sender_id, turn, state, None))
+        reordered = {event["name"]: event["value"] for event in events if event.get("event") == "slot"}
+        kept = ("menu_name", "menu_quantity", "serving_style", "side_name", "side_quantity", "side_unit")
+        mismatched = {slot: reordered.get(slot) for slot in kept if reordered.get(slot) != first.slots[slot]}
+        if mismatched or not dispatcher.messages:
+            self._fail(sender_id, "action_reorder_last_order", "last order not restored", text=text,
+                       expected={slot: first.slots[slot] for slot in mismatched}, actual=mismatched)
+            return
+        state.update(reordered)
+
+        # Rasa는 액션이 설정한 슬롯을 폼 검증에 다시 넘기지만, 캐시에 있는 값이라 그대로 유지돼야 함
+        activate = Turn(
+            intent or "reorder", text, [],
+            {slot: first.slots[slot] for slot in ("menu_name", "menu_quantity", "serving_style")},
+            candidates={slot: value for slot, value in reordered.items() if value is not None},
+        )
+        await self._complete_order(rng, sender_id, state, activate, "validate_order_form[reorder]",
+                                   menu=first.menu, quantity=first.quantity, style=first.style, sides=first.sides)
+
+    async def recommendation(self, rng: random.Random, sender_id: str, intent: Optional[str]) -> None:
+        text, entities = rng.choice(self.scenario.examples.get(intent or "give_occasion") or [("", [])])
+        turn = Turn(intent or "give_occasion", text, [(e["entity"], e["value"]) for e in entities], {})
+        slots = {e["entity"]: e["value"] for e in turn.entities}
+        events, dispatcher = await self._run(
+            "action_menu_recommendation", self.recommend, self._tracker(sender_id, turn, slots, None))
+        if events or len(dispatcher.messages) != 1 or not dispatcher.messages[0].get("text"):
+            self._fail(sender_id, "action_menu_recommendation", "expected one message and no events",
+                       text=text, events=events, messages=dispatcher.messages)
+
+    async def replay(self, seed: int, first: int, count: int) -> None:
+        for number in range(first, first + count):
+            rng = random.Random(seed * 1_000_003 + number)
+            kind, intent = rng.choice(self.scenario.flows)
+            sender_id = f"replay-{seed}-{number}"
+            if kind == "order":
+                await self.order(rng, sender_id, intent)
+            elif kind == "reorder":
+                await self.reorder(rng, sender_id, intent)
+            else:
+                await self.recommendation(rng, sender_id, intent)
+
+    def result(self, conversations: int) -> Dict[str, Any]:
+        return {
+            "conversations": conversations,
+            "turns": self.turns,
+            "failure_count": self.failure_count,
+            "failures": self.failures,
+            "timings": self.timings,
+        }
+
+
+_REPLAYER: Optional[Replayer] = None
+
+
+def _init_worker(today: str, store_dir: str, invalid_rate: float) -> None:
+    """Give the process its own order store and clock, then build the scenario."""
+    global _REPLAYER
+    os.environ["ORDER_STORE_BACKEND"] = "jsonl"
+    os.environ["ORDER_STORE_PATH"] = os.path.join(store_dir, f"orders-{os.getpid()}.jsonl")
+
+    from actions.clock import FrozenClock, set_clock
+
+    day = date.fromisoformat(today)
+    set_clock(FrozenClock.on(day))
+    _REPLAYER = Replayer(Scenario(day, invalid_rate))
+
+
+def _run_chunk(job: Tuple[int, int, int]) -> Dict[str, Any]:
+    seed, first, count = job
+    replayer = _REPLAYER
+    replayer.timings, replayer.failures, replayer.failure_count, replayer.turns = {}, [], 0, 0
+    asyncio.run(replayer.replay(seed, first, count))
+
+    from actions.order_store import get_order_sink
+
+    # 저장소 디렉터리를 지우기 전에 쌓인 주문을 기록
+    get_order_sink().flush()
+    return replayer.result(count)
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {"conversations": 0, "turns": 0, "failure_count": 0, "failures": [], "timings": {}}
+    for result in results:
+        merged["conversations"] += result["conversations"]
+        merged["turns"] += result["turns"]
+        merged["failure_count"] += result["failure_count"]
+        merged["failures"].extend(result["failures"][:MAX_REPORTED_FAILURES - len(merged["failures"])])
+        for step, values in result["timings"].items():
+            merged["timings"].setdefault(step, []).extend(values)
+    return merged
+
+
+def _percentile(values: List[int], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(merged: Dict[str, Any], elapsed: float, jobs: int) -> Dict[str, Any]:
+    steps = {}
+    for step, values in sorted(merged["timings"].items()):
+        values = sorted(values)
+        steps[step] = {
+            "count": len(values),
+            "mean_us": statistics.fmean(values) / 1000,
+            "p50_us": _percentile(values, 0.50) / 1000,
+            "p95_us": _percentile(values, 0.95) / 1000,
+            "p99_us": _percentile(values, 0.99) / 1000,
+        }
+    return {
+        "jobs": jobs,
+        "elapsed_s": elapsed,
+        "conversations": merged["conversations"],
+        "turns": merged["turns"],
+        "conversations_per_s": merged["conversations"] / elapsed if elapsed else 0.0,
+        "turns_per_s": merged["turns"] / elapsed if elapsed else 0.0,
+        "failure_count": merged["failure_count"],
+        "failures": merged["failures"],
+        "steps": steps,
+    }
+
+
+def print_report(summary: Dict[str, Any], show_failures: int) -> None:
+    print(f"{summary['conversations']} conversations, {summary['turns']} turns in "
+          f"{summary['elapsed_s']:.2f} s on {summary['jobs']} job(s): "
+          f"{summary['conversations_per_s']:.0f} conversations/s, {summary['turns_per_s']:.0f} turns/s")
+    print()
+    print(f"{'step':<42} {'count':>8} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for step, stats in summary["steps"].items():
+        print(f"{step:<42} {stats['count']:>8} {stats['mean_us']:>7.1f} us {stats['p50_us']:>7.1f} us "
+              f"{stats['p95_us']:>7.1f} us {stats['p99_us']:>7.1f} us")
+    print()
+    print(f"failures: {summary['failure_count']}")
+    for failure in summary["failures"][:show_failures]:
+        print(f"  {json.dumps(failure, ensure_ascii=False, default=str)}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=2000, help="Conversations to replay.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes; 1 replays in this process.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--today", type=date.fromisoformat, default=date(2025, 1, 15),
+                        help="Date the clock is frozen at (YYYY-MM-DD).")
+    parser.add_argument("--invalid-rate", type=float, default=0.1,
+                        help="Chance of one invalid answer before the valid one, per slot.")
+    parser.add_argument("--show-failures", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+    args = parser.parse_args(argv)
+
+    # 워커마다 메트릭 포트를 열지 않도록
+    os.environ.pop("ACTIONS_METRICS_PORT", None)
+    store_dir = tempfile.mkdtemp(prefix="replay-orders-")
+    jobs = max(1, min(args.jobs, args.conversations))
+    # 프로세스 간 부하가 고르게 나뉘도록 작업을 잘게 쪼갬
+    chunk = max(1, args.conversations // (jobs * 4))
+    work = [(args.seed, first, min(chunk, args.conversations - first))
+            for first in range(0, args.conversations, chunk)]
+    initargs = (args.today.isoformat(), store_dir, args.invalid_rate)
+
+    try:
+        started = time.perf_counter()
+        if jobs == 1:
+            _init_worker(*initargs)
+            results = [_run_chunk(job) for job in work]
+        else:
+            with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=initargs) as pool:
+                results = list(pool.map(_run_chunk, work))
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    summary = summarize(merge_results(results), elapsed, jobs)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2, default=str))
+    else:
+        print_report(summary, args.show_failures)
+    return 1 if summary["failure_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# 벤치마크용 가짜 Tracker 생성기
+#
+# 실제 대화에서 나오는 한국어 문장과 엔티티 목록으로 Tracker를 만듭니다.
+
+from typing import Any, Dict, List, Optional
+
+from rasa_sdk import Tracker
+
+ORDER_FORM_SLOTS = [
+    "menu_name",
+    "menu_quantity",
+    "serving_style",
+    "side_menu_choice",
+    "delivery_date",
+    "delivery_time",
+    "order_confirmation",
+]
+
+DOMAIN: Dict[str, Any] = {
+    "forms": {"order_form": {"required_slots": ORDER_FORM_SLOTS}},
+    "slots": {},
+}
+
+
+def entity(name: str, value: str, start: int) -> Dict[str, Any]:
+    return {"entity": name, "value": value, "start": start, "end": start + len(value)}
+
+
+def entities_from_text(text: str, spans: List[tuple]) -> List[Dict[str, Any]]:
+    """Build entities from (entity_name, value) pairs found in order in text."""
+    entities = []
+    position = 0
+    for name, value in spans:
+        start = text.index(value, position)
+        entities.append(entity(name, value, start))
+        position = start + len(value)
+    return entities
+
+
+def make_tracker(
+    text: str,
+    intent: str,
+    entities: Optional[List[Dict[str, Any]]] = None,
+    slots: Optional[Dict[str, Any]] = None,
+    sender_id: str = "bench-user",
+    active_loop: Optional[str] = "order_form",
+) -> Tracker:
+    """Return a Tracker whose latest message is text with the given entities."""
+    latest_message = {
+        "text": text,
+        "intent": {"name": intent, "confidence": 1.0},
+        "entities": entities or [],
+    }
+    events = [
+        {"event": "slot", "name": name, "value": value}
+        for name, value in (slots or {}).items()
+    ]
+    return Tracker(
+        sender_id,
+        dict(slots or {}),
+        latest_message,
+        events,
+        False,
+        None,
+        {"name": active_loop} if active_loop else {},
+        "action_listen",
+    )
+
+
+# 자주 나오는 주문 발화
+QUANTITY_UTTERANCES = ["두 개 주세요", "3개 주문할래요", "스물두 개요", "열 개 부탁드려요"]
+TIME_UTTERANCES = ["6시", "7시 30분", "여덟시 삼십분", "일곱 시", "여섯시 사십오분"]
+DATE_UTTERANCES = ["내일", "모레", "12월 8일", "이번 주 금요일", "다음주 월요일"]
+
+SIDE_MENU_TEXT = "빵 두개랑 샴페인 한병, 커피 한포트하고 와인 두잔 추가할게요"
+SIDE_MENU_SPANS = [
+    ("side_name", "빵"), ("side_quantity", "두"), ("side_unit", "개"),
+    ("side_name", "샴페인"), ("side_quantity", "한"), ("side_unit", "병"),
+    ("side_name", "커피"), ("side_quantity", "한"), ("side_unit", "포트"),
+    ("side_name", "와인"), ("side_quantity", "두"), ("side_unit", "잔"),
+]
+
+COMPLETED_ORDER_SLOTS = {
+    "menu_name": "프렌치 디너",
+    "menu_quantity": "2",
+    "serving_style": "디럭스 스타일",
+    "side_menu_choice": "yes",
+    "side_name": ["빵", "샴페인", "커피 1포트", "와인"],
+    "side_quantity": ["2", "1", "1", "2"],
+    "side_unit": ["개", "병", "포트", "잔"],
+    "delivery_date": "2026-12-08",
+    "delivery_time": "18:30:00",
+    "order_confirmation": True,
+}
+
+
+def side_menu_tracker() -> Tracker:
+    return make_tracker(
+        SIDE_MENU_TEXT,
+        "select_side_menu",
+        entities_from_text(SIDE_MENU_TEXT, SIDE_MENU_SPANS),
+    )
+
+
+def delivery_tracker(date_text: str = "내일", time_text: str = "6시") -> Tracker:
+    text = f"{date_text} {time_text}에 배송해주세요"
+    return make_tracker(
+        text,
+        "set_delivery_date",
+        entities_from_text(text, [("date", date_text), ("time", time_text)]),
+    )
+
+
+def submit_tracker(sender_id: str = "bench-user") -> Tracker:
+    return make_tracker("아니요", "deny", slots=COMPLETED_ORDER_SLOTS, sender_id=sender_id, active_loop=None)
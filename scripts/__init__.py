@@ -0,0 +1 @@
+# Operational command-line tools for the custom actions package.
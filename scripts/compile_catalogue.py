@@ -0,0 +1,193 @@
+"""Generate the catalogue NLU data (data/nlu_catalogue.yml) from catalogue.yml.
+
+Menu names, serving styles, side menus, units, occasion keywords and
+quantity words used to be listed by hand in data/nlu.yml, next to a second
+copy in catalogue.yml. This script writes the lookup tables, synonyms and
+prefix-factored regexes from the catalogue, using the same patterns the
+action server compiles at runtime (actions/patterns.py).
+
+    python -m scripts.compile_catalogue            # rewrite data/nlu_catalogue.yml
+    python -m scripts.compile_catalogue --check    # exit 1 if the file is stale
+    python -m scripts.compile_catalogue --benchmark --synthetic 2000
+
+--benchmark times the factored regexes against a plain longest-first
+alternation of the same words over the NLU example texts, and checks that
+both find the same spans. The quantity row compares the generated
+menu_quantity / side_quantity regex with the same guard built from flat
+alternations; its word count is the number of names the guard allows
+before a quantity (synthetic names included).
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+from typing import Dict, List, Optional, Tuple
+
+from actions.catalogue import read_catalogue
+from actions.patterns import (
+    CataloguePatterns,
+    catalogue_quantity_pattern,
+    catalogue_synonyms,
+    catalogue_vocabulary,
+    factor_alternation,
+    flat_alternation,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_PATH = os.path.join(REPO_ROOT, "data", "nlu_catalogue.yml")
+
+HEADER = """\
+# 이 파일은 scripts/compile_catalogue.py가 catalogue.yml에서 만듭니다. 직접 고치지 마세요.
+#
+#   python -m scripts.compile_catalogue
+"""
+
+LOOKUP_ENTITIES = ("menu_name", "serving_style")
+REGEX_ENTITIES = ("occasion", "menu_name", "serving_style", "side_name", "menu_quantity", "side_quantity", "side_unit")
+
+
+def _block(kind: str, name: str, examples: List[str]) -> List[str]:
+    lines = [f"  - {kind}: {name}", "    examples: |"]
+    lines.extend(f"      - {example}" for example in examples)
+    lines.append("")
+    return lines
+
+
+def render_nlu(patterns: CataloguePatterns, synonyms: List[Tuple[str, List[str]]]) -> str:
+    """The generated NLU YAML document."""
+    lines = [HEADER, 'version: "3.1"', "", "nlu:"]
+    for name in LOOKUP_ENTITIES:
+        words = list(dict.fromkeys(patterns.vocabulary[name]))
+        lines.extend(_block("lookup", name, words))
+    for canonical, aliases in synonyms:
+        lines.extend(_block("synonym", canonical, list(dict.fromkeys([canonical, *aliases]))))
+    for name in REGEX_ENTITIES:
+        lines.extend(_block("regex", name, [patterns.sources[name]]))
+    return "\n".join(lines)
+
+
+def compile_catalogue(path: Optional[str] = None) -> str:
+    catalogue = read_catalogue(path) if path else read_catalogue()
+    return render_nlu(CataloguePatterns.from_catalogue(catalogue), catalogue_synonyms(catalogue))
+
+
+def _example_texts() -> List[str]:
+    from benchmarks.payloads import load_nlu_examples
+
+    return [text for examples in load_nlu_examples().values() for text, _ in examples]
+
+
+def _synthetic_names(count: int, seed: int = 0) -> List[str]:
+    # 실제 메뉴 이름처럼 앞부분을 공유하는 이름 ("로즈 갈릭 디너", "로즈 갈릭 스테이크")
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(60)]
+    stems = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))) for _ in range(max(1, count // 8))]
+    suffixes = ["디너", "코스", "스타일", "세트", "스테이크", "샐러드", "플래터", "브런치"]
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(stems)} {rng.choice(stems)} {rng.choice(suffixes)}")
+    return sorted(names)
+
+
+def _spans(regex: "re.Pattern", texts: List[str]) -> List[List[Tuple[int, int]]]:
+    return [[match.span() for match in regex.finditer(text)] for text in texts]
+
+
+def _pattern_pairs(vocabulary: Dict[str, List[str]]) -> List[Tuple[str, int, str, str]]:
+    """(entity, words, flat source, factored source) for every generated regex."""
+    pairs = [
+        (name, len(set(words)), flat_alternation(words), factor_alternation(words))
+        for name, words in vocabulary.items()
+    ]
+    # 수량 정규식은 메뉴·사이드 이름(합성 이름 포함)을 뒤보기 조건으로 씀
+    names = vocabulary['menu_name'] + vocabulary.get('synthetic', [])
+    quantity_vocabulary = dict(vocabulary, menu_name=names)
+    pairs.append((
+        "quantity",
+        len(set(names + vocabulary['side_name'])),
+        catalogue_quantity_pattern(quantity_vocabulary, flat_alternation),
+        catalogue_quantity_pattern(quantity_vocabulary),
+    ))
+    return pairs
+
+
+def benchmark(vocabulary: Dict[str, List[str]], texts: List[str], number: int) -> List[Dict[str, object]]:
+    rows = []
+    for name, words, flat_source, factored_source in _pattern_pairs(vocabulary):
+        flat = re.compile(flat_source, re.IGNORECASE)
+        factored = re.compile(factored_source, re.IGNORECASE)
+        same = _spans(flat, texts) == _spans(factored, texts)
+        timings = {}
+        for label, regex in (("flat", flat), ("factored", factored)):
+            finditer = regex.finditer
+            seconds = min(timeit.repeat(lambda: [list(finditer(text)) for text in texts], number=number, repeat=3))
+            timings[label] = seconds / number / len(texts) * 1e6
+        rows.append({
+            "entity": name,
+            "words": words,
+            "flat_chars": len(flat.pattern),
+            "factored_chars": len(factored.pattern),
+            "flat_us": timings["flat"],
+            "factored_us": timings["factored"],
+            "same_spans": same,
+        })
+    return rows
+
+
+def print_benchmark(rows: List[Dict[str, object]], texts: int) -> None:
+    print(f"{texts} texts, µs per text")
+    print(f"{'entity':<16} {'words':>6} {'flat len':>9} {'fact len':>9} {'flat':>8} {'factored':>9} {'speedup':>8}  spans")
+    for row in rows:
+        speedup = row["flat_us"] / row["factored_us"] if row["factored_us"] else float("inf")
+        print(f"{row['entity']:<16} {row['words']:>6} {row['flat_chars']:>9} {row['factored_chars']:>9} "
+              f"{row['flat_us']:>8.2f} {row['factored_us']:>9.2f} {speedup:>7.2f}x  "
+              f"{'same' if row['same_spans'] else 'DIFFERENT'}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalogue", help="catalogue file (default: catalogue.yml)")
+    parser.add_argument("-o", "--output", default=OUTPUT_PATH, help="generated NLU file")
+    parser.add_argument("--check", action="store_true", help="only check that the output is up to date")
+    parser.add_argument("--benchmark", action="store_true", help="compare factored and flat regexes")
+    parser.add_argument("--synthetic", type=int, default=0, help="add a synthetic entity with N generated names")
+    parser.add_argument("--number", type=int, default=20, help="benchmark passes over the texts per round")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        catalogue = read_catalogue(args.catalogue) if args.catalogue else read_catalogue()
+        vocabulary = catalogue_vocabulary(catalogue)
+        texts = _example_texts()
+        if args.synthetic:
+            synthetic = _synthetic_names(args.synthetic)
+            vocabulary["synthetic"] = synthetic
+            # 일부 문장에 합성 이름을 넣어 매칭이 실제로 일어나게 함
+            rng = random.Random(1)
+            texts = texts + [f"{rng.choice(synthetic)} 주세요" for _ in range(len(texts) // 4)]
+        print_benchmark(benchmark(vocabulary, texts, args.number), len(texts))
+        return 0
+
+    generated = compile_catalogue(args.catalogue)
+    current = None
+    if os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as f:
+            current = f.read()
+
+    if args.check:
+        if current != generated:
+            print(f"{args.output} is out of date; run python -m scripts.compile_catalogue", file=sys.stderr)
+            return 1
+        return 0
+
+    if current != generated:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(generated)
+        print(f"wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
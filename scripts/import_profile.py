@@ -0,0 +1,140 @@
+"""Report where import time goes when the actions package starts.
+
+Runs a fresh interpreter with -X importtime, parses its stderr into the
+import tree and prints the modules that took longest, indented under the
+module that imported them:
+
+    python -m scripts.import_profile                        # import actions.actions
+    python -m scripts.import_profile actions.server --min-ms 2 --repeat 5
+    python -m scripts.import_profile --json importtime.json
+
+Each module's time is the minimum over --repeat runs, which filters out
+disk cache and scheduler noise.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:       self [us] |  cumulative | imported package"
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+class ImportNode:
+    __slots__ = ("name", "self_us", "cumulative_us", "children")
+
+    def __init__(self, name: str, self_us: int = 0, cumulative_us: int = 0) -> None:
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children: List["ImportNode"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "module": self.name,
+            "self_ms": self.self_us / 1000,
+            "cumulative_ms": self.cumulative_us / 1000,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def parse_importtime(stderr: str) -> ImportNode:
+    """Build the import tree from -X importtime output.
+
+    A module is reported after everything it imported, one indent level
+    (two spaces) shallower, so pending children are kept per depth until
+    their parent line shows up.
+    """
+    root = ImportNode("<root>")
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        node = ImportNode(name, int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    root.children = pending.pop(0, [])
+    root.cumulative_us = sum(child.cumulative_us for child in root.children)
+    return root
+
+
+def measure(module: str, python: str = sys.executable) -> ImportNode:
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def merge_min(runs: List[ImportNode]) -> ImportNode:
+    """Keep the first run's tree, with every module's minimum time across runs."""
+    best: Dict[str, tuple] = {}
+
+    def collect(node: ImportNode) -> None:
+        for child in node.children:
+            previous = best.get(child.name)
+            if previous is None or child.cumulative_us < previous[1]:
+                best[child.name] = (child.self_us, child.cumulative_us)
+            collect(child)
+
+    def apply(node: ImportNode) -> None:
+        for child in node.children:
+            child.self_us, child.cumulative_us = best[child.name]
+            apply(child)
+
+    for run in runs:
+        collect(run)
+    tree = runs[0]
+    apply(tree)
+    tree.cumulative_us = sum(child.cumulative_us for child in tree.children)
+    return tree
+
+
+def print_tree(node: ImportNode, min_us: int, depth: int = 0, max_depth: Optional[int] = None) -> None:
+    children = sorted(node.children, key=lambda child: child.cumulative_us, reverse=True)
+    for child in children:
+        if child.cumulative_us < min_us:
+            continue
+        print(f"{child.cumulative_us / 1000:9.1f} ms {child.self_us / 1000:8.1f} ms  {'  ' * depth}{child.name}")
+        if max_depth is None or depth + 1 < max_depth:
+            print_tree(child, min_us, depth + 1, max_depth)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="actions.actions", help="module to import")
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the minimum over")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="hide modules faster than this")
+    parser.add_argument("--depth", type=int, default=None, help="maximum tree depth to print")
+    parser.add_argument("--json", metavar="PATH", help="also write the full tree as JSON")
+    args = parser.parse_args(argv)
+
+    tree = merge_min([measure(args.module) for _ in range(max(1, args.repeat))])
+
+    print(f"{'cumulative':>12} {'self':>11}  module")
+    print_tree(tree, int(args.min_ms * 1000), max_depth=args.depth)
+    print(f"\nimport {args.module}: {tree.cumulative_us / 1000:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(tree.to_dict(), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
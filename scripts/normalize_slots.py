@@ -0,0 +1,268 @@
+"""Normalize date, time and quantity entities in historical conversation logs.
+
+Reads JSONL files of webhook requests, tracker dumps or single tracker
+events and adds a "normalized" value to every date, time, menu_quantity
+and side_quantity entity, using the same parsers as ValidateOrderForm.
+Relative dates (내일, 다음주 월요일) resolve against the KST day of the
+event's timestamp rather than today.
+
+    python -m scripts.normalize_slots conversations.jsonl -o enriched.jsonl \\
+        --summary summary.json --workers 8
+
+Input is read and written in chunks and at most a few chunks per worker
+are in flight, so memory stays flat regardless of file size. Unparseable
+values are counted per entity up to a bound of ten times --top distinct
+values; failures not listed are reported as unparseable_other.
+"""
+
+import argparse
+import gzip
+import io
+import itertools
+import json
+import os
+import sys
+from collections import Counter, deque
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+QUANTITY_ENTITIES = ("menu_quantity", "side_quantity")
+NORMALIZED_ENTITIES = ("date", "time") + QUANTITY_ENTITIES
+INVALID_JSON = "<invalid json>"
+
+# 실패 값은 --top의 이만큼 배까지 종류별로 기억
+FAILURE_HEADROOM = 10
+
+
+class FailureCounter:
+    """Counts of unparseable values per kind, keeping at most limit values each.
+
+    When a kind holds twice the limit, its least common values are dropped
+    and their counts move to overflow. Totals stay exact; the kept counts
+    are a lower bound for values that were dropped and came back.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self.values: Dict[str, Counter] = {}
+        self.totals: Counter = Counter()
+        self.overflow: Counter = Counter()
+
+    def add(self, kind: str, value: str, count: int = 1) -> None:
+        values = self.values.setdefault(kind, Counter())
+        values[value] += count
+        self.totals[kind] += count
+        if len(values) >= 2 * self.limit:
+            self._prune(kind, values)
+
+    def _prune(self, kind: str, values: Counter) -> None:
+        kept = values.most_common(self.limit)
+        self.overflow[kind] += sum(values.values()) - sum(count for _, count in kept)
+        self.values[kind] = Counter(dict(kept))
+
+    def update(self, other: "FailureCounter") -> None:
+        for kind, values in other.values.items():
+            for value, count in values.items():
+                self.add(kind, value, count)
+            # add()가 합계를 더했으므로 버려진 몫만 더함
+            self.totals[kind] += other.totals[kind] - sum(values.values())
+            self.overflow[kind] += other.overflow[kind]
+
+    def most_common(self, kind: str, n: int) -> List[Tuple[str, int]]:
+        return self.values.get(kind, Counter()).most_common(n)
+
+
+ChunkResult = Tuple[List[str], Counter, Counter, FailureCounter]
+
+
+def _open(path: str, mode: str) -> io.TextIOBase:
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _reference_day(timestamp: Any):
+    from actions.clock import KST
+
+    if isinstance(timestamp, (int, float)) and timestamp > 0:
+        return datetime.fromtimestamp(timestamp, KST).date()
+    return None
+
+
+def _normalize(entity: Dict[str, Any], timestamp: Any) -> Optional[Any]:
+    """Return the normalized entity value, or None if it cannot be parsed."""
+    from actions.actions import korean_number_to_int, parse_korean_date, parse_korean_time
+
+    value = entity.get("value")
+    if not isinstance(value, str):
+        value = str(value)
+    name = entity["entity"]
+
+    if name == "date":
+        result = parse_korean_date(value, _reference_day(timestamp))
+        return None if result is None or result == value else result
+    if name == "time":
+        result = parse_korean_time(value)
+        return None if result == value else result
+    return korean_number_to_int(value)
+
+
+def _message_entity_lists(record: Dict[str, Any]) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+    """Yield (entities, timestamp) for every user message in a record."""
+    tracker = record.get("tracker", record)
+    events = tracker.get("events") or []
+    if record.get("event") == "user":
+        events = [record]
+
+    found_user_event = False
+    for event in events:
+        if event.get("event") == "user":
+            found_user_event = True
+            parse_data = event.get("parse_data") or {}
+            yield parse_data.get("entities") or [], event.get("timestamp")
+
+    # latest_message는 마지막 user 이벤트와 같으므로 이벤트가 없을 때만 사용
+    latest = tracker.get("latest_message")
+    if not found_user_event and isinstance(latest, dict) and latest.get("entities"):
+        yield latest["entities"], tracker.get("latest_event_time")
+
+
+def normalize_chunk(lines: List[str], failure_limit: int = 500) -> ChunkResult:
+    """Normalize one chunk of JSONL lines in a worker process."""
+    output = []
+    seen: Counter = Counter()
+    parsed: Counter = Counter()
+    failures = FailureCounter(failure_limit)
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            failures.add(INVALID_JSON, line[:80])
+            continue
+
+        for entities, timestamp in _message_entity_lists(record):
+            for entity in entities:
+                name = entity.get("entity")
+                if name not in NORMALIZED_ENTITIES:
+                    continue
+                seen[name] += 1
+                normalized = _normalize(entity, timestamp)
+                entity["normalized"] = normalized
+                if normalized is None:
+                    failures.add(name, str(entity.get("value")))
+                else:
+                    parsed[name] += 1
+
+        output.append(json.dumps(record, ensure_ascii=False))
+    return output, seen, parsed, failures
+
+
+def iter_chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(lines)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(
+    input_paths: List[str],
+    output_path: str,
+    workers: int,
+    chunk_size: int,
+    failure_limit: int = 500,
+) -> Tuple[Counter, Counter, FailureCounter, int]:
+    seen: Counter = Counter()
+    parsed: Counter = Counter()
+    failures = FailureCounter(failure_limit)
+    records = 0
+
+    def lines() -> Iterator[str]:
+        for path in input_paths:
+            with _open(path, "r") as f:
+                yield from f
+
+    def consume(result: ChunkResult, out: io.TextIOBase) -> None:
+        nonlocal records
+        chunk_output, chunk_seen, chunk_parsed, chunk_failures = result
+        if chunk_output:
+            out.write("\n".join(chunk_output) + "\n")
+        records += len(chunk_output)
+        seen.update(chunk_seen)
+        parsed.update(chunk_parsed)
+        failures.update(chunk_failures)
+
+    out = _open(output_path, "w")
+    try:
+        if workers <= 1:
+            for chunk in iter_chunks(lines(), chunk_size):
+                consume(normalize_chunk(chunk, failure_limit), out)
+        else:
+            with Pool(workers) as pool:
+                # 순서를 유지하면서 처리 중인 청크 수를 제한
+                in_flight: deque = deque()
+                for chunk in iter_chunks(lines(), chunk_size):
+                    in_flight.append(pool.apply_async(normalize_chunk, (chunk, failure_limit)))
+                    if len(in_flight) >= workers * 2:
+                        consume(in_flight.popleft().get(), out)
+                while in_flight:
+                    consume(in_flight.popleft().get(), out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return seen, parsed, failures, records
+
+
+def build_summary(seen: Counter, parsed: Counter, failures: FailureCounter, records: int, top: int) -> Dict[str, Any]:
+    coverage = {}
+    for name in NORMALIZED_ENTITIES:
+        total = seen[name]
+        unparseable = failures.most_common(name, top)
+        coverage[name] = {
+            "entities": total,
+            "parsed": parsed[name],
+            "coverage": parsed[name] / total if total else None,
+            "unparseable": [{"value": value, "count": count} for value, count in unparseable],
+            # 목록에 없는 값들의 실패 수 (기억에서 밀려난 값 포함)
+            "unparseable_other": failures.totals[name] - sum(count for _, count in unparseable),
+        }
+    return {"records": records, "invalid_json_lines": failures.totals[INVALID_JSON], "entities": coverage}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="JSONL input files (.gz supported, - for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="enriched JSONL output (default: stdout)")
+    parser.add_argument("--summary", help="write the coverage summary as JSON to this path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="lines per work unit")
+    parser.add_argument("--top", type=int, default=50, help="unparseable values to list per entity")
+    args = parser.parse_args(argv)
+
+    seen, parsed, failures, records = run(
+        args.inputs, args.output, args.workers, args.chunk_size, max(args.top, 1) * FAILURE_HEADROOM
+    )
+    summary = build_summary(seen, parsed, failures, records, args.top)
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"{records} records", file=sys.stderr)
+    for name, row in summary["entities"].items():
+        if row["entities"]:
+            print(f"  {name:<14} {row['parsed']:>8}/{row['entities']:<8} "
+                  f"{row['coverage'] * 100:6.2f}% parsed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
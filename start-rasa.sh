@@ -8,13 +8,35 @@ source .venv/bin/activate
 # 기존 Rasa 프로세스 종료 (있다면)
 pkill -f "rasa run" 2>/dev/null
 pkill -f "rasa run actions" 2>/dev/null
+pkill -f "actions.server" 2>/dev/null
 
+# 워커 수는 ACTIONS_WORKERS (기본값: CPU 코어 수)
+# 워커들은 주문 캐시를 이 SQLite 파일로 공유함 (없으면 주문 이어 받기가 꺼짐)
+export ORDER_CACHE_PATH=${ORDER_CACHE_PATH:-order_cache.db}
 echo "Starting Rasa Actions Server on port 5055..."
-rasa run actions --port 5055 &
+python -m actions.server --port 5055 &
 ACTIONS_PID=$!
 
-# Actions 서버가 시작될 때까지 대기
-sleep 5
+# Actions 서버가 /health 에 응답할 때까지 대기 (최대 ACTIONS_READY_TIMEOUT 초)
+# 워커는 파서와 카탈로그를 모두 준비한 뒤에 요청을 받기 시작합니다.
+READY_TIMEOUT=${ACTIONS_READY_TIMEOUT:-60}
+ACTIONS_READY=0
+for ((i = 0; i < READY_TIMEOUT * 5; i++)); do
+    if curl -sf http://localhost:5055/health > /dev/null; then
+        ACTIONS_READY=1
+        break
+    fi
+    if ! kill -0 $ACTIONS_PID 2>/dev/null; then
+        echo "Actions Server failed to start"
+        exit 1
+    fi
+    sleep 0.2
+done
+if [ "$ACTIONS_READY" -ne 1 ]; then
+    echo "Actions Server did not answer /health within ${READY_TIMEOUT}s" >&2
+    kill $ACTIONS_PID 2>/dev/null
+    exit 1
+fi
 
 echo "Starting Rasa Server on port 5005..."
 rasa run --enable-api --cors "*" --port 5005 &
@@ -30,7 +52,7 @@ echo ""
 echo "Rasa Server PID: $RASA_PID"
 echo "Actions Server PID: $ACTIONS_PID"
 echo ""
-echo "서버를 중지하려면: pkill -f 'rasa run'"
+echo "서버를 중지하려면: pkill -f 'rasa run'; kill $ACTIONS_PID"
 echo "========================================"
 
 # 프로세스 유지 (포그라운드에서 실행하려면 주석 해제)
@@ -0,0 +1,16 @@
+# 테스트가 저장소 루트에 주문 파일을 만들지 않도록, actions를 import 하기 전에
+# 주문 저장소를 임시 디렉터리로 보냄
+
+import atexit
+import os
+import shutil
+import tempfile
+
+_STORE_DIR = tempfile.mkdtemp(prefix="test-orders-")
+atexit.register(shutil.rmtree, _STORE_DIR, True)
+os.environ["ORDER_STORE_BACKEND"] = "jsonl"
+os.environ["ORDER_STORE_PATH"] = os.path.join(_STORE_DIR, "orders.jsonl")
+os.environ.pop("ORDER_CACHE_PATH", None)
+os.environ.pop("ACTIONS_METRICS_PORT", None)
+os.environ.pop("ACTIONS_SHADOW", None)
+os.environ.pop("ACTIONS_PROFILE_SLOW_MS", None)
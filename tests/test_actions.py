@@ -0,0 +1,66 @@
+import asyncio
+import logging
+
+import pytest
+from rasa_sdk import Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+import actions.actions as actions_module
+import actions.message_analysis as message_analysis
+from actions.actions import ValidateOrderForm
+
+
+def _tracker(sender_id, slots, text="", entities=()):
+    return Tracker(
+        sender_id=sender_id,
+        slots={"requested_slot": next(iter(slots))},
+        latest_message={"text": text, "intent": {"name": "inform"}, "entities": list(entities)},
+        events=[{"event": "user", "text": text}] + [
+            {"event": "slot", "name": name, "value": value} for name, value in slots.items()
+        ],
+        paused=False,
+        followup_action=None,
+        active_loop={"name": "order_form"},
+        latest_action_name="action_listen",
+    )
+
+
+def _validate(form, tracker):
+    return asyncio.run(form.get_validation_events(CollectingDispatcher(), tracker, {"forms": {}}))
+
+
+def test_parsing_goes_through_run_blocking(monkeypatch):
+    calls = []
+
+    async def recording(func, *args):
+        calls.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr(actions_module, "run_blocking", recording)
+    monkeypatch.setattr(message_analysis, "run_blocking", recording)
+
+    tracker = _tracker("offload-text", {"delivery_time": "7시"}, text="7시에 주세요")
+    assert _validate(ValidateOrderForm(), tracker)[0]["value"] == "19:00:00"
+    assert calls == ["parse_message_texts"]
+
+    entity = {"entity": "time", "value": "8시", "start": 0, "end": 2}
+    tracker = _tracker("offload-value", {"delivery_time": "8시"}, text="8시", entities=[entity])
+    assert _validate(ValidateOrderForm(), tracker)[0]["value"] == "20:00:00"
+    assert calls[1:] == ["parse_message_texts", "parse_korean_time"]
+
+
+class _FormWithUnvalidatedSlots(ValidateOrderForm):
+    async def required_slots(self, domain_slots, dispatcher, tracker, domain):
+        return ["note", "broken"]
+
+    async def validate_broken(self, slot_value, dispatcher, tracker, domain):
+        return None
+
+
+def test_rasa_sdk_warnings_are_kept(caplog):
+    tracker = _tracker("warnings", {"note": "문 앞에", "broken": "x"})
+    with caplog.at_level(logging.WARNING, logger="actions.actions"):
+        with pytest.warns(UserWarning, match="Cannot validate `broken`"):
+            events = _validate(_FormWithUnvalidatedSlots(), tracker)
+    assert "Skipping validation for `note`" in caplog.text
+    assert {event["name"]: event["value"] for event in events} == {"note": "문 앞에", "broken": "x"}
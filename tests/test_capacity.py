@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from actions import capacity
+from actions.capacity import CapacityCalendar
+from actions.clock import FrozenClock, set_clock
+from actions.order_store import JsonlOrderBackend, SQLiteOrderBackend
+
+TODAY = date(2026, 10, 17)
+
+
+@pytest.fixture(autouse=True)
+def frozen_today():
+    previous = set_clock(FrozenClock.on(TODAY))
+    yield
+    set_clock(previous)
+
+
+def _order(order_id, delivery_date="2026-10-18", delivery_time="19:00:00"):
+    return {
+        "order_id": order_id,
+        "sender_id": "tester",
+        "created_at": "2026-10-17T03:00:00+00:00",
+        "delivery_date": delivery_date,
+        "delivery_time": delivery_time,
+    }
+
+
+def test_jsonl_read_new_returns_only_appended_orders(tmp_path):
+    backend = JsonlOrderBackend(str(tmp_path / "orders.jsonl"))
+    assert backend.read_new() == ([], 0)
+
+    backend.write_batch([_order("a"), _order("b")])
+    records, cursor = backend.read_new()
+    assert [record["order_id"] for record in records] == ["a", "b"]
+
+    backend.write_batch([_order("c")])
+    records, cursor = backend.read_new(cursor)
+    assert [record["order_id"] for record in records] == ["c"]
+    assert backend.read_new(cursor) == ([], cursor)
+
+
+def test_jsonl_read_new_leaves_a_partial_line_for_the_next_read(tmp_path):
+    path = tmp_path / "orders.jsonl"
+    backend = JsonlOrderBackend(str(path))
+    line = json.dumps(_order("a"), ensure_ascii=False)
+    path.write_text(line[:20], encoding="utf-8")
+
+    records, cursor = backend.read_new()
+    assert records == [] and cursor == 0
+
+    path.write_text(line + "\n", encoding="utf-8")
+    records, cursor = backend.read_new(cursor)
+    assert [record["order_id"] for record in records] == ["a"]
+
+
+def test_sqlite_read_new_rereads_recent_orders_and_the_calendar_counts_them_once(tmp_path):
+    backend = SQLiteOrderBackend(str(tmp_path / "orders.db"))
+    calendar = CapacityCalendar(max_orders_per_slot=2)
+    backend.write_batch([_order("a")])
+    calendar.load_new(backend)
+    calendar.load_new(backend)
+    assert not calendar.is_full("2026-10-18", "19:00:00")
+
+    backend.write_batch([_order("b")])
+    calendar.load_new(backend)
+    assert calendar.is_full("2026-10-18", "19:00:00")
+    backend.close()
+
+
+def test_prune_forgets_past_delivery_dates():
+    calendar = CapacityCalendar(max_orders_per_slot=1)
+    calendar.load([_order("old", "2026-10-16"), _order("new", "2026-10-17")])
+    assert calendar.is_full("2026-10-16", "19:00:00")
+
+    calendar.prune(TODAY.isoformat())
+    assert not calendar.is_full("2026-10-16", "19:00:00")
+    assert calendar.is_full("2026-10-17", "19:00:00")
+    assert list(calendar._order_ids) == ["2026-10-17"]
+    # 지난 날짜의 주문은 다시 읽혀도 세지 않음
+    assert not calendar.book("old", "2026-10-16", "19:00:00")
+
+
+def test_load_new_prunes_with_the_clock(tmp_path):
+    backend = JsonlOrderBackend(str(tmp_path / "orders.jsonl"))
+    backend.write_batch([_order("old", "2026-10-10"), _order("new")])
+    calendar = CapacityCalendar()
+    calendar.load_new(backend)
+    assert list(calendar._order_ids) == ["2026-10-18"]
+
+
+class _SlowBackend(JsonlOrderBackend):
+    def __init__(self, path):
+        super().__init__(path)
+        self.release = threading.Event()
+        self.reader = None
+
+    def read_new(self, cursor=None):
+        self.reader = threading.current_thread().name
+        self.release.wait(5)
+        return super().read_new(cursor)
+
+
+class _Sink:
+    def __init__(self, backend):
+        self.backend = backend
+
+
+def test_refresh_reads_on_a_background_thread(tmp_path, monkeypatch):
+    backend = _SlowBackend(str(tmp_path / "orders.jsonl"))
+    backend.write_batch([_order("a")])
+    monkeypatch.setattr(capacity, "get_order_sink", lambda: _Sink(backend))
+    calendar = CapacityCalendar(max_orders_per_slot=1, refresh_seconds=0)
+
+    started = time.perf_counter()
+    calendar.refresh()
+    # 두 번째 호출은 읽는 중이므로 스레드를 더 띄우지 않음
+    calendar.refresh()
+    assert time.perf_counter() - started < 1
+    assert not calendar.is_full("2026-10-18", "19:00:00")
+
+    backend.release.set()
+    deadline = time.monotonic() + 5
+    while calendar._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.reader == "capacity-refresh"
+    assert calendar.is_full("2026-10-18", "19:00:00")
+
+
+def test_times_outside_business_hours_are_full():
+    calendar = CapacityCalendar(first_slot="11:00", last_slot="22:00")
+    assert calendar.is_open("11:00:00") and calendar.is_open("22:00:00")
+    assert not calendar.is_open("10:30:00") and not calendar.is_open("23:00:00")
+    assert calendar.is_full("2026-10-18", "23:00:00")
+    assert calendar.is_full("2026-10-18", "10:30:00")
+    assert calendar.next_free("2026-10-18", "23:00:00") == ("2026-10-19", "11:00:00")
+    assert calendar.next_free("2026-10-18", "09:00:00") == ("2026-10-18", "11:00:00")
+
+
+def test_configure_rebuckets_the_counted_orders():
+    calendar = CapacityCalendar(slot_minutes=30, max_orders_per_slot=2)
+    calendar.load([_order("a", delivery_time="19:00:00"), _order("b", delivery_time="19:30:00")])
+    assert not calendar.is_full("2026-10-18", "19:00:00")
+
+    calendar.configure(slot_minutes=60, max_orders_per_slot=2)
+    assert calendar.booked("2026-10-18", "19:45:00") == 2
+    assert calendar.is_full("2026-10-18", "19:00:00")
+    assert calendar.next_free("2026-10-18", "19:00:00") == ("2026-10-18", "20:00:00")
+
+
+def test_catalogue_edits_outside_capacity_keep_the_calendar(tmp_path, monkeypatch):
+    reads = []
+
+    class _Backend:
+        def read_new(self, cursor=None):
+            reads.append(cursor)
+            return [_order("a")], 1
+
+    class _FlushingSink(_Sink):
+        def flush(self):
+            pass
+
+    monkeypatch.setattr(capacity, "get_order_sink", lambda: _FlushingSink(_Backend()))
+    monkeypatch.setattr(capacity, "_calendar", None)
+    settings = {"max_orders_per_slot": 1}
+    calendar = capacity._build_calendar({"capacity": settings, "menus": {}})
+    assert calendar.is_full("2026-10-18", "19:00:00")
+
+    assert capacity._build_calendar({"capacity": settings, "menus": {"new": {}}}) is calendar
+    assert capacity._build_calendar({"capacity": {"max_orders_per_slot": 2}}) is calendar
+    assert not calendar.is_full("2026-10-18", "19:00:00")
+    assert reads == [None]
@@ -0,0 +1,133 @@
+import logging
+import os
+
+import pytest
+
+from actions.catalogue import CatalogueCache
+from actions.keyword_automaton import KeywordAutomaton
+from actions.menu_index import MenuIndex, get_menu_index
+
+MENUS = {
+    "valentine": {"name": "발렌타인 디너"},
+    "french": {"name": "프렌치 디너"},
+    "champagne": {"name": "샴페인 축제 디너"},
+}
+RULES = [
+    {"keywords": ["생일", "가족"], "menus": {"french": 4, "champagne": 3}},
+    {"keywords": ["커플", "발렌타인데이", "발렌타인"], "menus": {"valentine": 3}},
+    {"keywords": ["파티"], "menus": {"champagne": 1}},
+]
+
+
+def test_automaton_finds_overlapping_keywords():
+    automaton = KeywordAutomaton([("he", 1), ("she", 2), ("hers", 3), ("his", 4)])
+    assert sorted(automaton.find("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
+    assert list(automaton.find("xyz")) == []
+
+
+def test_automaton_skips_empty_keywords():
+    automaton = KeywordAutomaton([("", 1), ("가족", 2)])
+    assert list(automaton.find("가족 모임")) == [(0, 2, 2)]
+
+
+def test_recommend_sums_each_matched_rule_once():
+    index = MenuIndex(MENUS, RULES, default=["french"], max_recommendations=2)
+    assert index.matched_rules("가족 생일 파티") == [0, 2]
+    # 4점 동점은 카탈로그 순서대로
+    assert [menu["name"] for menu in index.recommend("가족 생일 파티")] == ["프렌치 디너", "샴페인 축제 디너"]
+    assert [menu["name"] for menu in index.recommend("생일")] == ["프렌치 디너", "샴페인 축제 디너"]
+    # 한 규칙의 키워드가 여러 번 나와도 한 번만 더함
+    assert index.matched_rules("발렌타인데이 커플") == [1]
+
+
+def test_recommend_falls_back_to_the_default():
+    index = MenuIndex(MENUS, RULES, default=["french"], max_recommendations=2)
+    assert [menu["name"] for menu in index.recommend("그냥요")] == ["프렌치 디너"]
+    assert index.recommend(None) == []
+
+
+def test_unknown_menu_in_a_rule_is_rejected():
+    with pytest.raises(ValueError):
+        MenuIndex(MENUS, [{"keywords": ["x"], "menus": {"missing": 1}}], default=[], max_recommendations=1)
+
+
+def test_catalogue_index_is_built_from_catalogue_yml():
+    assert get_menu_index().recommend("여자친구랑 기념일")[0]["name"] == "발렌타인 디너"
+
+
+def test_catalogue_cache_rebuilds_when_the_file_changes(tmp_path):
+    path = tmp_path / "catalogue.yml"
+    path.write_text("menus: {a: {name: A}}\n", encoding="utf-8")
+    built = []
+
+    def builder(catalogue):
+        built.append(catalogue)
+        return sorted(catalogue["menus"])
+
+    cache = CatalogueCache(builder, path=str(path), check_interval=0)
+    assert cache.get() == ["a"]
+    assert cache.get() == ["a"]
+    assert len(built) == 1
+
+    path.write_text("menus: {a: {name: A}, b: {name: B}}\n", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get() == ["a", "b"]
+    assert len(built) == 2
+
+
+def test_catalogue_cache_checks_the_file_at_most_once_per_interval(tmp_path):
+    path = tmp_path / "catalogue.yml"
+    path.write_text("menus: {a: {name: A}}\n", encoding="utf-8")
+    cache = CatalogueCache(lambda catalogue: sorted(catalogue["menus"]), path=str(path), check_interval=3600)
+    assert cache.get() == ["a"]
+
+    path.write_text("menus: {b: {name: B}}\n", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get() == ["a"]
+
+
+def _touch(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_catalogue_cache_keeps_the_last_good_value_when_the_file_breaks(tmp_path, caplog):
+    path = tmp_path / "catalogue.yml"
+    path.write_text("menus: {a: {name: A}}\n", encoding="utf-8")
+    built = []
+
+    def builder(catalogue):
+        built.append(catalogue)
+        return sorted(catalogue["menus"])
+
+    cache = CatalogueCache(builder, path=str(path), check_interval=0)
+    assert cache.get() == ["a"]
+
+    path.write_text("menus: {a: [\n", encoding="utf-8")
+    _touch(path, 1)
+    with caplog.at_level(logging.ERROR, logger="actions.catalogue"):
+        assert cache.get() == ["a"]
+        assert cache.get() == ["a"]
+    # 같은 수정 시각은 한 번만 읽고 한 번만 기록
+    assert len(caplog.records) == 1
+    assert len(built) == 1
+
+    path.write_text("menus: {b: {name: B}}\n", encoding="utf-8")
+    _touch(path, 2)
+    assert cache.get() == ["b"]
+
+
+def test_catalogue_cache_raises_until_the_first_good_build(tmp_path):
+    path = tmp_path / "catalogue.yml"
+    path.write_text("menus: {a: [\n", encoding="utf-8")
+    cache = CatalogueCache(lambda catalogue: sorted(catalogue["menus"]), path=str(path), check_interval=0)
+    with pytest.raises(Exception):
+        cache.get()
+    with pytest.raises(Exception):
+        cache.get()
+
+    path.write_text("menus: {a: {name: A}}\n", encoding="utf-8")
+    _touch(path, 1)
+    assert cache.get() == ["a"]
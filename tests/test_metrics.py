@@ -0,0 +1,23 @@
+from actions import metrics
+from actions.metrics import PARSER_CALLS, PARSER_FAILURES, count_parser_calls, track_parser
+
+
+def _parse(text):
+    return int(text) if text.isdigit() else None
+
+
+def test_track_parser_returns_the_parser_when_counting_is_off(monkeypatch):
+    monkeypatch.setattr(metrics, "_count_parsers", True)
+    count_parser_calls(False)
+    assert track_parser("test_off", failed=lambda result, text: result is None)(_parse) is _parse
+
+
+def test_track_parser_counts_calls_and_failures_when_on(monkeypatch):
+    monkeypatch.setattr(metrics, "_count_parsers", False)
+    count_parser_calls()
+    parse = track_parser("test_on", failed=lambda result, text: result is None)(_parse)
+    assert parse is not _parse
+    assert parse("12") == 12
+    assert parse("열둘") is None
+    assert PARSER_CALLS.value(parser="test_on") == 2
+    assert PARSER_FAILURES.value(parser="test_on") == 1
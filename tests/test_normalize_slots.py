@@ -0,0 +1,44 @@
+import json
+
+from scripts.normalize_slots import FailureCounter, build_summary, normalize_chunk
+
+
+def test_failure_counter_keeps_common_values_and_exact_totals():
+    failures = FailureCounter(limit=3)
+    for _ in range(5):
+        failures.add("time", "몇시")
+    for index in range(100):
+        failures.add("time", f"값 {index}")
+
+    assert len(failures.values["time"]) < 6
+    assert failures.most_common("time", 1) == [("몇시", 5)]
+    assert failures.totals["time"] == 105
+    assert failures.overflow["time"] + sum(failures.values["time"].values()) == 105
+
+
+def test_failure_counters_merge_across_chunks():
+    merged = FailureCounter(limit=2)
+    for chunk in range(3):
+        failures = FailureCounter(limit=2)
+        failures.add("date", "언젠가")
+        for index in range(10):
+            failures.add("date", f"{chunk}-{index}")
+        merged.update(failures)
+
+    assert merged.totals["date"] == 33
+    assert merged.most_common("date", 1) == [("언젠가", 3)]
+    assert len(merged.values["date"]) < 4
+
+
+def test_summary_reports_unlisted_failures():
+    lines = [
+        json.dumps({"event": "user", "parse_data": {"entities": [{"entity": "time", "value": f"이상한 {index}"}]}})
+        for index in range(20)
+    ] + ["{not json"]
+    _, seen, parsed, failures = normalize_chunk(lines, failure_limit=4)
+    summary = build_summary(seen, parsed, failures, records=20, top=2)
+
+    assert summary["invalid_json_lines"] == 1
+    time = summary["entities"]["time"]
+    assert len(time["unparseable"]) == 2
+    assert time["unparseable_other"] == 18
@@ -0,0 +1,45 @@
+import pytest
+
+from actions.number_scanner import QUANTITY, UNIT, first_candidate, get_numeric_scanner
+
+
+def _scan(text):
+    return [(candidate.kind, candidate.text, candidate.value) for candidate in get_numeric_scanner().scan(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("두 개 주세요", [(QUANTITY, "두", 2), (UNIT, "개", "개")]),
+    ("3인분이요", [(QUANTITY, "3", 3), (UNIT, "인분", "인분")]),
+    ("네 개", [(QUANTITY, "네", 4), (UNIT, "개", "개")]),
+    ("열만 주세요", [(QUANTITY, "열", 10)]),
+    ("스물하나요", [(QUANTITY, "스물하나", 21)]),
+    ("7시 30분에 세 개", [(QUANTITY, "세", 3), (UNIT, "개", "개")]),
+    # 고유어 수 뒤의 "분"은 사람 수
+    ("두 분이요", [(QUANTITY, "두", 2), (UNIT, "분", "분")]),
+    ("일곱 분", [(QUANTITY, "일곱", 7), (UNIT, "분", "분")]),
+])
+def test_scan_finds_quantities(text, expected):
+    assert _scan(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "여섯 시에 와주세요",
+    "여섯시",
+    "두 시간 뒤에",
+    "삼십 분",
+    "10분 뒤에",
+    "이 분이 드실 거예요",
+    "한 번 더",
+    "이 메뉴로",
+    "네 그걸로",
+    "오시나요",
+    "스테이크로 주세요",
+])
+def test_scan_skips_times_and_look_alikes(text):
+    assert _scan(text) == []
+
+
+def test_first_candidate():
+    candidates = get_numeric_scanner().scan("와인 두 병이랑 빵 세 개")
+    assert first_candidate(candidates, QUANTITY).value == 2
+    assert first_candidate(candidates, "hour") is None
@@ -0,0 +1,174 @@
+import pytest
+
+from actions import order_cache
+from actions.order_cache import (
+    LAST_ORDER,
+    PARTIAL,
+    DisabledOrderCache,
+    PartialOrderCache,
+    SQLiteSpill,
+    get_order_cache,
+    set_worker_count,
+    split_cached,
+)
+
+ORDER = {
+    "menu_name": "프렌치 디너",
+    "menu_quantity": "2",
+    "serving_style": "디럭스 스타일",
+    "side_name": None,
+    "side_quantity": None,
+    "side_unit": None,
+    "delivery_date": "2026-10-18",
+    "delivery_time": "19:00:00",
+}
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_remember_merges_and_forgets_slots():
+    cache = PartialOrderCache()
+    cache.remember("a", {"menu_name": "프렌치 디너", "requested_slot": "menu_name"})
+    cache.remember("a", {"menu_quantity": "2"})
+    assert cache.partial("a") == {"menu_name": "프렌치 디너", "menu_quantity": "2"}
+
+    cache.remember("a", {"menu_name": None})
+    assert cache.partial("a") == {"menu_quantity": "2"}
+    cache.remember("a", {"menu_quantity": None})
+    assert cache.partial("a") == {}
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_their_ttl():
+    clock = Clock()
+    cache = PartialOrderCache(ttl=10, last_order_ttl=100, now=clock)
+    cache.remember("a", {"menu_quantity": "2"})
+    cache.complete("b", ORDER)
+
+    clock.now += 11
+    assert cache.partial("a") == {}
+    assert cache.last_order("b") == ORDER
+    clock.now += 100
+    assert cache.last_order("b") is None
+
+
+def test_complete_moves_the_order_to_last_order():
+    cache = PartialOrderCache()
+    cache.remember("a", {"menu_name": "프렌치 디너"})
+    cache.complete("a", {**ORDER, "order_confirmation": True})
+    assert cache.partial("a") == {}
+    assert cache.last_order("a") == ORDER
+
+
+def test_evicted_entries_spill_to_disk_and_come_back(tmp_path):
+    spill = SQLiteSpill(str(tmp_path / "cache.db"))
+    cache = PartialOrderCache(capacity=2, spill=spill)
+    for sender in ("a", "b", "c"):
+        cache.remember(sender, {"menu_quantity": sender})
+    # "a"는 메모리에서 밀려나 디스크에만 있음
+    assert "a" not in cache._partial.entries
+    assert spill.read(PARTIAL, "a", 0) is not None
+
+    assert cache.partial("a") == {"menu_quantity": "a"}
+    assert "a" in cache._partial.entries
+
+
+def test_close_writes_memory_entries_for_the_next_process(tmp_path):
+    path = str(tmp_path / "cache.db")
+    clock = Clock()
+    cache = PartialOrderCache(spill=SQLiteSpill(path), now=clock)
+    cache.remember("a", {"menu_quantity": "2"})
+    cache.complete("b", ORDER)
+    cache.close()
+    assert cache.spill is None
+
+    restored = PartialOrderCache(spill=SQLiteSpill(path), now=clock)
+    assert restored.partial("a") == {"menu_quantity": "2"}
+    assert restored.last_order("b") == ORDER
+    restored.close()
+
+
+def test_last_order_is_written_on_submit(tmp_path):
+    spill = SQLiteSpill(str(tmp_path / "cache.db"))
+    cache = PartialOrderCache(spill=spill)
+    cache.complete("a", ORDER)
+    assert spill.read(LAST_ORDER, "a", 0)[1] == ORDER
+
+
+def test_expired_spill_entries_are_purged_on_start(tmp_path):
+    path = str(tmp_path / "cache.db")
+    clock = Clock()
+    cache = PartialOrderCache(ttl=10, spill=SQLiteSpill(path), now=clock)
+    cache.remember("a", {"menu_quantity": "2"})
+    cache.close()
+
+    clock.now += 11
+    restored = PartialOrderCache(ttl=10, spill=SQLiteSpill(path), now=clock)
+    assert restored.spill.read(PARTIAL, "a", 0) is None
+    assert restored.partial("a") == {}
+
+
+def test_forget_drops_both_kinds(tmp_path):
+    spill = SQLiteSpill(str(tmp_path / "cache.db"))
+    cache = PartialOrderCache(spill=spill)
+    cache.remember("a", {"menu_quantity": "2"})
+    cache.complete("a", ORDER)
+    cache.forget("a")
+    assert cache.last_order("a") is None
+    assert spill.read(LAST_ORDER, "a", 0) is None
+
+
+def test_workers_sharing_a_spill_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = PartialOrderCache(spill=SQLiteSpill(path), shared=True)
+    second = PartialOrderCache(spill=SQLiteSpill(path), shared=True)
+
+    first.remember("a", {"menu_name": "프렌치 디너"})
+    second.remember("a", {"menu_quantity": "2"})
+    assert first.partial("a") == {"menu_name": "프렌치 디너", "menu_quantity": "2"}
+
+    # 다른 워커에서 제출된 주문은 이어 받지 않음
+    first.complete("a", ORDER)
+    assert second.partial("a") == {}
+    assert second.last_order("a") == ORDER
+    assert len(first) == len(second) == 0
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(order_cache, "_cache", None)
+    yield
+    order_cache.close_order_cache()
+    set_worker_count(1)
+
+
+def test_several_workers_without_a_spill_turn_the_cache_off(fresh_cache):
+    set_worker_count(2)
+    cache = get_order_cache()
+    assert isinstance(cache, DisabledOrderCache)
+    cache.remember("a", {"menu_quantity": "2"})
+    cache.complete("a", ORDER)
+    assert cache.partial("a") == {}
+    assert cache.last_order("a") is None
+
+
+def test_several_workers_share_the_spill(fresh_cache, tmp_path, monkeypatch):
+    monkeypatch.setenv("ORDER_CACHE_PATH", str(tmp_path / "cache.db"))
+    set_worker_count(2)
+    get_order_cache().remember("a", {"menu_quantity": "2"})
+    assert SQLiteSpill(str(tmp_path / "cache.db")).read(PARTIAL, "a", 0)[1] == {"menu_quantity": "2"}
+
+
+def test_split_cached():
+    pending, validated = split_cached(
+        {"menu_name": "프렌치 디너", "menu_quantity": "3", "serving_style": None},
+        {"menu_name": "프렌치 디너", "menu_quantity": "2", "serving_style": None},
+    )
+    assert pending == {"menu_quantity": "3", "serving_style": None}
+    assert validated == ["menu_name"]
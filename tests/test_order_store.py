@@ -0,0 +1,108 @@
+import json
+
+from actions.order_store import JsonlOrderBackend, OrderBackend, OrderSink, SQLiteOrderBackend, order_key
+
+ORDER = {
+    "menu_name": "프렌치 디너",
+    "menu_quantity": "2",
+    "serving_style": "디럭스 스타일",
+    "side_name": None,
+    "side_quantity": None,
+    "side_unit": None,
+    "delivery_date": "2026-10-18",
+    "delivery_time": "19:00:00",
+}
+
+
+class FlakyBackend(OrderBackend):
+    """Fails the first `failures` writes, then keeps every batch."""
+
+    def __init__(self, failures: int = 1) -> None:
+        self.failures = failures
+        self.batches = []
+        self.closed = False
+
+    def write_batch(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.batches.append(list(records))
+
+    def close(self):
+        self.closed = True
+
+
+def _sink(backend):
+    # 백그라운드 스레드가 끼어들지 않도록 주기를 길게 잡음
+    return OrderSink(backend, batch_size=1000, flush_interval=3600)
+
+
+def test_resubmitting_the_same_order_is_a_no_op():
+    sink = _sink(FlakyBackend(failures=0))
+    first = sink.submit("alice", ORDER)
+    again = sink.submit("alice", dict(ORDER))
+    other = sink.submit("bob", ORDER)
+    sink.close()
+    assert first == (order_key("alice", ORDER), True)
+    assert again == (first[0], False)
+    assert other[1]
+
+
+def test_failed_write_is_requeued():
+    backend = FlakyBackend(failures=1)
+    sink = _sink(backend)
+    sink.submit("alice", ORDER)
+    sink.flush()
+    assert backend.batches == []
+    sink.submit("bob", ORDER)
+    sink.flush()
+    # 실패한 주문이 새 주문보다 먼저 기록됨
+    assert [record["sender_id"] for record in backend.batches[0]] == ["alice", "bob"]
+    sink.close()
+
+
+def test_close_drains_the_queue():
+    backend = FlakyBackend(failures=0)
+    sink = _sink(backend)
+    for sender in ("a", "b", "c"):
+        sink.submit(sender, ORDER)
+    sink.close()
+    assert sorted(record["sender_id"] for batch in backend.batches for record in batch) == ["a", "b", "c"]
+    assert backend.closed
+    # 두 번 닫아도 됨
+    sink.close()
+
+
+def test_jsonl_reads_an_order_written_by_two_workers_once(tmp_path):
+    path = tmp_path / "orders.jsonl"
+    backend = JsonlOrderBackend(str(path))
+    # 재시도가 다른 워커로 가서 같은 주문이 두 번 기록된 경우
+    for worker in range(2):
+        worker_sink = _sink(JsonlOrderBackend(str(path)))
+        worker_sink.submit("alice", ORDER)
+        worker_sink.close()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    orders = list(backend.iter_orders())
+    assert [order["order_id"] for order in orders] == [order_key("alice", ORDER)]
+
+
+def test_jsonl_since_filter(tmp_path):
+    path = tmp_path / "orders.jsonl"
+    records = [
+        {"order_id": "old", "sender_id": "a", "created_at": "2026-10-17T00:00:00+00:00"},
+        {"order_id": "new", "sender_id": "b", "created_at": "2026-10-17T01:00:00+00:00"},
+    ]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    since = "2026-10-17T00:30:00+00:00"
+    assert [order["order_id"] for order in JsonlOrderBackend(str(path)).iter_orders(since=since)] == ["new"]
+
+
+def test_sqlite_ignores_a_duplicate_order(tmp_path):
+    path = str(tmp_path / "orders.db")
+    for worker in range(2):
+        worker_sink = _sink(SQLiteOrderBackend(path))
+        worker_sink.submit("alice", ORDER)
+        worker_sink.close()
+    backend = SQLiteOrderBackend(path)
+    assert [order["order_id"] for order in backend.iter_orders()] == [order_key("alice", ORDER)]
+    backend.close()
@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+from actions.actions import assemble_side_items
+from actions.patterns import factor_alternation, get_catalogue_patterns, guarded_quantity_pattern, quantity_pattern
+
+
+def _nlu_entities(text, names=("side_name", "side_quantity", "side_unit")):
+    """Entities RegexEntityExtractor would find with the generated regexes."""
+    sources = get_catalogue_patterns().sources
+    entities = [
+        {"entity": name, "value": match.group(), "start": match.start(), "end": match.end()}
+        for name in names
+        for match in re.finditer(sources[name], text, re.IGNORECASE)
+    ]
+    return sorted(entities, key=lambda entity: entity["start"])
+
+
+def _quantities(text):
+    return [entity["value"] for entity in _nlu_entities(text, ("side_quantity",))]
+
+
+def test_factor_alternation_shares_prefixes():
+    pattern = factor_alternation(["발렌타인 디너", "발렌타인", "잉글리시", "잉글리쉬"])
+    assert pattern == "(?:발렌타인(?: ?디너)?|잉글리[쉬시])"
+    assert re.fullmatch(pattern, "발렌타인디너")
+    assert factor_alternation([]) == "(?!)"
+
+
+def test_nlu_quantities_skip_numerals_inside_words():
+    text = "스테이크 세 개랑 와인 한 병"
+    assert _quantities(text) == ["세", "한"]
+    assert assemble_side_items(_nlu_entities(text))[1] == ["3", "1"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("이 메뉴로 할게요", []),
+    ("네 그걸로 주세요", []),
+    ("오 좋아요", []),
+    ("주세요", []),
+    ("여섯 시에 와주세요", []),
+    ("한 번 더 확인할게요", []),
+    ("2025년", []),
+    ("네 개 주세요", ["네"]),
+    ("이십 개", ["이십"]),
+    ("빵두개랑 커피 하나", ["두", "하나"]),
+    ("커피하나 주세요", ["하나"]),
+    ("와인한병이랑 스테이크세개", ["한", "세"]),
+    ("그렇게 하시네요", []),
+    ("스물하나요", ["스물하나"]),
+    ("두 세트", ["두"]),
+    ("3인분", ["3"]),
+    ("두 분이요", ["두"]),
+    ("삼십 분 뒤에", []),
+    ("10분", []),
+])
+def test_nlu_quantity_edge_cases(text, expected):
+    assert _quantities(text) == expected
+
+
+def test_nlu_occasion_matches_the_whole_keyword():
+    match = re.search(get_catalogue_patterns().sources["occasion"], "발렌타인데이예요")
+    assert match.group() == "발렌타인데이"
+
+
+def test_quantity_guard_does_not_grow_with_the_catalogue():
+    names = ["커피", "와인"]
+    more = names + [f"{stem} {name}" for stem in ("아이스", "하우스", "스페셜") for name in names]
+    assert len(guarded_quantity_pattern(["개"], more)) == len(guarded_quantity_pattern(["개"], names))
+
+
+def test_quantity_pattern_reads_numeral_runs():
+    assert re.fullmatch(quantity_pattern(), "스물하나")
+    assert re.fullmatch(quantity_pattern(), "12")
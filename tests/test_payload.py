@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from actions.payload import SLIM_DECODES, SLIM_FALLBACKS, PayloadDecoder, trim_events
+
+
+def _action_call(turns=3, padding=0, **extra_tracker):
+    events = [{"event": "action", "name": "action_listen"}]
+    for turn in range(turns):
+        events.append({"event": "user", "text": f"메시지 {turn}", "parse_data": {"padding": "x" * padding}})
+        events.append({"event": "bot", "text": f"답변 {turn}"})
+    events.append({"event": "slot", "name": "menu_quantity", "value": "2"})
+    return {
+        "next_action": "validate_order_form",
+        "tracker": {
+            "sender_id": "user",
+            "slots": {"menu_quantity": "2"},
+            "latest_message": {"text": f"메시지 {turns - 1}"},
+            "events": events,
+            "latest_input_channel": "rest",
+            "active_loop": {"name": "order_form"},
+            "latest_action_name": "action_listen",
+            **extra_tracker,
+        },
+        "version": "3.10.0",
+    }
+
+
+def _spaced(value):
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _compact(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize("dumps", [_spaced, _compact], ids=["spaced", "compact"])
+def test_trim_keeps_events_from_the_last_user_message(dumps):
+    call = _action_call()
+    trimmed, removed, skipped = trim_events(dumps(call))
+    decoded = json.loads(trimmed)
+    assert decoded["tracker"]["events"] == call["tracker"]["events"][-3:]
+    assert skipped == 5
+    assert removed == len(dumps(call)) - len(trimmed)
+    assert {key: value for key, value in decoded["tracker"].items() if key != "events"} == {
+        key: value for key, value in call["tracker"].items() if key != "events"
+    }
+
+
+def test_nothing_to_trim_when_the_user_event_comes_first():
+    call = _action_call(turns=1)
+    call["tracker"]["events"] = call["tracker"]["events"][1:]
+    assert trim_events(_spaced(call)) is None
+    assert trim_events(_compact(call)) is None
+
+
+def test_decode_falls_back_when_the_last_user_marker_is_after_the_events():
+    # events 뒤의 배열에 사용자 이벤트처럼 생긴 객체가 있으면 잘못 자르게 됨
+    call = _action_call(turns=3, padding=1000, stack=[{"frame": 1}, {"event": "user", "text": "메시지 2"}])
+    body = _spaced(call)
+    trimmed, _, _ = trim_events(body)
+    assert json.loads(trimmed)["tracker"].get("active_loop") is None
+
+    fallbacks = SLIM_FALLBACKS.value()
+    assert PayloadDecoder(sample_rate=0, min_bytes=0).decode(body) == call
+    assert SLIM_FALLBACKS.value() == fallbacks + 1
+
+
+def test_decode_falls_back_when_the_trimmed_first_event_does_not_match():
+    call = _action_call()
+    call["tracker"]["latest_message"]["text"] = "다른 메시지"
+    fallbacks = SLIM_FALLBACKS.value()
+    assert PayloadDecoder(sample_rate=0, min_bytes=0).decode(_spaced(call)) == call
+    assert SLIM_FALLBACKS.value() == fallbacks + 1
+
+
+def test_decode_only_trims_bodies_above_the_minimum_size():
+    decoder = PayloadDecoder(sample_rate=0)
+    small = _action_call(turns=3, padding=10)
+    large = _action_call(turns=3, padding=8000)
+    assert len(_spaced(small)) < decoder.min_bytes <= len(_spaced(large))
+
+    slim = SLIM_DECODES.value()
+    assert decoder.decode(_spaced(small)) == small
+    assert SLIM_DECODES.value() == slim
+
+    decoded = decoder.decode(_spaced(large))
+    assert SLIM_DECODES.value() == slim + 1
+    assert decoded["tracker"]["events"] == large["tracker"]["events"][-3:]
@@ -0,0 +1,36 @@
+import pytest
+
+from actions.pricing import PriceTable
+
+TABLE = PriceTable(
+    menu_prices={"프렌치 디너": 48000},
+    style_surcharges={"심플 스타일": 0, "디럭스 스타일": 10000},
+    side_prices={("스테이크", "개"): 15000, ("커피", "포트"): 8000},
+    default_units={"커피": "포트"},
+    default_unit="개",
+    display_names={},
+)
+
+
+def test_quote_totals_menu_and_sides():
+    quote = TABLE.quote("프렌치 디너", "두", "디럭스 스타일", ["스테이크", "커피"], ["1", "2"], ["개", None])
+    assert quote.total == 2 * 58000 + 15000 + 2 * 8000
+    assert quote.unpriced == []
+
+
+def test_missing_quantity_counts_as_one():
+    quote = TABLE.quote("프렌치 디너", None, "심플 스타일", ["스테이크"], [], [])
+    assert [line.quantity for line in quote.lines] == [1, 1]
+    assert quote.total == 48000 + 15000
+
+
+@pytest.mark.parametrize("quantity", ["0", "-2", 0, -1, "많이"])
+def test_non_positive_quantities_are_not_priced(quantity):
+    quote = TABLE.quote("프렌치 디너", "1", "심플 스타일", ["스테이크"], [quantity], ["개"])
+    assert quote.total == 48000
+    assert quote.unpriced == ["스테이크"]
+    assert quote.to_dict()["lines"][1]["amount"] is None
+
+    quote = TABLE.quote("프렌치 디너", quantity, "심플 스타일")
+    assert quote.total == 0
+    assert quote.unpriced == ["프렌치 디너 (심플 스타일)"]
@@ -0,0 +1,39 @@
+import pytest
+
+from actions.responses import ResponseCatalogue, Template
+
+
+@pytest.mark.parametrize("source, values", [
+    ("합계 {total:,}원", {"total": 1234567}),
+    ("{hour}시 {minute:02d}분", {"hour": 7, "minute": 5}),
+    ("{{중괄호}} {name}", {"name": "스테이크"}),
+    ("{name}{name}", {"name": "와인"}),
+    ("필드 없음 {{x}}", {}),
+])
+def test_render_matches_str_format(source, values):
+    assert Template(source).render(values) == source.format_map(values)
+
+
+def test_render_does_not_reparse_the_source():
+    template = Template("{name}를 추천드려요!")
+    template.source = "다른 문구"
+    assert template.render({"name": "와인"}) == "와인를 추천드려요!"
+
+
+@pytest.mark.parametrize("source", ["{order.total}", "{items[0]}", "{name!r}", "{total:{width}}"])
+def test_unsupported_fields_are_rejected(source):
+    with pytest.raises(ValueError):
+        Template(source)
+
+
+def test_locales_must_use_the_same_fields():
+    with pytest.raises(ValueError, match="greeting"):
+        ResponseCatalogue({
+            "ko": {"greeting": "{name}님 안녕하세요"},
+            "en": {"greeting": "Hello {customer}"},
+        }, "ko")
+
+
+def test_missing_locale_templates_fall_back_to_the_default():
+    catalogue = ResponseCatalogue({"ko": {"greeting": "{name}님 안녕하세요"}, "en": {}}, "ko")
+    assert catalogue.render("greeting", "en-US", name="민수") == "민수님 안녕하세요"
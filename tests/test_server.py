@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+from benchmarks.payloads import make_payload
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ORDER_SLOTS = {
+    "menu_name": "프렌치 디너",
+    "menu_quantity": "2",
+    "serving_style": "디럭스 스타일",
+    "side_menu_choice": "no",
+    "delivery_date": "2026-12-08",
+    "delivery_time": "18:30:00",
+    "order_confirmation": True,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(predicate, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.1)
+    raise AssertionError("timed out")
+
+
+def _post(port: int, body: dict) -> dict:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/webhook",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="the multi-worker server needs fork()")
+def test_sigterm_persists_queued_orders(tmp_path):
+    port = _free_port()
+    orders = tmp_path / "orders.jsonl"
+    log = tmp_path / "server.log"
+    env = {
+        **os.environ,
+        "ORDER_STORE_BACKEND": "jsonl",
+        "ORDER_STORE_PATH": str(orders),
+        # 종료 전에는 기록되지 않도록 기록 주기를 길게 잡음
+        "ORDER_STORE_FLUSH_INTERVAL": "3600",
+        "ORDER_CACHE_PATH": str(tmp_path / "order_cache.db"),
+    }
+    with open(log, "w", encoding="utf-8") as log_file:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "actions.server", "--host", "127.0.0.1", "--port", str(port), "--workers", "1"],
+            cwd=REPO_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+        )
+    try:
+        worker = int(_wait_for(lambda: re.search(r"Started worker 0 \(pid (\d+)\)", log.read_text()))[1])
+
+        def submit(sender_id):
+            try:
+                response = _post(port, make_payload("action_submit_order", sender_id, "deny", "아니요", [],
+                                                    slots=ORDER_SLOTS))
+            except OSError:
+                return None
+            return response["responses"][0]["custom"]["order_data"]["order_id"]
+
+        # 첫 주문은 수용량 달력을 만들면서 바로 기록되므로 두 번째 주문을 봄
+        _wait_for(lambda: submit("warm-up-user"))
+        order_id = submit("sigterm-user")
+        assert order_id not in orders.read_text(encoding="utf-8")
+
+        os.kill(worker, signal.SIGTERM)
+        _wait_for(lambda: orders.exists() and order_id in orders.read_text(encoding="utf-8"), timeout=20)
+        # 워커는 정상 종료하고 감독 프로세스가 새 워커를 띄움
+        _wait_for(lambda: f"(pid {worker}) exited with status 0" in log.read_text())
+        _wait_for(lambda: len(re.findall(r"Started worker 0", log.read_text())) == 2)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+    assert server.returncode == 0
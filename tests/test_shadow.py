@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from actions import shadow
+from actions.shadow import (
+    SHADOW_CALLS,
+    SHADOW_DIVERGENCES,
+    SHADOW_ERRORS,
+    ShadowRunner,
+    parse_shadow_spec,
+    set_shadow_runner,
+    shadowed,
+)
+
+
+def _parse(text):
+    return len(text)
+
+
+def test_shadowed_returns_the_parser_when_shadowing_is_off(monkeypatch):
+    monkeypatch.setattr(shadow, "_runner", shadow._UNCONFIGURED)
+    assert shadowed("test_off")(_parse) is _parse
+    set_shadow_runner(None)
+    assert shadowed("test_off")(_parse) is _parse
+
+
+def test_shadowed_wraps_the_parser_when_a_runner_is_installed(monkeypatch):
+    monkeypatch.setattr(shadow, "_runner", shadow._UNCONFIGURED)
+    set_shadow_runner(ShadowRunner({}, rate=0.0))
+    parse = shadowed("test_on")(_parse)
+    assert parse is not _parse
+    assert parse("abc") == 3
+
+
+def _shadow_parse(parser, candidate, text, tmp_path, monkeypatch):
+    monkeypatch.setattr(shadow, "_runner", shadow._UNCONFIGURED)
+    runner = ShadowRunner({parser: candidate}, rate=1.0, log_path=str(tmp_path / "shadow.jsonl"))
+    set_shadow_runner(runner)
+    result = shadowed(parser)(_parse)(text)
+    runner.close()
+    return result, runner
+
+
+def test_divergence_is_counted_and_logged(tmp_path, monkeypatch):
+    result, _ = _shadow_parse("test_diverge", lambda text: len(text) + 1, "abc", tmp_path, monkeypatch)
+    # 응답에는 현재 구현의 결과만 쓰임
+    assert result == 3
+    assert SHADOW_CALLS.value(parser="test_diverge") == 1
+    assert SHADOW_DIVERGENCES.value(parser="test_diverge") == 1
+    [line] = (tmp_path / "shadow.jsonl").read_text(encoding="utf-8").splitlines()
+    record = json.loads(line)
+    assert (record["parser"], record["args"], record["current"], record["candidate"]) == ("test_diverge", ["abc"], 3, 4)
+
+
+def test_matching_candidate_is_not_logged(tmp_path, monkeypatch):
+    _shadow_parse("test_match", len, "abc", tmp_path, monkeypatch)
+    assert SHADOW_CALLS.value(parser="test_match") == 1
+    assert SHADOW_DIVERGENCES.value(parser="test_match") == 0
+    assert not (tmp_path / "shadow.jsonl").exists()
+
+
+def test_candidate_errors_are_counted_and_logged(tmp_path, monkeypatch):
+    def broken(text):
+        raise ValueError("boom")
+
+    result, _ = _shadow_parse("test_error", broken, "abc", tmp_path, monkeypatch)
+    assert result == 3
+    assert SHADOW_ERRORS.value(parser="test_error") == 1
+    record = json.loads((tmp_path / "shadow.jsonl").read_text(encoding="utf-8"))
+    assert record["candidate"] == "ValueError: boom"
+
+
+def test_unsampled_calls_skip_the_candidate(monkeypatch):
+    monkeypatch.setattr(shadow, "_runner", shadow._UNCONFIGURED)
+    calls = []
+    set_shadow_runner(ShadowRunner({"test_rate": calls.append}, rate=0.0))
+    shadowed("test_rate")(_parse)("abc")
+    shadow._runner.close()
+    assert calls == []
+
+
+def test_parse_shadow_spec():
+    assert parse_shadow_spec("a=json:dumps, b=json:loads,") == {"a": json.dumps, "b": json.loads}
+    with pytest.raises(ValueError):
+        parse_shadow_spec("a=json")
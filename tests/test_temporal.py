@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from actions.temporal import parse_temporal
+
+TODAY = date(2026, 10, 17)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("6시", "18:00:00"),
+    ("7시 30분", "19:30:00"),
+    ("여덟시 삼십분", "20:30:00"),
+    ("일곱 시", "19:00:00"),
+    ("열두시", "12:00:00"),
+    ("열한 시 반", "23:30:00"),
+])
+def test_times(text, expected):
+    assert parse_temporal(text, TODAY).time == expected
+
+
+def test_relative_date_with_time():
+    parsed = parse_temporal("내일 6시에 보내주세요", TODAY)
+    assert parsed.date == "2026-10-18"
+    assert parsed.time == "18:00:00"
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 단어 안의 한자어 수사는 시각이 아님
+    ("배송 일시는 내일 7시", "19:00:00"),
+    ("이시 괜찮아요", None),
+    ("오시나요? 6시요", "18:00:00"),
+    # 한자어 시각은 읽지 않음
+    ("오 시", None),
+    # 기간은 시각이 아님
+    ("두 시간 뒤 8시", "20:00:00"),
+])
+def test_numeral_like_words_are_not_hours(text, expected):
+    assert parse_temporal(text, TODAY).time == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("저녁여섯시", "18:00:00"),
+    ("내일일곱시", "19:00:00"),
+    ("오후두시 반", "14:30:00"),
+    ("밤열시", "22:00:00"),
+])
+def test_hours_written_without_a_space(text, expected):
+    assert parse_temporal(text, TODAY).time == expected
+
+
+@pytest.mark.parametrize("text", ["24시", "25시", "6시 70분", "일곱시 육십분"])
+def test_out_of_range_times_are_rejected(text):
+    assert parse_temporal(text, TODAY).time is None
+
+
+def test_invalid_calendar_date():
+    parsed = parse_temporal("2월 30일", TODAY)
+    assert parsed.date is None
+    assert parsed.invalid_date
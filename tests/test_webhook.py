@@ -0,0 +1,128 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from rasa_sdk import __version__ as rasa_sdk_version
+from rasa_sdk.interfaces import ActionExecutionRejection, ActionMissingDomainException, ActionNotFoundException
+
+from actions.webhook import BATCHES, SHARED_ANALYSES, MicroBatcher, install_webhook, prepare_batch
+
+
+def _call(text, requested_slot=None, next_action="validate_order_form", sender_id="user"):
+    return {
+        "next_action": next_action,
+        "sender_id": sender_id,
+        "version": rasa_sdk_version,
+        "tracker": {
+            "sender_id": sender_id,
+            "slots": {"requested_slot": requested_slot},
+            "latest_message": {"text": text, "intent": {"name": "inform"}, "entities": []},
+        },
+    }
+
+
+def test_prepare_batch_shares_analyses_of_identical_messages():
+    shared_before = SHARED_ANALYSES.value()
+    calls = [
+        _call("내일 7시", "delivery_time", sender_id="a"),
+        _call("내일 7시", "menu_quantity", sender_id="b"),
+        _call("두 개", "menu_quantity", sender_id="c"),
+        {"next_action": "action_listen", "tracker": None},
+    ]
+    first, second, third, missing = asyncio.run(prepare_batch(calls))
+
+    assert first is second
+    assert third is not first
+    assert missing is None
+    assert SHARED_ANALYSES.value() == shared_before + 1
+    # 같이 쓰는 분석에는 두 요청이 필요한 파싱이 모두 미리 들어감
+    assert first.missing(True, True) == (False, False)
+    assert first.temporal.time == "19:00:00"
+    assert third.missing(True, True) == (True, False)
+
+
+def test_prepare_batch_parses_dates_for_reorders():
+    [analysis] = asyncio.run(prepare_batch([_call("내일 7시", next_action="action_reorder_last_order")]))
+    assert analysis.missing(True, True) == (False, True)
+
+
+class _Executor:
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+        self.calls = []
+
+    async def run(self, action_call):
+        self.calls.append(action_call)
+        error = self.errors.get(action_call["next_action"])
+        if error is not None:
+            raise error
+        return SimpleNamespace(model_dump=lambda: {"events": [], "responses": [], "sender": action_call["sender_id"]})
+
+
+class _App:
+    def on_request(self, handler):
+        self.handler = handler
+        return handler
+
+
+def _request(body, path="/webhook"):
+    return SimpleNamespace(method="POST", path=path, body=body, headers={})
+
+
+def _post(app, action_call):
+    return app.handler(_request(json.dumps(action_call).encode("utf-8")))
+
+
+def _install(executor, batcher=None):
+    app = _App()
+    install_webhook(app, executor, batcher=batcher)
+    return app
+
+
+def test_webhook_maps_executor_errors_to_status_codes():
+    executor = _Executor({
+        "rejected": ActionExecutionRejection("rejected"),
+        "unknown": ActionNotFoundException("unknown"),
+        "no_domain": ActionMissingDomainException("no_domain"),
+    })
+    app = _install(executor)
+
+    async def post_all():
+        return [await _post(app, _call("안녕", next_action=name)) for name in ("rejected", "unknown", "no_domain", "ok")]
+
+    responses = asyncio.run(post_all())
+    assert [response.status for response in responses] == [400, 404, 449, 200]
+    assert json.loads(responses[1].body)["action_name"] == "unknown"
+    assert json.loads(responses[3].body)["sender"] == "user"
+
+
+def test_webhook_rejects_bodies_that_are_not_json_objects():
+    app = _install(_Executor())
+    for body in (b"not json", b"[1, 2]"):
+        response = asyncio.run(app.handler(_request(body)))
+        assert response.status == 400
+
+
+def test_webhook_leaves_other_routes_to_rasa_sdk():
+    app = _install(_Executor())
+    assert asyncio.run(app.handler(_request(b"{}", path="/health"))) is None
+
+
+def test_two_requests_in_one_batch_get_their_own_results():
+    executor = _Executor({"unknown": ActionNotFoundException("unknown")})
+    batcher = MicroBatcher(executor, max_batch=8)
+    app = _install(executor, batcher)
+    batches_before = BATCHES.value()
+
+    async def post_both():
+        return await asyncio.gather(
+            _post(app, _call("내일 7시", "delivery_time", sender_id="first")),
+            _post(app, _call("내일 7시", next_action="unknown", sender_id="second")),
+        )
+
+    ok, missing = asyncio.run(post_both())
+    assert BATCHES.value() == batches_before + 1
+    assert len(executor.calls) == 2
+    assert ok.status == 200 and json.loads(ok.body)["sender"] == "first"
+    assert missing.status == 404
+    assert not batcher._tasks